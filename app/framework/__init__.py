@@ -6,18 +6,21 @@
 # Modified: 2024. 11.
 # 
 
+"""
+framework
+
+- tools, sockets, load_json, print 는 처음 사용할 때 import / 초기화 (PEP 562)
+- import 시점에는 설정 파일 읽기 / 쓰기, 로그 폴더 생성, icecream 설치를 하지 않음
+"""
+
 import os, sys
 _path = os.path.dirname(os.path.abspath(__file__))
 if _path not in sys.path:
     sys.path.append(_path)
 
-from roots import ROOT, Path
-from logger import get_logger
-import tools
-from tools import load_json
-import sockets
+import importlib
 
-print = get_logger()
+from roots import ROOT, Path
 
 __all__ = [
     "print",
@@ -27,3 +30,53 @@ __all__ = [
     "load_json",
     "sockets"
 ]
+
+
+def __getattr__(name:str):
+    if name == "print":
+        from logger import get_logger
+        value = get_logger()
+    elif name in ("tools", "sockets"):
+        value = importlib.import_module(name)
+    elif name == "load_json":
+        value = importlib.import_module("tools").load_json
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # 한 번 만든 값은 모듈 속성으로 저장하여 이후에는 __getattr__ 를 거치지 않음
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+def benchmark_import(n_runs:int=5):
+    """
+    import 시간 측정
+    새 인터프리터에서 각 구문을 실행하는 데 걸린 시간의 최솟값을 출력합니다.
+    """
+    import subprocess
+    import time
+
+    parent = os.path.dirname(_path)
+    name = os.path.basename(_path)
+    statements = [
+        ("python only", "pass"),
+        (f"import {name}", f"import {name}"),
+        (f"{name}.tools.s2num", f"import {name}; {name}.tools.s2num('1')"),
+        (f"{name}.sockets", f"import {name}; {name}.sockets"),
+        (f"from {name} import print", f"from {name} import print"),
+    ]
+    for label, statement in statements:
+        elapsed = []
+        for _ in range(n_runs):
+            begin = time.perf_counter()
+            subprocess.run([sys.executable, "-c", statement], cwd=parent, check=True, capture_output=True)
+            elapsed.append(time.perf_counter() - begin)
+        print(f"{label:28s} {min(elapsed) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark_import()
@@ -12,11 +12,23 @@ configurations
 
 - 기본 설정 구조 정의
 - 구조 활용 함수 정의
+- 설정 파일의 mtime / 크기가 바뀔 때만 다시 읽는 프로세스 단위 캐시
+- 설정 파일 변경 감시 및 변경 내용 (diff) 콜백
+- 계층형 설정; 기본값 < JSON 파일 < .env 파일 < 환경 변수 < 명령행 인자
 """
 
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
 from pydantic import BaseModel
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
 
 from roots import Path, ROOT, ROOT_APPDATA
+from tools import atomic_write, file_lock, mask_value, read_envfile
 
 
 #
@@ -28,9 +40,20 @@ class AppPaths(BaseModel):
 class AppAttributes(BaseModel):
     appname: str
 
+class AppLogging(BaseModel):
+    queue_size: int = 0         # 0 이면 동기 로깅, 양수이면 큐 기반 비동기 로깅
+    overflow: Literal["block", "drop-oldest", "drop-new"] = "block"
+    timezone: str = "Asia/Seoul"
+    level: str = "DEBUG"        # 앱 로거의 활성 레벨
+    mode: str = "dev"           # dev: IceCreamDebugger, production: 레벨 확인 후 바로 기록
+    structured: bool = False    # 로그 파일을 JSON lines 로 기록
+    rotate_interval: float = 0  # 시간 기준 로테이션 주기 (초), 0 이면 크기 기준만 사용
+    compress: bool = False      # 로테이션된 파일을 gzip 압축
+
 class Configurations(BaseModel):
     path: AppPaths
     attributes: AppAttributes
+    logging: AppLogging = AppLogging()
 
 
 #
@@ -46,38 +69,573 @@ def set_defaults() -> Configurations:
         )
     )
 
-def load(filepath:Path=None) -> Configurations:
-    if filepath is None :
-        filepath = ROOT_APPDATA("configs.json")
+# 파일 경로 -> (mtime_ns, 크기, 설정)
+_cache:Dict[Path, Tuple[int, int, Configurations]] = {}
+_cache_lock = threading.Lock()
 
+
+def _signature(filepath:Path) -> Tuple[int, int]:
     try:
-        with open(filepath, "r", encoding="utf-8") as fp:
-            configs = Configurations.model_validate_json(fp.read())
+        st = os.stat(filepath)
+        return st.st_mtime_ns, st.st_size
+    except FileNotFoundError:
+        return -1, -1
+
+
+def _read(filepath:Path) -> Configurations:
+    with open(filepath, "r", encoding="utf-8") as fp:
+        return Configurations.model_validate_json(fp.read())
+
+
+def _recover(filepath:Path) -> Configurations:
+    """
+    설정 파일이 없거나 잘못되었을 때 기본값으로 다시 만듭니다.
+    여러 프로세스가 동시에 시작해도 잠금 파일로 한 프로세스만 백업 / 기록하며,
+    나머지는 잠금을 얻은 후 이미 복구된 파일을 읽습니다.
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(filepath.with_name(f"{filepath.name}.lock")):
+        try:
+            return _read(filepath)
+        except Exception:
+            pass
 
-    except Exception as e:
         print(f"Invalid a configuration file ({filepath}), recreating a config file to the defaults.")
         if filepath.exists():
             backupfile = filepath.with_name(f"{filepath.stem}_bak{filepath.suffix}")
             print(f"Backup old file to {backupfile}")
-            filepath.rename(backupfile)
+            shutil.copy2(filepath, backupfile)
 
+        # 기존 파일을 지우지 않고 교체하므로, 잠금 없이 읽는 프로세스도 항상 완전한 파일을 봄
         configs = set_defaults()
-        with open(filepath, "w", encoding="utf-8") as fp:
-            fp.write(configs.model_dump_json(indent=4))
-    
+        atomic_write(filepath, configs.model_dump_json(indent=4))
+        return configs
+
+
+def load(filepath:Path=None, reload:bool=False) -> Configurations:
+    """
+    설정 파일을 읽습니다.
+    같은 파일의 mtime 과 크기가 그대로이면 다시 읽거나 검증하지 않고 캐시된 설정을 반환합니다.
+    반환된 설정은 프로세스 안에서 공유되므로 수정하지 말고, 필요하면 model_copy() 를 사용하세요.
+
+    :param filepath: 설정 파일 경로 (기본값은 __appdata__/configs.json)
+    :param reload: True 이면 캐시를 무시하고 다시 읽음
+    """
+    if filepath is None :
+        filepath = ROOT_APPDATA("configs.json")
+    elif not isinstance(filepath, Path):
+        filepath = Path(filepath)
+
+    signature = _signature(filepath)
+    cached = _cache.get(filepath)
+    if not reload and cached is not None and cached[:2] == signature:
+        return cached[2]
+
+    with _cache_lock:
+        try:
+            configs = _read(filepath)
+        except Exception:
+            configs = _recover(filepath)
+
+        # 복구로 파일이 바뀌었을 수 있으므로 읽은 후의 상태로 기록
+        _cache[filepath] = (*_signature(filepath), configs)
+
     return configs
 
 
+class LayeredLoader(object):
+    """
+    계층형 설정 로더
+    기본값, JSON 파일, .env 파일, 환경 변수, 명령행 인자 순서로 덮어쓴 후 한 번만 검증합니다.
+
+    - JSON / .env 파일은 mtime / 크기가 바뀔 때만 다시 파싱
+    - .env / 환경 변수는 PREFIX + "섹션__키" 형식만 사용 (예: FRAMEWORK__LOGGING__LEVEL=INFO)
+    - 명령행 인자는 "--섹션.키=값" 형식만 사용 (예: --logging.level=INFO), 나머지 인자는 무시
+    - 입력이 그대로이면 같은 Configurations 객체를 반환 (프로세스 당 하나)
+    - report() 는 각 키의 출처를 보여주며 비밀 값으로 보이는 키는 가림
+    """
+    PREFIX = "FRAMEWORK__"
+    LAYERS = ("defaults", "json", "dotenv", "environ", "cli")
+
+    def __init__(self, filepath:Path=None, envfile:Path=None, argv:Optional[List[str]]=None, prefix:str=PREFIX):
+        """
+        LayeredLoader 클래스의 생성자
+
+        :param filepath: JSON 설정 파일 경로 (기본값은 __appdata__/configs.json)
+        :param envfile: .env 파일 경로 (기본값은 ROOT/.env, 없으면 건너뜀)
+        :param argv: 명령행 인자 (기본값은 sys.argv[1:])
+        :param prefix: .env / 환경 변수 이름의 접두사
+        """
+        self.filepath = Path(filepath) if filepath else ROOT_APPDATA("configs.json")
+        self.envfile = Path(envfile) if envfile else ROOT(".env")
+        self.argv = argv
+        self.prefix = prefix
+        self.json_cache:Optional[Tuple[int, int, Dict[str, Any]]] = None
+        self.key:Optional[str] = None
+        self.configs:Optional[Configurations] = None
+        self.sources:Dict[str, str] = {}
+        self.timings:Dict[str, float] = {}
+
+    def read_json(self, strict:bool=False) -> Dict[str, Any]:
+        signature = _signature(self.filepath)
+        if self.json_cache is not None and self.json_cache[:2] == signature:
+            data, error = self.json_cache[2:]
+            if strict and error is not None:
+                raise error
+            return data
+
+        error = None
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            data = {}
+        except ValueError as e:
+            error = e
+            data = {}
+
+        self.json_cache = (*signature, data, error)
+        if error is not None:
+            if strict:
+                raise error
+            print(f"Ignored an invalid configuration file ({self.filepath}): {error}")
+        return data
+
+    def read_variables(self, variables:Dict[str, str]) -> Dict[str, Any]:
+        layer = {}
+        for name, value in variables.items():
+            if name.startswith(self.prefix):
+                keys = name[len(self.prefix):].lower().split("__")
+                if len(keys) == 2:
+                    layer.setdefault(keys[0], {})[keys[1]] = value
+        return layer
+
+    def read_argv(self, argv:List[str]) -> Dict[str, Any]:
+        layer = {}
+        for arg in argv:
+            if arg.startswith("--") and "=" in arg:
+                name, value = arg[2:].split("=", 1)
+                keys = name.split(".")
+                if len(keys) == 2:
+                    layer.setdefault(keys[0], {})[keys[1]] = value
+        return layer
+
+    def load(self, reload:bool=False, strict:bool=False) -> Configurations:
+        """
+        모든 계층을 합쳐 검증된 설정을 반환합니다.
+
+        :param reload: True 이면 입력이 그대로여도 다시 합치고 검증
+        :param strict: True 이면 잘못된 JSON 파일을 빈 계층으로 보지 않고 예외를 발생 (ConfigWatcher 용)
+        """
+        timings = {}
+        begin = time.perf_counter()
+        layers = {}
+
+        layers["json"] = self.read_json(strict)
+        mark = time.perf_counter()
+        timings["json"] = mark - begin
+
+        layers["dotenv"] = self.read_variables(read_envfile(self.envfile))
+        timings["dotenv"] = time.perf_counter() - mark
+        mark = time.perf_counter()
+
+        layers["environ"] = self.read_variables(os.environ)
+        timings["environ"] = time.perf_counter() - mark
+        mark = time.perf_counter()
+
+        layers["cli"] = self.read_argv(sys.argv[1:] if self.argv is None else self.argv)
+        timings["cli"] = time.perf_counter() - mark
+
+        key = json.dumps(layers, sort_keys=True, default=str)
+        if not reload and key == self.key:
+            timings["total"] = time.perf_counter() - begin
+            self.timings = timings
+            return self.configs
+
+        mark = time.perf_counter()
+        merged = set_defaults().model_dump()
+        sources = {f"{section}.{name}": "defaults" for section, values in merged.items() for name in values}
+        for layer_name in self.LAYERS[1:]:
+            for section, values in layers[layer_name].items():
+                if not isinstance(values, dict) or section not in merged:
+                    continue
+                for name, value in values.items():
+                    if name not in merged[section]:
+                        continue
+                    merged[section][name] = value
+                    sources[f"{section}.{name}"] = layer_name
+
+        configs = Configurations.model_validate(merged)
+        timings["validate"] = time.perf_counter() - mark
+        timings["total"] = time.perf_counter() - begin
+
+        self.key = key
+        self.configs = configs
+        self.sources = sources
+        self.timings = timings
+        return configs
+
+    def report(self) -> str:
+        """
+        각 설정 키의 값과 출처, 계층 별 소요 시간을 문자열로 반환합니다. 비밀 값으로 보이는 키는 값을 가립니다.
+        """
+        if self.configs is None:
+            return ""
+        data = self.configs.model_dump()
+        lines = []
+        for key, source in sorted(self.sources.items()):
+            section, name = key.split(".")
+            lines.append(f"{key} = {mask_value(key, data[section].get(name))!r} ({source})")
+        lines.append(" ".join(f"{name}={seconds * 1000:.3f}ms" for name, seconds in self.timings.items()))
+        return "\n".join(lines)
+
+
+_layered:Optional[LayeredLoader] = None
+
+
+def load_layered(filepath:Path=None, envfile:Path=None, argv:Optional[List[str]]=None,
+                 reload:bool=False, strict:bool=False) -> Configurations:
+    """
+    프로세스 단위 LayeredLoader 로 설정을 읽습니다. 인자는 처음 호출할 때만 사용됩니다.
+    JSON 파일이 없거나 잘못되었으면 load() 와 같이 기본값 파일을 만든 후 읽습니다.
+
+    :param filepath: JSON 설정 파일 경로
+    :param envfile: .env 파일 경로
+    :param argv: 명령행 인자
+    :param reload: True 이면 다시 합치고 검증
+    :param strict: True 이면 잘못된 JSON 파일에서 예외를 발생
+    """
+    global _layered
+    if _layered is None:
+        _layered = LayeredLoader(filepath, envfile, argv)
+        load(_layered.filepath)
+    return _layered.load(reload=reload, strict=strict)
+
+
+def watch_layered(interval:float=1.0) -> "ConfigWatcher":
+    """
+    load_layered 와 같은 계층형 설정으로 JSON 파일을 감시하는 ConfigWatcher 를 만듭니다.
+    파일이 바뀌어도 .env / 환경 변수 / 명령행 값이 그대로 유지되고, diff 도 이 값들을 포함한 설정끼리 비교합니다.
+
+    :param interval: 파일 확인 주기 (초)
+    """
+    load_layered()
+    return ConfigWatcher(_layered.filepath, interval, loader=lambda: load_layered(strict=True))
+
+
+def diff_configs(old:Configurations, new:Configurations) -> Dict[str, Tuple[Any, Any]]:
+    """
+    두 설정의 차이를 "섹션.키" -> (이전 값, 새 값) 으로 반환합니다.
+    """
+    def flatten(data:Dict[str, Any], prefix:str="") -> Dict[str, Any]:
+        flat = {}
+        for key, value in data.items():
+            if isinstance(value, dict):
+                flat.update(flatten(value, f"{prefix}{key}."))
+            else:
+                flat[f"{prefix}{key}"] = value
+        return flat
+
+    old_flat = flatten(old.model_dump())
+    new_flat = flatten(new.model_dump())
+    return {key: (old_flat.get(key), new_flat.get(key))
+            for key in old_flat.keys() | new_flat.keys()
+            if old_flat.get(key) != new_flat.get(key)}
+
+
+class ConfigWatcher(object):
+    """
+    설정 파일 변경 감시기
+    백그라운드 스레드가 주기적으로 파일의 mtime / 크기만 확인하고 (os.stat 한 번),
+    바뀌었을 때만 읽고 검증한 후 current 를 새 설정으로 교체하고 콜백에 diff 를 전달합니다.
+    검증에 실패한 파일 (편집 중인 파일 등) 은 무시하고 기존 설정을 유지하며, 기본값으로 덮어쓰지 않습니다.
+
+    콜백은 감시 스레드에서 callback(configs, diff) 로 호출됩니다.
+    asyncio 코드에 반영하려면 콜백 안에서 loop.call_soon_threadsafe() 를 사용하세요.
+
+    watcher = ConfigWatcher()          # 계층형 설정을 쓰면 watch_layered()
+    watcher.subscribe(logger.apply_configs)
+    watcher.start()
+    """
+
+    def __init__(self, filepath:Path=None, interval:float=1.0, loader:Optional[Callable[[], Configurations]]=None):
+        """
+        ConfigWatcher 클래스의 생성자
+
+        :param filepath: 설정 파일 경로 (기본값은 __appdata__/configs.json)
+        :param interval: 파일 확인 주기 (초)
+        :param loader: 파일이 바뀌었을 때 설정을 읽는 함수 (None 이면 JSON 파일만 읽음)
+                       잘못된 파일이면 예외를 발생해야 기존 설정이 유지됩니다.
+        """
+        self.filepath = Path(filepath) if filepath else ROOT_APPDATA("configs.json")
+        self.interval = interval
+        self.loader = loader
+        self.current:Configurations = load(self.filepath) if loader is None else loader()
+        self.signature = _signature(self.filepath)
+        self.callbacks:List[Callable[[Configurations, Dict[str, Tuple[Any, Any]]], None]] = []
+        self.reloads = 0
+        self.errors = 0
+        self.stopped = threading.Event()
+        self.thread:Optional[threading.Thread] = None
+
+    def subscribe(self, callback:Callable[[Configurations, Dict[str, Tuple[Any, Any]]], None]):
+        """
+        설정이 바뀌면 호출될 콜백을 등록합니다.
+
+        :param callback: callback(새 설정, diff)
+        """
+        self.callbacks.append(callback)
+
+    def unsubscribe(self, callback:Callable[[Configurations, Dict[str, Tuple[Any, Any]]], None]):
+        if callback in self.callbacks:
+            self.callbacks.remove(callback)
+
+    def check(self) -> bool:
+        """
+        파일이 바뀌었는지 확인하고, 바뀌었으면 새 설정을 적용합니다.
+        새 설정이 적용되었으면 True 를 반환합니다.
+        """
+        signature = _signature(self.filepath)
+        if signature == self.signature:
+            return False
+        self.signature = signature
+
+        try:
+            configs = _read(self.filepath) if self.loader is None else self.loader()
+        except Exception as e:
+            self.errors += 1
+            print(f"Ignored an invalid configuration file ({self.filepath}): {e}")
+            return False
+
+        diff = diff_configs(self.current, configs)
+        if not diff:
+            return False
+
+        # 참조 교체 한 번으로 전환; 다른 스레드는 이전 또는 새 설정 중 하나만 봄
+        self.current = configs
+        if self.loader is None:
+            with _cache_lock:
+                _cache[self.filepath] = (*signature, configs)
+        self.reloads += 1
+
+        for callback in list(self.callbacks):
+            try:
+                callback(configs, diff)
+            except Exception as e:
+                print(f"Configuration callback {callback} failed: {e}")
+        return True
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def start(self):
+        """
+        감시 스레드를 시작합니다.
+        """
+        if self.thread is None:
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, name="ConfigWatcher", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """
+        감시 스레드를 멈춥니다.
+        """
+        if self.thread is not None:
+            self.stopped.set()
+            self.thread.join()
+            self.thread = None
+
+
 #
 # unittest
 #
 def unittest():
+    from pydantic import ValidationError
+
     configs = set_defaults()
     print(configs)
     load()
 
+    # 잘못된 overflow 정책은 로거를 만들기 전에 검증에서 걸러짐
+    try:
+        AppLogging(overflow="drop_oldest")
+        assert False, "invalid overflow policy was accepted"
+    except ValidationError:
+        pass
+
+
+def unittest2(n_workers:int=50, n_loads:int=10000):
+    """
+    유닛 테스트 함수 2
+    잘못된 설정 파일을 50개 프로세스가 동시에 읽을 때 한 번만 복구되는지, 캐시된 load() 의 비용을 확인합니다.
+    """
+    import multiprocessing
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory() as folder:
+        filepath = Path(folder).joinpath("configs.json")
+        filepath.write_text("{ broken", encoding="utf-8")
+
+        with multiprocessing.Pool(n_workers) as pool:
+            appnames = pool.map(_unittest2_worker, [filepath] * n_workers)
+
+        assert len(set(appnames)) == 1
+        assert filepath.with_name("configs_bak.json").read_text(encoding="utf-8") == "{ broken"
+        assert not [name for name in os.listdir(folder) if name.endswith(".tmp")]
+        print(f"{n_workers} workers recovered once: {sorted(os.listdir(folder))}")
+
+        # 캐시 적중 / 파일 변경 감지
+        for label, reload in [("uncached", True), ("cached", False)]:
+            begin = time.perf_counter()
+            for _ in range(n_loads):
+                load(filepath, reload=reload)
+            elapsed = time.perf_counter() - begin
+            print(f"load() {label:8s} {elapsed / n_loads * 1e6:8.2f} us/call")
+
+        configs = load(filepath).model_copy(deep=True)
+        configs.attributes.appname = "changed"
+        atomic_write(filepath, configs.model_dump_json(indent=4))
+        assert load(filepath).attributes.appname == "changed"
+
+
+def unittest4():
+    """
+    유닛 테스트 함수 4
+    계층 우선 순위, 캐시 재사용, 비밀 값 가림, 계층형 설정 감시, 시작 시간을 확인합니다.
+    """
+    import contextlib
+    import io
+    import tempfile
+    from tools import add_environments
+
+    with tempfile.TemporaryDirectory() as folder:
+        filepath = Path(folder).joinpath("configs.json")
+        envfile = Path(folder).joinpath(".env")
+        filepath.write_text(json.dumps({"logging": {"level": "INFO", "queue_size": 100, "timezone": "UTC"}}), encoding="utf-8")
+        envfile.write_text("FRAMEWORK__LOGGING__QUEUE_SIZE=200\nFRAMEWORK__LOGGING__OVERFLOW=drop-new\n", encoding="utf-8")
+        os.environ["FRAMEWORK__LOGGING__OVERFLOW"] = "drop-oldest"
+        os.environ["FRAMEWORK__LOGGING__STRUCTURED"] = "true"
+
+        loader = LayeredLoader(filepath, envfile, argv=["unittest4", "--logging.structured=false", "--verbose"])
+        configs = loader.load()
+        report = loader.report()
+        print(report)
+
+        assert configs.logging.level == "INFO"              # json
+        assert configs.logging.timezone == "UTC"            # json
+        assert configs.logging.queue_size == 200            # .env
+        assert configs.logging.overflow == "drop-oldest"    # 환경 변수
+        assert configs.logging.structured is False          # 명령행
+        assert loader.sources["logging.queue_size"] == "dotenv"
+
+        # .env 의 비밀 값은 환경 변수로 추가할 때 출력되지 않음
+        secrets = Path(folder).joinpath("secrets.env")
+        secrets.write_text("UNRELATED_API_TOKEN=hunter2\n", encoding="utf-8")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            add_environments(secrets)
+        assert "UNRELATED_API_TOKEN=***" in output.getvalue() and "hunter2" not in output.getvalue(), output.getvalue()
+        assert os.environ.pop("UNRELATED_API_TOKEN") == "hunter2"
+
+        # 입력이 그대로이면 같은 객체, 파일이 바뀌면 다시 검증
+        assert loader.load() is configs
+        print(loader.report().splitlines()[-1])
+        filepath.write_text(json.dumps({"logging": {"level": "ERROR"}}), encoding="utf-8")
+        assert loader.load().logging.level == "ERROR"
+
+        # 계층형 로더로 감시하면 파일이 바뀌어도 환경 변수 / 명령행 값이 유지되고, diff 에는 바뀐 키만 들어감
+        watcher = ConfigWatcher(filepath, loader=lambda: loader.load(strict=True))
+        filepath.write_text(json.dumps({"logging": {"level": "WARNING"}}), encoding="utf-8")
+        diffs = []
+        watcher.subscribe(lambda configs, diff: diffs.append(diff))
+        assert watcher.check()
+        assert diffs == [{"logging.level": ("ERROR", "WARNING")}], diffs
+        assert watcher.current.logging.overflow == "drop-oldest" and watcher.current.logging.structured is False
+
+        filepath.write_text("{ half-saved", encoding="utf-8")
+        assert not watcher.check() and watcher.errors == 1
+        assert watcher.current.logging.level == "WARNING"
+
+        del os.environ["FRAMEWORK__LOGGING__OVERFLOW"]
+        del os.environ["FRAMEWORK__LOGGING__STRUCTURED"]
+
+
+def _unittest2_worker(filepath:Path) -> str:
+    return load(filepath).attributes.appname
+
+
+def unittest3():
+    """
+    유닛 테스트 함수 3
+    설정 파일 변경 시 콜백과 diff, 잘못된 파일 무시, 로거 재설정을 확인합니다.
+    """
+    import logging
+    import tempfile
+    import time
+    from logger import create_logger, apply_configs
+
+    with tempfile.TemporaryDirectory() as folder:
+        filepath = Path(folder).joinpath("configs.json")
+        configs = set_defaults()
+        configs.path.log = str(Path(folder).joinpath("log1"))
+        atomic_write(filepath, configs.model_dump_json(indent=4))
+
+        log = create_logger(configs.path.log, configs.attributes.appname)
+        log.info("before reload")
+
+        diffs = []
+        watcher = ConfigWatcher(filepath, interval=0.05)
+        watcher.subscribe(lambda configs, diff: diffs.append(diff))
+        watcher.subscribe(apply_configs)
+        watcher.start()
+
+        configs = configs.model_copy(deep=True)
+        configs.path.log = str(Path(folder).joinpath("log2"))
+        configs.logging.level = "WARNING"
+        atomic_write(filepath, configs.model_dump_json(indent=4))
+        time.sleep(0.3)
+        assert load(filepath) is watcher.current
+
+        # 편집 중인 (잘못된) 파일은 무시
+        filepath.write_text("{ half-saved", encoding="utf-8")
+        time.sleep(0.3)
+
+        watcher.stop()
+        log.info("hidden by level")
+        log.warning("after reload")
+        logging.shutdown()
+
+        print(diffs)
+        assert diffs == [{
+            "path.log": (str(Path(folder).joinpath("log1")), configs.path.log),
+            "logging.level": ("DEBUG", "WARNING"),
+        }]
+        assert watcher.reloads == 1 and watcher.errors >= 1
+        assert watcher.current.path.log == configs.path.log
+
+        log1 = Path(folder).joinpath("log1", f"{configs.attributes.appname}.log").read_text(encoding="utf-8")
+        log2 = Path(folder).joinpath("log2", f"{configs.attributes.appname}.log").read_text(encoding="utf-8")
+        assert "before reload" in log1 and "after reload" not in log1
+        assert "after reload" in log2 and "hidden by level" not in log2
+
+
 if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'unittest3':
+        # 로거를 직접 구성하므로 framework print 를 사용하지 않음
+        unittest3()
+        sys.exit(0)
+
     from __init__ import print
 
-    unittest()
+    if len(sys.argv) > 1 and sys.argv[1] == 'unittest2':
+        unittest2()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest4':
+        unittest4()
+    else:
+        unittest()
     print("done.")
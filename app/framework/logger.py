@@ -13,14 +13,27 @@ logger
 - 콘솔과 파일에 로그를 출력
 - print() 함수를 대체하여 편하게 로그를 기록하기 위함
 - IceCreamDebugger 도입!
+- 큐 기반 비동기 로깅 (호출 스레드에서 콘솔/파일 I/O 를 하지 않음)
+- production 모드; IceCreamDebugger 대신 레벨을 확인하는 가벼운 print 사용
+- JSON lines 로그 파일, 시간 + 크기 기준 로테이션, 로테이션된 파일의 백그라운드 gzip 압축
 """
 
+import atexit
+import builtins
+import gzip
+import json
 import logging
+import os
+import queue
+import shutil
+import threading
+import time
 
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from pathlib import Path
-from pytz import timezone
+from typing import Any, Dict, Tuple, Union
+from zoneinfo import ZoneInfo
 
 from icecream import install, ic, IceCreamDebugger
 
@@ -29,55 +42,493 @@ from icecream import install, ic, IceCreamDebugger
 # 로거 오브젝트 설정을 위한 요소
 #
 class LocalTimeFormatter(logging.Formatter):
-    converter = timezone('Asia/Seoul')
+    """
+    지정한 시간대로 시각을 출력하는 포맷터
+    초 단위까지 포맷한 문자열을 캐시하여, 같은 초 안의 레코드는 문자열 결합만 수행합니다.
+    UTC 오프셋은 15분 구간마다 한 번만 zoneinfo 에서 계산합니다 (서머타임 전환 대응).
+    """
+    OFFSET_WINDOW = 900
+
+    def __init__(self, fmt:str=None, datefmt:str=None, style:str='%', tz:str="Asia/Seoul", **kwargs):
+        """
+        LocalTimeFormatter 클래스의 생성자
+
+        :param fmt: 로그 포맷
+        :param datefmt: 시각 포맷 (None 이면 default_time_format 에 밀리초를 붙임)
+        :param style: 포맷 스타일
+        :param tz: IANA 시간대 이름 (예: "Asia/Seoul", "UTC")
+        """
+        super().__init__(fmt, datefmt, style, **kwargs)
+        self.zone = ZoneInfo(tz)
+        self._window = None
+        self._fixed = None
+        self._second = None
+        self._prefix = None
+
     def formatTime(self, record, datefmt=None):
-        dt = datetime.fromtimestamp(record.created, self.converter)
+        second = int(record.created)
+        if second != self._second:
+            window = second // self.OFFSET_WINDOW
+            if window != self._window:
+                local = datetime.fromtimestamp(second, self.zone)
+                self._fixed = timezone(local.utcoffset(), local.tzname())
+                self._window = window
+
+            dt = datetime.fromtimestamp(second, self._fixed)
+            self._prefix = dt.strftime(datefmt if datefmt else self.default_time_format)
+            self._second = second
+
         if datefmt:
-            s = dt.strftime(datefmt)
-        else:
-            t = dt.strftime(self.default_time_format)
-            s = f"{t},{record.msecs:03d}"
-        return s
+            return self._prefix
+        return f"{self._prefix},{int(record.msecs):03d}"
+
+
+# LogRecord 의 기본 속성; 이 외의 속성은 extra 로 전달된 필드로 간주
+_RECORD_ATTRIBUTES = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime"}
+
+
+class JsonFormatter(LocalTimeFormatter):
+    """
+    레코드를 한 줄의 JSON 으로 출력하는 포맷터
+    time, level, logger, message 와 logger.info(..., extra={...}) 로 전달된 필드를 기록합니다.
+    예외 정보가 있으면 exc 필드에 traceback 문자열을 기록합니다.
+    """
+
+    def __init__(self, datefmt:str="%Y-%m-%dT%H:%M:%S", tz:str="Asia/Seoul"):
+        """
+        JsonFormatter 클래스의 생성자
+
+        :param datefmt: time 필드의 초 단위까지의 포맷 (밀리초는 자동으로 붙음)
+        :param tz: 시간대
+        """
+        super().__init__(datefmt=datefmt, tz=tz)
+        self.encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def format(self, record:logging.LogRecord) -> str:
+        entry = {
+            "time": f"{self.formatTime(record, self.datefmt)}.{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+
+        return self.encoder.encode(entry)
+
+
+class TimedSizeRotatingFileHandler(RotatingFileHandler):
+    """
+    크기와 시간 중 먼저 도달한 조건으로 로테이션하는 파일 핸들러
+    백업 파일 이름은 RotatingFileHandler 와 같이 name.log.1 ... name.log.N 이며,
+    compress=True 이면 name.log.1.gz ... 로 저장하고 압축은 백그라운드 스레드에서 수행합니다.
+    """
+
+    def __init__(self, filename:str, maxBytes:int=0, backupCount:int=0, interval:float=0, compress:bool=False,
+                 encoding:str="utf-8"):
+        """
+        TimedSizeRotatingFileHandler 클래스의 생성자
+
+        :param filename: 로그 파일 경로
+        :param maxBytes: 이 크기를 넘으면 로테이션 (0 이면 크기 조건 없음)
+        :param backupCount: 유지할 백업 파일 수
+        :param interval: 이 시간 (초) 이 지나면 로테이션 (0 이면 시간 조건 없음)
+        :param compress: 로테이션된 파일을 gzip 으로 압축
+        :param encoding: 파일 인코딩
+        """
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        self.interval = interval
+        self.rolloverAt = time.time() + interval if interval > 0 else None
+        self.compress = compress
+        self.compressor:threading.Thread = None
+        if compress:
+            self.namer = lambda name: f"{name}.gz"
+            self.rotator = self.rotate_compressed
+
+    def shouldRollover(self, record:logging.LogRecord) -> bool:
+        if self.rolloverAt is not None and record.created >= self.rolloverAt:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        # 이전 압축이 끝나기 전에 백업 파일 이름을 옮기면 안 되므로 대기 (보통은 이미 끝나 있음)
+        self.wait_compression()
+        super().doRollover()
+        if self.rolloverAt is not None:
+            self.rolloverAt = time.time() + self.interval
+
+    def rotate_compressed(self, source:str, dest:str):
+        # 이름 변경만 호출 스레드에서 하고, 압축은 백그라운드에서 수행
+        if not os.path.exists(source):
+            return
+        pending = f"{dest}.pending"
+        os.replace(source, pending)
+        self.compressor = threading.Thread(target=self._compress, args=(pending, dest), daemon=True)
+        self.compressor.start()
+
+    @staticmethod
+    def _compress(pending:str, dest:str):
+        with open(pending, "rb") as src, gzip.open(f"{dest}.tmp", "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(f"{dest}.tmp", dest)
+        os.remove(pending)
+
+    def wait_compression(self):
+        if self.compressor is not None:
+            self.compressor.join()
+            self.compressor = None
+
+    def close(self):
+        self.wait_compression()
+        super().close()
+
+
+OVERFLOW_POLICIES = ("block", "drop-oldest", "drop-new")
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    크기가 제한된 큐에 레코드를 넣는 핸들러
+    큐가 가득 찼을 때의 동작은 overflow 정책을 따르며, 버린 레코드 수를 dropped 에 기록합니다.
+
+    - block: 자리가 날 때까지 호출 스레드를 대기
+    - drop-oldest: 가장 오래된 레코드를 버리고 새 레코드를 넣음
+    - drop-new: 새 레코드를 버림
+    """
+
+    def __init__(self, log_queue:queue.Queue, overflow:str="block"):
+        """
+        BoundedQueueHandler 클래스의 생성자
+
+        :param log_queue: 레코드를 넣을 큐 (maxsize 로 크기 제한)
+        :param overflow: 큐가 가득 찼을 때의 정책 ("block", "drop-oldest", "drop-new")
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow} (expected one of {OVERFLOW_POLICIES})")
 
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def enqueue(self, record:logging.LogRecord):
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow == "drop-new":
+                self.dropped += 1
+                return
+
+            # drop-oldest; 리스너가 동시에 꺼내갈 수 있으므로 자리가 날 때까지 반복
+            while True:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+                try:
+                    self.queue.put_nowait(record)
+                    return
+                except queue.Full:
+                    continue
+
+
+class FlushingQueueListener(QueueListener):
+    """
+    종료 시 큐에 남은 레코드를 모두 기록하고 핸들러를 flush 하는 리스너
+    """
+
+    def enqueue_sentinel(self):
+        # 큐가 가득 차 있어도 종료 신호는 버려지면 안 되므로 대기하며 넣음
+        self.queue.put(self._sentinel)
+
+    def stop(self):
+        if self._thread is None:
+            return
+
+        super().stop()
+        for handler in self.handlers:
+            handler.flush()
+
+
+_queue_handler:BoundedQueueHandler = None
+_listener:FlushingQueueListener = None
+_file_handler:logging.Handler = None
+_watcher = None
+
+
+def dropped_records() -> int:
+    """
+    비동기 로깅 모드에서 큐가 가득 차 버려진 레코드 수를 반환합니다.
+    """
+    return _queue_handler.dropped if _queue_handler else 0
+
+
+def shutdown_logger():
+    """
+    비동기 로깅 리스너를 멈추고 남은 레코드를 모두 기록합니다.
+    루트 로거의 큐 핸들러는 리스너의 핸들러로 바꾸므로, 종료 후의 기록은 큐에서 멈추지 않고 바로 기록됩니다.
+    프로세스 종료 시 자동으로 호출되며, 여러 번 호출해도 안전합니다.
+    """
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+    root = logging.getLogger()
+    if _queue_handler in root.handlers:
+        root.removeHandler(_queue_handler)
+        for handler in _listener.handlers:
+            root.addHandler(handler)
+
+    # 리스너가 멈춘 사이에 큐에 들어온 레코드
+    while True:
+        try:
+            record = _queue_handler.queue.get_nowait()
+        except queue.Empty:
+            break
+        if record is not _listener._sentinel:
+            _listener.handle(record)
+
+    _queue_handler.close()
+    _listener = None
+
+atexit.register(shutdown_logger)
+
+
+LOG_FORMAT = "%(asctime)s.%(msecs)03d|> %(message)s"
+LOG_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+
+def create_file_handler(logfolderpath:str, name:str, tz:str="Asia/Seoul", structured:bool=False,
+                        max_bytes:int=10*1024*1024, backup_count:int=5, rotate_interval:float=0,
+                        compress:bool=False) -> logging.Handler:
+    """
+    로그 파일 핸들러를 생성합니다. 인자는 create_logger 와 같습니다.
+    기본값은 로그 파일의 크기를 10MB로 제한하고 백업 파일 5개를 유지합니다.
+    """
+    Path(logfolderpath).mkdir(parents=True, exist_ok=True)
+    if rotate_interval > 0 or compress:
+        file_handler = TimedSizeRotatingFileHandler(f"{logfolderpath}/{name}.log", maxBytes=max_bytes,
+                                                    backupCount=backup_count, interval=rotate_interval,
+                                                    compress=compress)
+    else:
+        file_handler = RotatingFileHandler(f"{logfolderpath}/{name}.log", maxBytes=max_bytes, backupCount=backup_count)
+
+    if structured:
+        file_handler.setFormatter(JsonFormatter(tz=tz))
+    else:
+        file_handler.setFormatter(LocalTimeFormatter(LOG_FORMAT, datefmt=LOG_DATEFMT, tz=tz))
+    return file_handler
+
+
+def create_logger(logfolderpath:str, name:str, queue_size:int=0, overflow:str="block", tz:str="Asia/Seoul",
+                  structured:bool=False, max_bytes:int=10*1024*1024, backup_count:int=5,
+                  rotate_interval:float=0, compress:bool=False):
+    """
+    콘솔과 파일에 기록하는 로거를 생성합니다.
+
+    :param logfolderpath: 로그 파일을 저장할 폴더
+    :param name: 로거 이름 (로그 파일 이름)
+    :param queue_size: 0 이면 호출 스레드에서 바로 기록, 양수이면 이 크기의 큐와 백그라운드 스레드로 기록
+    :param overflow: 큐가 가득 찼을 때의 정책 ("block", "drop-oldest", "drop-new")
+    :param tz: 로그 시각의 시간대
+    :param structured: True 이면 로그 파일을 JSON lines 로 기록 (콘솔은 기존 형식 유지)
+    :param max_bytes: 로그 파일 최대 크기 (넘으면 로테이션)
+    :param backup_count: 유지할 백업 파일 수
+    :param rotate_interval: 이 시간 (초) 마다 로테이션 (0 이면 크기 기준만 사용)
+    :param compress: 로테이션된 파일을 백그라운드에서 gzip 압축
+    """
+    global _queue_handler, _listener, _file_handler
+
+    # basicConfig 와 같이 이미 설정되어 있으면 그대로 사용 (핸들러나 리스너를 새로 만들지 않음)
+    if logging.getLogger().handlers:
+        return logging.getLogger(name)
 
-def create_logger(logfolderpath:str, name:str):
     # 로그 폴더 생성
     Path(logfolderpath).mkdir(parents=True, exist_ok=True)
 
     # 포맷터 설정; 로그의 출력 형식을 지정
-    log_format = "%(asctime)s.%(msecs)03d|> %(message)s"
-    formatter = LocalTimeFormatter(log_format, datefmt="%Y-%m-%d %H:%M:%S")
+    formatter = LocalTimeFormatter(LOG_FORMAT, datefmt=LOG_DATEFMT, tz=tz)
 
     # 콘솔 핸들러
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
 
-    # 파일 핸들러; 로그 파일의 크기를 10MB로 제한하고 백업 파일 5개를 유지
-    file_handler = RotatingFileHandler(f"{logfolderpath}/{name}.log", maxBytes=10*1024*1024, backupCount=5)
-    file_handler.setFormatter(formatter)
+    # 파일 핸들러
+    file_handler = _file_handler = create_file_handler(logfolderpath, name, tz=tz, structured=structured,
+                                                       max_bytes=max_bytes, backup_count=backup_count,
+                                                       rotate_interval=rotate_interval, compress=compress)
+
+    handlers = [
+        console_handler,
+        file_handler
+    ]
+
+    # 비동기 모드; 호출 스레드는 큐에 넣기만 하고 실제 I/O 는 리스너 스레드가 담당
+    if queue_size > 0:
+        shutdown_logger()
+        _queue_handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size), overflow=overflow)
+        _listener = FlushingQueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        handlers = [_queue_handler]
 
     # 로거 가져오기
     logging.basicConfig(
         level=logging.DEBUG,
-        handlers= [
-            console_handler,
-            file_handler
-        ]
+        handlers=handlers
     )
 
     return logging.getLogger(name)
 
 
-def get_logger() -> IceCreamDebugger:
-    from configurations import load
+# 이 설정이 바뀌면 파일 핸들러를 새로 만들어 교체
+_FILE_HANDLER_KEYS = {"path.log", "attributes.appname", "logging.timezone", "logging.structured",
+                      "logging.rotate_interval", "logging.compress"}
+
+
+def apply_configs(configs, diff:Dict[str, Tuple[Any, Any]]):
+    """
+    ConfigWatcher 콜백; 바뀐 설정을 실행 중인 로거에 적용합니다.
+    logging.level 은 앱 로거의 레벨을, 로그 경로 / 파일 형식 관련 설정은 파일 핸들러를 교체하여 반영합니다.
+    queue_size, overflow, mode 는 다시 시작해야 적용됩니다.
+
+    :param configs: 새 설정
+    :param diff: "섹션.키" -> (이전 값, 새 값)
+    """
+    global _file_handler
+
+    if "logging.level" in diff:
+        logging.getLogger(configs.attributes.appname).setLevel(configs.logging.level.upper())
+
+    if _file_handler is None or not _FILE_HANDLER_KEYS & diff.keys():
+        return
+
+    new_handler = create_file_handler(configs.path.log, configs.attributes.appname,
+                                      tz=configs.logging.timezone,
+                                      structured=configs.logging.structured,
+                                      rotate_interval=configs.logging.rotate_interval,
+                                      compress=configs.logging.compress)
+    old_handler = _file_handler
+    if _listener is not None:
+        # 리스너 스레드는 레코드마다 handlers 를 읽으므로 튜플 교체만으로 전환됨
+        _listener.handlers = tuple(new_handler if handler is old_handler else handler for handler in _listener.handlers)
+    else:
+        root = logging.getLogger()
+        root.addHandler(new_handler)
+        root.removeHandler(old_handler)
+
+    _file_handler = new_handler
+    old_handler.close()
+
+
+class LevelPrinter(object):
+    """
+    production 모드의 print
+    IceCreamDebugger 와 같이 인자를 그대로 반환하지만, 소스 분석 없이 로거에 바로 기록합니다.
+    활성 레벨보다 낮은 호출은 isEnabledFor 확인 한 번으로 끝나고 포맷도 하지 않습니다.
+
+    print(a, b)         # INFO
+    print.debug(a)      # DEBUG
+    """
+
+    def __init__(self, logger:logging.Logger, level:int=logging.INFO):
+        """
+        LevelPrinter 클래스의 생성자
+
+        :param logger: 기록할 로거
+        :param level: print(...) 호출 시 사용할 레벨
+        """
+        self.logger = logger
+        self.level = level
+
+    def __call__(self, *args) -> Any:
+        if self.logger.isEnabledFor(self.level):
+            self.emit(self.level, args)
+        return self.passthrough(args)
+
+    def debug(self, *args) -> Any:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.emit(logging.DEBUG, args)
+        return self.passthrough(args)
+
+    def info(self, *args) -> Any:
+        if self.logger.isEnabledFor(logging.INFO):
+            self.emit(logging.INFO, args)
+        return self.passthrough(args)
+
+    def warning(self, *args) -> Any:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.emit(logging.WARNING, args)
+        return self.passthrough(args)
+
+    def error(self, *args) -> Any:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.emit(logging.ERROR, args)
+        return self.passthrough(args)
+
+    def emit(self, level:int, args:tuple):
+        message = ", ".join(arg if isinstance(arg, str) else repr(arg) for arg in args)
+        # stacklevel=3; 로그 레코드의 호출 위치를 print 를 호출한 코드로 지정
+        self.logger.log(level, message, stacklevel=3)
+
+    @staticmethod
+    def passthrough(args:tuple) -> Any:
+        # IceCreamDebugger 와 동일; 인자가 없으면 None, 하나면 그 값, 여러 개면 튜플
+        if not args:
+            return None
+        return args[0] if len(args) == 1 else args
+
+
+def get_logger(mode:str=None, watch:bool=False) -> Union[IceCreamDebugger, LevelPrinter]:
+    """
+    설정에 따라 로거를 만들고 print 대체 함수를 반환합니다.
+
+    :param mode: "dev" 이면 IceCreamDebugger, "production" 이면 LevelPrinter
+                 None 이면 환경 변수 FRAMEWORK_PRINT_MODE, 그 다음 설정 파일의 logging.mode 를 따름
+    :param watch: True 이면 설정 파일 변경을 감시하여 apply_configs 로 로거에 반영
+                  (같은 계층형 설정을 쓰므로 .env / 환경 변수 / 명령행 값이 유지됨)
+    """
+    global _watcher
+    from configurations import load_layered, watch_layered
     
-    configs = load()
+    configs = load_layered()
     logpath = configs.path.log
     appname = configs.attributes.appname
 
     # 로거 오브젝트 생성
-    log_printer = create_logger(logpath, appname)
+    log_printer = create_logger(logpath, appname,
+                                queue_size=configs.logging.queue_size,
+                                overflow=configs.logging.overflow,
+                                tz=configs.logging.timezone,
+                                structured=configs.logging.structured,
+                                rotate_interval=configs.logging.rotate_interval,
+                                compress=configs.logging.compress)
+    log_printer.setLevel(configs.logging.level.upper())
+
+    if watch and _watcher is None:
+        _watcher = watch_layered()
+        _watcher.subscribe(apply_configs)
+        _watcher.start()
+
+    if mode is None:
+        mode = os.environ.get("FRAMEWORK_PRINT_MODE", configs.logging.mode)
+
+    if mode == "production":
+        printer = LevelPrinter(log_printer)
+        builtins.ic = printer
+        return printer
 
     install()    
     ic.configureOutput(prefix="\n", outputFunction=log_printer.info)
@@ -100,6 +551,219 @@ def unittest():
     print(res)
 
 
+def unittest2(n_records:int=20000):
+    """
+    유닛 테스트 함수 2
+    동기 / 비동기 로깅의 호출 스레드 비용과 큐 overflow 정책 별 유실 수를 비교합니다.
+    각 경우를 별도 프로세스에서 실행합니다 (basicConfig 는 프로세스 당 한 번만 적용되므로).
+    """
+    import multiprocessing
+    import tempfile
+
+    cases = [
+        (0, "block"),
+        (100000, "block"),
+        (256, "block"),
+        (256, "drop-new"),
+        (256, "drop-oldest"),
+    ]
+    with tempfile.TemporaryDirectory() as folder:
+        for i, (queue_size, overflow) in enumerate(cases):
+            process = multiprocessing.Process(target=_unittest2_case,
+                                              args=(folder, f"case{i}", queue_size, overflow, n_records))
+            process.start()
+            process.join()
+            assert process.exitcode == 0
+
+
+def _unittest2_case(folder:str, name:str, queue_size:int, overflow:str, n_records:int):
+    # 콘솔 핸들러는 INFO 이상만 출력하므로 DEBUG 레코드는 파일에만 기록됨
+    logger = create_logger(folder, name, queue_size=queue_size, overflow=overflow)
+
+    begin = time.perf_counter()
+    for i in range(n_records):
+        logger.debug("record %d of %d", i, n_records)
+    elapsed = time.perf_counter() - begin
+
+    shutdown_logger()
+
+    # 종료 후의 기록은 큐를 거치지 않으므로 큐 크기보다 많이 기록해도 멈추지 않습니다.
+    n_after = 1000
+    for i in range(n_after):
+        logger.debug("after shutdown %d", i)
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+    with open(f"{folder}/{name}.log", "r", encoding="utf-8") as fp:
+        written = sum(1 for _ in fp)
+
+    dropped = dropped_records()
+    mode = f"queue={queue_size} {overflow}" if queue_size else "synchronous"
+    print(f"{mode:24s} {elapsed / n_records * 1e6:7.2f} us/call written={written} dropped={dropped}")
+    assert written + dropped == n_records + n_after
+
+
+def unittest3(n_calls:int=20000):
+    """
+    유닛 테스트 함수 3
+    dev (IceCreamDebugger) 와 production (LevelPrinter) print 의 호출 당 비용을 비교합니다.
+    """
+    import io
+
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    logger = logging.getLogger("unittest3")
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    dev = IceCreamDebugger(outputFunction=logger.info)
+    production = LevelPrinter(logger)
+    payload = {"symbol": "KRW-BTC", "price": 98765432.1, "volume": [1, 2, 3]}
+
+    for level in [logging.INFO, logging.WARNING]:
+        logger.setLevel(level)
+        for name, printer in [("dev", dev), ("production", production)]:
+            begin = time.perf_counter()
+            for _ in range(n_calls):
+                printer(payload)
+            elapsed = time.perf_counter() - begin
+            print(f"{name:10s} level={logging.getLevelName(level):7s} {elapsed / n_calls * 1e6:9.2f} us/call")
+
+    # 반환 값과 레벨 필터링이 IceCreamDebugger 와 같은지 확인
+    logger.setLevel(logging.INFO)
+    assert production(payload) is payload
+    assert production(1, 2) == (1, 2)
+    assert production() is None
+    stream.seek(0)
+    stream.truncate()
+    production.debug("hidden")
+    production.warning("shown", 42)
+    assert stream.getvalue() == "shown, 42\n"
+
+
+def unittest4(n_records:int=3000):
+    """
+    유닛 테스트 함수 4
+    JSON lines 출력, 크기 / 시간 기준 로테이션, 백그라운드 gzip 압축을 확인합니다.
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        filename = f"{folder}/unittest4.log"
+        handler = TimedSizeRotatingFileHandler(filename, maxBytes=64*1024, backupCount=3, interval=0.5, compress=True)
+        handler.setFormatter(JsonFormatter())
+        logger = logging.getLogger("unittest4")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(handler)
+
+        # 크기 기준 로테이션 (한 줄 약 150 바이트)
+        for i in range(n_records):
+            logger.info("order %d filled", i, extra={"symbol": "KRW-BTC", "qty": i * 0.5})
+
+        # 시간 기준 로테이션
+        time.sleep(0.6)
+        logger.warning("after interval")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("failed")
+
+        handler.close()
+        logger.removeHandler(handler)
+
+        backups = sorted(os.listdir(folder))
+        print(backups)
+        assert backups == ["unittest4.log", "unittest4.log.1.gz", "unittest4.log.2.gz", "unittest4.log.3.gz"]
+
+        with open(filename, "r", encoding="utf-8") as fp:
+            current = [json.loads(line) for line in fp]
+        assert current[0]["message"] == "after interval"
+        assert current[1]["level"] == "ERROR" and "ZeroDivisionError" in current[1]["exc"]
+
+        with gzip.open(f"{filename}.1.gz", "rt", encoding="utf-8") as fp:
+            last = [json.loads(line) for line in fp][-1]
+        print(last)
+        assert last["message"] == f"order {n_records - 1} filled"
+        assert last["symbol"] == "KRW-BTC" and last["qty"] == (n_records - 1) * 0.5
+
+    # 포맷 비용 비교
+    record = logging.LogRecord("bench", logging.INFO, __file__, 0, "order %d filled", (1,), None)
+    record.symbol = "KRW-BTC"
+    for name, formatter in [
+        ("text", LocalTimeFormatter("%(asctime)s.%(msecs)03d|> %(message)s", datefmt="%Y-%m-%d %H:%M:%S")),
+        ("json", JsonFormatter()),
+    ]:
+        begin = time.perf_counter()
+        for _ in range(100000):
+            formatter.format(record)
+        elapsed = time.perf_counter() - begin
+        print(f"{name} format {elapsed / 100000 * 1e6:.2f} us/record")
+
+
+def benchmark_formatter(n_records:int=200000):
+    """
+    시각 포맷터 성능 비교
+    기존 방식 (레코드마다 pytz localize + strftime) 과 초 단위 캐시 방식의 초당 처리 레코드 수를 출력합니다.
+    """
+    from pytz import timezone as pytz_timezone
+
+    class PytzFormatter(logging.Formatter):
+        converter = pytz_timezone('Asia/Seoul')
+        def formatTime(self, record, datefmt=None):
+            dt = datetime.fromtimestamp(record.created, self.converter)
+            if datefmt:
+                s = dt.strftime(datefmt)
+            else:
+                t = dt.strftime(self.default_time_format)
+                s = f"{t},{record.msecs:03d}"
+            return s
+
+    # 실제 로그처럼 1초에 약 1000개의 레코드가 발생하도록 시각을 분포
+    base = time.time()
+    records = []
+    for i in range(n_records):
+        record = logging.LogRecord("bench", logging.INFO, __file__, 0, "message %d", (i,), None)
+        record.created = base + i / 1000
+        record.msecs = (record.created - int(record.created)) * 1000
+        records.append(record)
+
+    log_format = "%(asctime)s.%(msecs)03d|> %(message)s"
+    for name, formatter in [
+        ("pytz (before)", PytzFormatter(log_format, datefmt="%Y-%m-%d %H:%M:%S")),
+        ("cached (after)", LocalTimeFormatter(log_format, datefmt="%Y-%m-%d %H:%M:%S")),
+    ]:
+        begin = time.perf_counter()
+        for record in records:
+            formatter.formatTime(record, formatter.datefmt)
+        elapsed = time.perf_counter() - begin
+        print(f"formatTime {name:16s} {n_records / elapsed:12.0f} records/s")
+
+        begin = time.perf_counter()
+        for record in records:
+            formatter.format(record)
+        elapsed = time.perf_counter() - begin
+        print(f"format     {name:16s} {n_records / elapsed:12.0f} records/s")
+
+    # 결과가 기존 방식과 같은지, 시간대 설정이 반영되는지 확인
+    record = records[-1]
+    datefmt = "%Y-%m-%d %H:%M:%S"
+    assert PytzFormatter(log_format).formatTime(record, datefmt) == LocalTimeFormatter(log_format).formatTime(record, datefmt)
+    expected = datetime.fromtimestamp(record.created, timezone.utc).strftime("%H:%M:%S")
+    assert LocalTimeFormatter(log_format, tz="UTC").formatTime(record, "%H:%M:%S") == expected
+
+
 if __name__ == "__main__":
-    unittest()
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'unittest2':
+        unittest2()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest3':
+        unittest3()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest4':
+        unittest4()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+        benchmark_formatter()
+    else:
+        unittest()
     print("done.")
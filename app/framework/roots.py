@@ -6,23 +6,122 @@
 # Created: 2024. 10.
 # 
 
+"""
+roots
+
+- 프로그램의 기준 경로 (ROOT, ROOT_FRAMEWORK, ROOT_APPDATA)
+- 기준 경로는 처음 사용할 때 한 번만 resolve 하고, 결합한 경로는 LRU 캐시에 저장
+- 환경 변수 FRAMEWORK_ROOT, FRAMEWORK_APPDATA 로 기준 경로를 바꿀 수 있음
+"""
+
 import os, sys
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+
+class PathRoots(object):
+    """
+    기준 경로 레지스트리
+    이름 별로 기준 경로를 만드는 함수를 등록하고, 결합 결과를 캐시합니다.
+    캐시는 파일 시스템이 바뀌지 않는다고 가정하므로, 심볼릭 링크 등을 바꾼 후에는 reset() 을 호출해야 합니다.
+    """
+
+    def __init__(self, cache_size:int=1024):
+        """
+        PathRoots 클래스의 생성자
+
+        :param cache_size: 결합한 경로를 저장할 LRU 캐시 크기
+        """
+        self.factories:Dict[str, Callable[[], Path]] = {}
+        self.envs:Dict[str, Optional[str]] = {}
+        self.bases:Dict[str, Path] = {}
+        self.join = lru_cache(maxsize=cache_size)(self._join)
+
+    def register(self, name:str, factory:Callable[[], Path], env:Optional[str]=None) -> Callable[[Union[str, Path]], Path]:
+        """
+        기준 경로를 등록하고, 경로를 결합하는 함수를 반환합니다.
+
+        :param name: 기준 경로 이름
+        :param factory: 기준 경로를 만드는 함수 (처음 사용할 때 한 번만 호출)
+        :param env: 값이 있으면 factory 대신 사용할 환경 변수 이름
+        """
+        self.factories[name] = factory
+        self.envs[name] = env
+        return lambda pt: self.join(name, pt)
+
+    def base(self, name:str) -> Path:
+        """
+        resolve 된 기준 경로를 반환합니다.
+
+        :param name: 기준 경로 이름
+        """
+        base = self.bases.get(name)
+        if base is None:
+            env = self.envs[name]
+            override = os.environ.get(env) if env else None
+            base = Path(override) if override else self.factories[name]()
+            base = self.bases[name] = base.resolve()
+        return base
+
+    def _join(self, name:str, pt:Union[str, Path]) -> Path:
+        return self.base(name).joinpath(pt).resolve()
+
+    def reset(self):
+        """
+        기준 경로와 캐시를 비웁니다. 환경 변수를 바꾼 후 다시 읽을 때 사용합니다.
+        """
+        self.bases.clear()
+        self.join.cache_clear()
+
+
+roots = PathRoots()
 
 if getattr(sys, "frozen", False):
     # PyInstaller로 패키징된 실행 파일의 경우
-    ROOT = lambda pt: Path(sys.executable).parent.joinpath(pt).resolve()
+    ROOT = roots.register("root", lambda: Path(sys.executable).parent, env="FRAMEWORK_ROOT")
 else:
     # 일반적인 스크립트 실행 환경인 경우
-    ROOT = lambda pt: Path(os.path.commonpath([__file__, sys.executable])).joinpath(pt).resolve()
+    ROOT = roots.register("root", lambda: Path(os.path.commonpath([__file__, sys.executable])), env="FRAMEWORK_ROOT")
+
+ROOT_FRAMEWORK = roots.register("framework", lambda: Path(__file__).parent)
+ROOT_APPDATA = roots.register("appdata", lambda: roots.base("root").joinpath("__appdata__"), env="FRAMEWORK_APPDATA")
+# __appdata__ 폴더는 import 시점이 아니라 실제로 파일을 쓰는 곳에서 생성
+
+
+#
+# unittest
+#
+def unittest(n_lookups:int=100000):
+    # 기존 방식 (호출마다 commonpath + resolve) 과 비교
+    OLD_ROOT = lambda pt: Path(os.path.commonpath([__file__, sys.executable])).joinpath(pt).resolve()
+    OLD_ROOT_APPDATA = lambda pt: OLD_ROOT("./__appdata__").joinpath(pt).resolve()
+    assert OLD_ROOT_APPDATA("log") == ROOT_APPDATA("log")
+    assert ROOT_FRAMEWORK("roots.py") == Path(__file__).resolve()
+
+    import time
+    for name, func in [("before", OLD_ROOT_APPDATA), ("after", ROOT_APPDATA)]:
+        begin = time.perf_counter()
+        for i in range(n_lookups):
+            func("log")
+        elapsed = time.perf_counter() - begin
+        print(f"ROOT_APPDATA {name:6s} {elapsed / n_lookups * 1e6:8.3f} us/call")
+
+    # 환경 변수로 기준 경로 변경
+    import tempfile
+    with tempfile.TemporaryDirectory() as folder:
+        os.environ["FRAMEWORK_APPDATA"] = folder
+        roots.reset()
+        assert ROOT_APPDATA("configs.json") == Path(folder).resolve().joinpath("configs.json")
+        del os.environ["FRAMEWORK_APPDATA"]
+        roots.reset()
 
-ROOT_FRAMEWORK = lambda pt: ROOT(__file__).parent.joinpath(pt).resolve()
-ROOT_APPDATA = lambda pt: ROOT("./__appdata__").joinpath(pt).resolve()
-ROOT_APPDATA(".").mkdir(parents=True, exist_ok=True)
+    print(roots.join.cache_info())
 
 
 if __name__ == "__main__":
     # from __init__ import print
     print(ROOT("."))
+    unittest()
 
-    print("done.")
\ No newline at end of file
+    print("done.")
@@ -2,80 +2,614 @@
 #-*- coding: utf-8 -*-
 
 import websockets as wss
+from websockets.extensions.permessage_deflate import PerMessageDeflate, ServerPerMessageDeflateFactory, ClientPerMessageDeflateFactory
+from websockets.frames import Frame, Opcode
 import asyncio
+import inspect
+import itertools
+import json
+import logging
+import pickle
+import random
 import signal
+import struct
 import sys
+import time
 from abc import abstractmethod
+from collections import deque
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 
-from typing import Union, Dict, Optional
+from typing import Any, Union, Dict, List, Optional, Set, Tuple
+
+# set_message_handler 에서 기존 executor 를 유지할 때 사용하는 기본값
+KEEP = object()
+
+# 여러 메시지를 하나의 바이너리 프레임으로 묶을 때 사용하는 형식
+#   BATCH_MAGIC + (타입 1바이트: 0=str, 1=bytes) + (길이 4바이트, big endian) + 본문 ...
+BATCH_MAGIC = b"\xffBT"
+BATCH_ITEM = struct.Struct(">BI")
+
+
+def pack_messages(messages:List[Union[str, bytes]]) -> bytes:
+    """
+    여러 메시지를 하나의 바이너리 프레임으로 묶습니다.
+
+    :param messages: 묶을 메시지 목록
+    :return: 묶인 프레임
+    """
+    parts = [BATCH_MAGIC]
+    for message in messages:
+        if isinstance(message, str):
+            payload = message.encode(encoding="utf-8")
+            parts.append(BATCH_ITEM.pack(0, len(payload)))
+        else:
+            payload = message
+            parts.append(BATCH_ITEM.pack(1, len(payload)))
+        parts.append(payload)
+    return b"".join(parts)
+
+
+def is_packed(frame:Union[str, bytes]) -> bool:
+    """
+    pack_messages 로 묶인 프레임인지 확인합니다.
+
+    :param frame: 수신한 프레임
+    :return: 묶인 프레임이면 True
+    """
+    return isinstance(frame, bytes) and frame.startswith(BATCH_MAGIC)
+
+
+def unpack_messages(frame:bytes) -> List[Union[str, bytes]]:
+    """
+    pack_messages 로 묶인 프레임을 메시지 목록으로 풉니다.
+
+    :param frame: 묶인 프레임
+    :return: 메시지 목록
+    :raises ValueError: 프레임이 잘렸거나 형식이 맞지 않을 때
+    """
+    messages = []
+    view = memoryview(frame)
+    offset = len(BATCH_MAGIC)
+    while offset < len(view):
+        if offset + BATCH_ITEM.size > len(view):
+            raise ValueError("Truncated batch frame")
+        kind, length = BATCH_ITEM.unpack_from(view, offset)
+        offset += BATCH_ITEM.size
+        if kind not in (0, 1) or offset + length > len(view):
+            raise ValueError("Malformed batch frame")
+        payload = view[offset:offset + length]
+        offset += length
+        messages.append(str(payload, encoding="utf-8") if kind == 0 else payload.tobytes())
+    return messages
+
+
+# 요청/응답 짝을 맞추기 위한 봉투 형식
+#   REQUEST_MAGIC 또는 RESPONSE_MAGIC + (타입 1바이트: 0=str, 1=bytes, 2=None, 3=오류) + (요청 ID 8바이트, big endian) + 본문
+#   오류 응답의 본문은 UTF-8 로 인코딩된 오류 메시지입니다.
+REQUEST_MAGIC = b"\xffRQ"
+RESPONSE_MAGIC = b"\xffRS"
+ENVELOPE = struct.Struct(">BQ")
+
+
+class RemoteError(Exception):
+    """
+    서버가 요청을 처리하다 실패했을 때 Client.request() 가 발생시키는 예외
+    """
+    pass
+
+
+def pack_envelope(magic:bytes, request_id:int, message:Union[str, bytes, None, RemoteError]) -> bytes:
+    """
+    메시지를 요청 ID 가 붙은 봉투로 감쌉니다.
+
+    :param magic: REQUEST_MAGIC 또는 RESPONSE_MAGIC
+    :param request_id: 요청 ID
+    :param message: 감쌀 메시지, RemoteError 이면 오류 응답
+    :return: 봉투 프레임
+    """
+    if isinstance(message, RemoteError):
+        return magic + ENVELOPE.pack(3, request_id) + str(message).encode(encoding="utf-8", errors="replace")
+    if message is None:
+        return magic + ENVELOPE.pack(2, request_id)
+    if isinstance(message, str):
+        return magic + ENVELOPE.pack(0, request_id) + message.encode(encoding="utf-8")
+    return b"".join((magic, ENVELOPE.pack(1, request_id), message))
+
+
+def unpack_envelope(frame:bytes) -> Tuple[int, Union[str, bytes, None, RemoteError]]:
+    """
+    봉투 프레임에서 요청 ID 와 메시지를 꺼냅니다.
+
+    :param frame: 봉투 프레임
+    :return: (요청 ID, 메시지), 오류 응답이면 메시지 자리에 RemoteError 객체
+    """
+    kind, request_id = ENVELOPE.unpack_from(frame, len(REQUEST_MAGIC))
+    payload = frame[len(REQUEST_MAGIC) + ENVELOPE.size:]
+    if kind == 0:
+        return request_id, payload.decode(encoding="utf-8")
+    if kind == 1:
+        return request_id, payload
+    if kind == 3:
+        return request_id, RemoteError(payload.decode(encoding="utf-8", errors="replace"))
+    return request_id, None
+
+
+def is_request(frame:Union[str, bytes]) -> bool:
+    """
+    요청 봉투 프레임인지 확인합니다.
+    """
+    return isinstance(frame, bytes) and frame.startswith(REQUEST_MAGIC)
+
+
+def is_response(frame:Union[str, bytes]) -> bool:
+    """
+    응답 봉투 프레임인지 확인합니다.
+    """
+    return isinstance(frame, bytes) and frame.startswith(RESPONSE_MAGIC)
+
+
+#
+# codecs
+#
+class Codec(object):
+    """
+    메시지 객체와 웹소켓 프레임 사이의 변환을 담당하는 기본 클래스 (raw bytes passthrough)
+    str, bytes, bytearray, memoryview 를 복사하지 않고 그대로 전달합니다.
+    """
+
+    name = "raw"
+
+    def encode(self, message:Any) -> Union[str, bytes, bytearray, memoryview]:
+        """
+        메시지를 프레임으로 변환합니다.
+
+        :param message: 보낼 메시지
+        :return: 프레임
+        """
+        if isinstance(message, (str, bytes, bytearray, memoryview)):
+            return message
+        raise TypeError(f"{self.name} codec can not encode {type(message).__name__}")
+
+    def decode(self, frame:Union[str, bytes]) -> Any:
+        """
+        프레임을 메시지로 변환합니다.
+
+        :param frame: 받은 프레임
+        :return: 메시지
+        """
+        return frame
+
+
+class JsonCodec(Codec):
+    """
+    JSON 텍스트 프레임 코덱
+    """
+
+    name = "json"
+
+    def encode(self, message:Any) -> str:
+        # websockets 가 텍스트 프레임을 만들 때 한 번만 utf-8 로 인코딩하도록 str 로 넘김
+        return json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+
+    def decode(self, frame:Union[str, bytes]) -> Any:
+        # json.loads 는 bytes 도 바로 받으므로 따로 decode 하지 않음
+        return json.loads(frame)
+
+
+class MsgpackCodec(Codec):
+    """
+    msgpack 바이너리 프레임 코덱 (msgpack 패키지 필요)
+    """
+
+    name = "msgpack"
+
+    def __init__(self):
+        import msgpack
+        self.packb = msgpack.packb
+        self.unpackb = msgpack.unpackb
+
+    def encode(self, message:Any) -> bytes:
+        return self.packb(message, use_bin_type=True)
+
+    def decode(self, frame:Union[str, bytes]) -> Any:
+        # unpackb 는 bytes, memoryview 를 복사 없이 읽음
+        return self.unpackb(frame, raw=False)
+
+
+CODECS = {
+    "raw": Codec,
+    "json": JsonCodec,
+    "msgpack": MsgpackCodec,
+}
+
+
+#
+# compression
+#
+class Compression(object):
+    """
+    permessage-deflate 설정과 송신 압축 통계를 관리하는 클래스
+    Server, Client 의 compression 인수로 넘기면 양쪽 모두 같은 설정으로 협상합니다.
+    """
+
+    def __init__(self, window_bits:int=12, mem_level:int=5, level:int=6, min_size:int=1024, no_context_takeover:bool=False):
+        """
+        Compression 클래스의 생성자
+
+        :param window_bits: 압축 윈도우 크기 (9 ~ 15, 클수록 압축률과 메모리 사용량이 커짐)
+        :param mem_level: zlib 메모리 레벨 (1 ~ 9)
+        :param level: zlib 압축 레벨 (0 ~ 9, 클수록 CPU 를 더 사용)
+        :param min_size: 이 크기(바이트)보다 작은 메시지는 압축하지 않고 전송
+        :param no_context_takeover: True 이면 메시지마다 압축 사전을 초기화 (메모리 절약, 압축률 하락)
+        """
+        if not 9 <= window_bits <= 15:
+            raise ValueError(f"window_bits must be between 9 and 15: {window_bits}")
+
+        self.window_bits = window_bits
+        self.mem_level = mem_level
+        self.level = level
+        self.min_size = min_size
+        self.no_context_takeover = no_context_takeover
+
+        # 송신 통계
+        self.raw_frames = 0
+        self.raw_bytes = 0
+        self.compressed_frames = 0
+        self.compressed_input_bytes = 0
+        self.compressed_output_bytes = 0
+
+    @property
+    def compress_settings(self) -> Dict[str, int]:
+        return {"memLevel": self.mem_level, "level": self.level}
+
+    def server_extensions(self) -> list:
+        """
+        wss.serve 에 넘길 extensions 목록
+        """
+        return [ServerDeflateFactory(
+            self,
+            server_no_context_takeover=self.no_context_takeover,
+            client_no_context_takeover=self.no_context_takeover,
+            server_max_window_bits=self.window_bits,
+            client_max_window_bits=self.window_bits,
+            compress_settings=self.compress_settings,
+        )]
+
+    def client_extensions(self) -> list:
+        """
+        wss.connect 에 넘길 extensions 목록
+        """
+        return [ClientDeflateFactory(
+            self,
+            server_no_context_takeover=self.no_context_takeover,
+            client_no_context_takeover=self.no_context_takeover,
+            server_max_window_bits=self.window_bits,
+            client_max_window_bits=self.window_bits,
+            compress_settings=self.compress_settings,
+        )]
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        송신 압축 통계
+        """
+        return {
+            "raw_frames": self.raw_frames,
+            "raw_bytes": self.raw_bytes,
+            "compressed_frames": self.compressed_frames,
+            "compressed_input_bytes": self.compressed_input_bytes,
+            "compressed_output_bytes": self.compressed_output_bytes,
+            "ratio": self.compressed_output_bytes / self.compressed_input_bytes if self.compressed_input_bytes else 1.0,
+        }
+
+
+class ThresholdDeflate(PerMessageDeflate):
+    """
+    min_size 보다 작은 메시지는 압축하지 않는 permessage-deflate 확장
+    RFC 7692 에 따라 rsv1 비트가 없는 메시지는 압축되지 않은 것으로 처리되므로 상대방과 호환됩니다.
+    """
+
+    def __init__(self, settings:Compression, extension:PerMessageDeflate):
+        super().__init__(
+            extension.remote_no_context_takeover,
+            extension.local_no_context_takeover,
+            extension.remote_max_window_bits,
+            extension.local_max_window_bits,
+            extension.compress_settings,
+        )
+        self.settings = settings
+        self.compressing = False
+
+    def encode(self, frame:Frame) -> Frame:
+        settings = self.settings
+
+        if frame.opcode in (Opcode.TEXT, Opcode.BINARY):
+            self.compressing = not (frame.fin and len(frame.data) < settings.min_size)
+        elif frame.opcode is not Opcode.CONT:
+            # 제어 프레임
+            return frame
+
+        if not self.compressing:
+            settings.raw_frames += 1
+            settings.raw_bytes += len(frame.data)
+            return frame
+
+        encoded = super().encode(frame)
+        settings.compressed_frames += 1
+        settings.compressed_input_bytes += len(frame.data)
+        settings.compressed_output_bytes += len(encoded.data)
+        return encoded
+
+
+class ServerDeflateFactory(ServerPerMessageDeflateFactory):
+    """
+    ThresholdDeflate 를 협상하는 서버 확장 팩토리
+    """
+
+    def __init__(self, settings:Compression, **kwargs):
+        super().__init__(**kwargs)
+        self.settings = settings
+
+    def process_request_params(self, params, accepted_extensions):
+        response_params, extension = super().process_request_params(params, accepted_extensions)
+        return response_params, ThresholdDeflate(self.settings, extension)
+
+
+class ClientDeflateFactory(ClientPerMessageDeflateFactory):
+    """
+    ThresholdDeflate 를 협상하는 클라이언트 확장 팩토리
+    """
+
+    def __init__(self, settings:Compression, **kwargs):
+        super().__init__(**kwargs)
+        self.settings = settings
+
+    def process_response_params(self, params, accepted_extensions):
+        return ThresholdDeflate(self.settings, super().process_response_params(params, accepted_extensions))
+
+
+def compression_options(compression:Union[str, Compression, None], server:bool) -> Dict[str, Any]:
+    """
+    wss.serve / wss.connect 에 넘길 압축 관련 인수를 만듭니다.
+
+    :param compression: "deflate" (websockets 기본 설정), None (압축 안 함) 또는 Compression 객체
+    :param server: 서버용이면 True
+    :return: 키워드 인수
+    """
+    if isinstance(compression, Compression):
+        extensions = compression.server_extensions() if server else compression.client_extensions()
+        return {"compression": None, "extensions": extensions}
+    return {"compression": compression}
+
+
+def get_codec(codec:Union[str, Codec, None]) -> Codec:
+    """
+    이름 또는 객체로 코덱을 가져옵니다.
+
+    :param codec: "raw", "json", "msgpack", Codec 객체 또는 None (raw)
+    :return: Codec 객체
+    """
+    if codec is None:
+        return Codec()
+    if isinstance(codec, Codec):
+        return codec
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec: {codec}")
+    return CODECS[codec]()
 
 class Socket(object):
     """
     WebSocket 연결을 관리하는 기본 클래스
     """
 
-    def __init__(self, max_retries:int=5, retry_delay:int=2):
+    def __init__(self, max_retries:int=5, retry_delay:float=2, backoff_max:float=30.0, jitter:bool=True,
+                 reconnect:bool=False, outbox_size:int=1000, codec:Union[str, Codec, None]=None,
+                 compression:Union[str, Compression, None]="deflate"):
         """
         Socket 클래스의 생성자
 
         :param max_retries: 최대 재시도 횟수
-        :param retry_delay: 재시도 간격 (초)
+        :param retry_delay: 첫 재시도 간격 (초), 재시도마다 두 배씩 늘어남
+        :param backoff_max: 재시도 간격의 최대값 (초)
+        :param jitter: True 이면 0 ~ 재시도 간격 사이의 임의 시간만큼 대기 (full jitter)
+        :param reconnect: True 이면 연결이 끊어졌을 때 연결될 때까지 계속 재연결
+        :param outbox_size: 재연결 모드에서 연결이 끊긴 동안 보관할 최대 송신 메시지 수
+        :param codec: 메시지 코덱 ("raw", "json", "msgpack" 또는 Codec 객체), 기본값은 raw
+        :param compression: permessage-deflate 설정 ("deflate", None 또는 Compression 객체)
         """
         self.connected = False
+        self.codec = get_codec(codec)
+        self.compression = compression
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.reconnect = reconnect
+        self.outbox = deque(maxlen=outbox_size)
+        self.closing = False
+        self.connect_options:Optional[Dict[str, Any]] = None
+        self.watcher:Optional[asyncio.Task] = None
+
+        # 연결 통계
+        self.connect_attempts = 0
+        self.connect_failures = 0
+        self.reconnects = 0
+        self.last_connect_seconds = 0.0
+        self.last_downtime = 0.0
+        self.total_downtime = 0.0
+        self.replayed = 0
+        self.outbox_dropped = 0
+
+    def backoff(self, attempt:int) -> float:
+        """
+        재시도 대기 시간을 계산합니다.
+
+        :param attempt: 실패한 횟수 (1부터)
+        :return: 대기 시간 (초)
+        """
+        delay = min(self.backoff_max, self.retry_delay * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
 
-    async def connect(self, uri:str, additional_headers:Optional[Dict[str, str]]=None, ping_interval=20, ping_timeout=10):
+    async def connect(self, uri:str, additional_headers:Optional[Dict[str, str]]=None, ping_interval=20, ping_timeout=10) -> bool:
         """
         서버에 연결을 시도합니다.
 
         :param uri: 서버 URI
         :param extra_headers: 추가 헤더
+        :return: 연결되었으면 True
+        """
+        self.connect_options = dict(
+                uri=uri,
+                additional_headers=additional_headers,
+                ping_interval=ping_interval,
+                ping_timeout=ping_timeout,
+                **compression_options(self.compression, server=False)
+            )
+        self.closing = False
+        return await self.establish(self.max_retries)
+
+    async def establish(self, max_retries:Optional[int]) -> bool:
+        """
+        저장된 연결 설정으로 연결될 때까지 재시도합니다.
+
+        :param max_retries: 최대 재시도 횟수, None 이면 무한히 재시도
+        :return: 연결되었으면 True
         """
         retries = 0
+        begin = time.monotonic()
 
-        while retries < self.max_retries:
+        while max_retries is None or retries < max_retries:
+            self.connect_attempts += 1
             try:
-                self.websocket = await wss.connect(
-                        uri, 
-                        additional_headers=additional_headers, 
-                        ping_interval=ping_interval, 
-                        ping_timeout=ping_timeout
-                    )
+                self.websocket = await wss.connect(**self.connect_options)
                 self.connected = True
+                self.last_connect_seconds = time.monotonic() - begin
                 print("Connected")
-                return
+
+                await self.replay()
+                if self.reconnect and (self.watcher is None or self.watcher.done()):
+                    self.watcher = asyncio.create_task(self.watch())
+                return True
             
             except Exception as e:
                 print(f"Connection failed: {e}")
+                self.connect_failures += 1
                 retries += 1
-                print(f"Retrying... ({retries}/{self.max_retries})")
-                await asyncio.sleep(self.retry_delay)
+                delay = self.backoff(retries)
+                print(f"Retrying in {delay:.2f}s... ({retries}/{max_retries if max_retries is not None else 'inf'})")
+                await asyncio.sleep(delay)
 
         print("Failed to connect after maximum retries")
+        return False
+
+    async def watch(self):
+        """
+        재연결 모드에서 연결이 끊어지는지 지켜보고, 끊어지면 연결될 때까지 다시 연결합니다.
+        """
+        while not self.closing:
+            await self.websocket.wait_closed()
+            if self.closing:
+                return
+
+            self.connected = False
+            print("Connection lost, reconnecting...")
+            lost_at = time.monotonic()
+            await self.establish(None)
+
+            self.reconnects += 1
+            self.last_downtime = time.monotonic() - lost_at
+            self.total_downtime += self.last_downtime
+
+    def buffer(self, message:Union[str, bytes]) -> bool:
+        """
+        재연결 모드에서 연결이 끊긴 동안 보낸 메시지를 보관합니다.
+        보관함이 가득 차면 가장 오래된 메시지를 버립니다.
+
+        :param message: 보관할 메시지
+        :return: 보관했으면 True
+        """
+        if not self.reconnect or self.closing:
+            return False
+
+        if len(self.outbox) == self.outbox.maxlen:
+            self.outbox_dropped += 1
+        self.outbox.append(message)
+        return True
+
+    async def replay(self):
+        """
+        재연결 후 보관해 둔 메시지를 순서대로 전송합니다.
+        """
+        while self.outbox and self.connected:
+            message = self.outbox.popleft()
+            try:
+                await self.websocket.send(message)
+                self.replayed += 1
+            except wss.ConnectionClosed:
+                self.outbox.appendleft(message)
+                self.connected = False
+
+    @property
+    def reconnect_stats(self) -> Dict[str, float]:
+        """
+        연결/재연결 통계
+        """
+        return {
+            "connect_attempts": self.connect_attempts,
+            "connect_failures": self.connect_failures,
+            "reconnects": self.reconnects,
+            "last_connect_seconds": self.last_connect_seconds,
+            "last_downtime": self.last_downtime,
+            "total_downtime": self.total_downtime,
+            "buffered": len(self.outbox),
+            "replayed": self.replayed,
+            "outbox_dropped": self.outbox_dropped,
+        }
 
     async def disconnect(self):
         """
         서버와의 연결을 종료합니다.
         """
+        self.closing = True
+        if self.watcher is not None:
+            if self.watcher is not asyncio.current_task():
+                self.watcher.cancel()
+            self.watcher = None
+
         if self.connected:
             await self.websocket.close()
             self.connected = False
             print("Disconnected")
 
-    async def send(self, message:Union[str, bytes], timeout:Optional[float]=None):
+    async def send(self, message:Any, timeout:Optional[float]=None):
         """
         서버로 메시지를 전송합니다.
+        메시지는 코덱으로 인코딩한 뒤 전송합니다.
 
         :param message: 전송할 메시지
         :param timeout: 타임아웃 시간 (초)
         """
+        await self.send_frame(self.codec.encode(message), timeout)
+
+    async def send_frame(self, frame:Union[str, bytes], timeout:Optional[float]=None):
+        """
+        인코딩된 프레임을 그대로 전송합니다.
+        재연결 모드에서는 연결이 끊긴 동안의 프레임을 보관했다가 재연결 후 전송합니다.
+
+        :param frame: 전송할 프레임
+        :param timeout: 타임아웃 시간 (초)
+        """
         if self.connected:
             try:
-                await asyncio.wait_for(self.websocket.send(message), timeout)
+                await asyncio.wait_for(self.websocket.send(frame), timeout)
             except asyncio.TimeoutError:
                 print("Send message timed out")
-        else:
+            except wss.ConnectionClosed:
+                self.connected = False
+                if not self.buffer(frame):
+                    print("Connection closed")
+        elif not self.buffer(frame):
             print("Not connected")
 
     async def receive(self, timeout:Optional[float]=None):
@@ -83,11 +617,11 @@ class Socket(object):
         서버로부터 메시지를 수신합니다.
 
         :param timeout: 타임아웃 시간 (초)
-        :return: 수신한 메시지
+        :return: 수신한 메시지 (코덱으로 디코딩)
         """
         if self.connected:
             try:
-                return await asyncio.wait_for(self.websocket.recv(), timeout)
+                return self.codec.decode(await asyncio.wait_for(self.websocket.recv(), timeout))
             except asyncio.TimeoutError:
                 print("Receive message timed out")
                 return None
@@ -165,156 +699,1195 @@ class Socket(object):
         return self.websocket.ping()
 
 
-class Server(Socket):
+class Tracer(object):
     """
-    WebSocket 서버를 관리하는 클래스
+    소켓 메시지 추적 기록기
+    N 개 중 1 개의 메시지만, 기본적으로 크기와 처리 시간 같은 메타데이터만 로그로 남깁니다.
+    Server(trace=None) 이면 메시지마다 None 비교 한 번 외에는 비용이 없습니다.
     """
 
-    def __init__(self, host:str="localhost", port:int=8765, max_retries:int=5, retry_delay:int=2, message_handler:Optional[callable]=None):
+    def __init__(self, sample:int=100, level:int=logging.DEBUG, payload:bool=False, max_payload:int=200,
+                 logger:Optional[logging.Logger]=None):
         """
-        Server 클래스의 생성자
+        Tracer 클래스의 생성자
 
-        :param host: 서버 호스트
-        :param port: 서버 포트
-        :param max_retries: 최대 재시도 횟수
-        :param retry_delay: 재시도 간격 (초)
-        :param message_handler: 사용자 정의 메시지 핸들러
+        :param sample: N 개의 메시지 중 1 개를 기록
+        :param level: 로그 레벨 (로거에서 꺼져 있으면 기록하지 않음)
+        :param payload: True 이면 메시지 내용 앞부분도 기록
+        :param max_payload: 기록할 메시지 내용의 최대 길이
+        :param logger: 기록할 로거 (기본값은 "sockets" 로거)
         """
-        super().__init__(max_retries, retry_delay)
-        self.host = host
-        self.port = port
-        self.message_handler = message_handler if message_handler else self.default_message_handler
-
-    def set_message_handler(self, message_handler:callable):
+        self.sample = max(1, sample)
+        self.level = level
+        self.payload = payload
+        self.max_payload = max_payload
+        self.logger = logger if logger else logging.getLogger("sockets")
+        self.count = 0
+        self.traced = 0
+
+    def trace(self, session:"Session", message:Union[str, bytes], latency:float):
         """
-        사용자 정의 메시지 핸들러를 설정합니다.
+        메시지 하나를 추적합니다. 표본에 들지 않으면 바로 돌아갑니다.
 
-        :param message_handler: 사용자 정의 메시지 핸들러 함수
+        :param session: 메시지를 보낸 세션
+        :param message: 수신한 프레임
+        :param latency: 수신부터 처리 완료까지 걸린 시간 (초)
         """
-        self.message_handler = message_handler
+        self.count += 1
+        if self.count % self.sample or not self.logger.isEnabledFor(self.level):
+            return
+
+        self.traced += 1
+        if self.payload:
+            self.logger.log(self.level, "recv session=%d size=%d latency=%.3fms payload=%r",
+                            session.id, len(message), latency * 1000, message[:self.max_payload])
+        else:
+            self.logger.log(self.level, "recv session=%d size=%d latency=%.3fms",
+                            session.id, len(message), latency * 1000)
+
 
-    async def process(self, websocket:wss.WebSocketServerProtocol, path:str):
+class Session(object):
+    """
+    서버에 연결된 개별 클라이언트의 연결 상태를 관리하는 클래스
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, websocket:wss.WebSocketServerProtocol, path:Optional[str]=None, max_inflight:int=100):
         """
-        클라이언트로부터 메시지를 처리합니다.
+        Session 클래스의 생성자
 
-        :param websocket: 웹소켓 객체
+        :param websocket: 클라이언트와 연결된 웹소켓 객체
         :param path: 요청 경로
+        :param max_inflight: 동시에 처리할 수 있는 요청(봉투) 메시지의 최대 개수
         """
+        self.id = next(Session._ids)
+        self.websocket = websocket
+        self.path = path
         self.connected = True
-        self.websocket = websocket  # websocket 설정
+        self.connected_at = time.monotonic()
+        self.received = 0
+        self.sent = 0
+        self.inflight = asyncio.Semaphore(max_inflight)
+        self.tasks:Set[asyncio.Task] = set()
 
-        try:
-            async for message in websocket:
-                print(f"Received message: {message}")
-                response = self.message_handler(message)
-                await self.send(response)
+    async def send(self, message:Union[str, bytes], timeout:Optional[float]=None):
+        """
+        이 세션의 클라이언트로 메시지를 전송합니다.
 
-        except Exception as e:
-            await self.handle_error(e)
+        :param message: 전송할 메시지
+        :param timeout: 타임아웃 시간 (초)
+        """
+        if not self.connected:
+            print(f"Session {self.id} is not connected")
+            return
 
-        finally:
+        try:
+            await asyncio.wait_for(self.websocket.send(message), timeout)
+            self.sent += 1
+        except asyncio.TimeoutError:
+            print(f"Session {self.id} send message timed out")
+        except wss.ConnectionClosed:
             self.connected = False
-            self.websocket = None  # 연결 종료 시 websocket 해제
 
-    def default_message_handler(self, message:str) -> bytes:
+    async def receive(self, timeout:Optional[float]=None):
         """
-        기본 메시지 핸들러
+        이 세션의 클라이언트로부터 메시지를 수신합니다.
 
-        :param message: 수신한 메시지
-        :return: 처리된 메시지
+        :param timeout: 타임아웃 시간 (초)
+        :return: 수신한 메시지
         """
-        import json
-        return json.dumps({"processed": message.upper()}).encode(encoding="utf-8")
+        if not self.connected:
+            print(f"Session {self.id} is not connected")
+            return None
 
-    async def start(self):
+        try:
+            message = await asyncio.wait_for(self.websocket.recv(), timeout)
+            self.received += 1
+            return message
+        except asyncio.TimeoutError:
+            print(f"Session {self.id} receive message timed out")
+            return None
+        except wss.ConnectionClosed:
+            self.connected = False
+            return None
+
+    async def close(self):
         """
-        서버를 시작합니다.
+        이 세션의 연결을 종료합니다.
         """
-        self.server = await wss.serve(self.process, self.host, self.port)
-        print(f"Server started on ws://{self.host}:{self.port}")
-        await self.server.wait_closed()
+        if self.connected:
+            self.connected = False
+            await self.websocket.close()
 
-    async def stop(self):
+    def ping(self):
         """
-        서버를 종료합니다.
+        이 세션의 클라이언트에 ping 신호 전송
         """
-        self.server.close()
-        await self.server.wait_closed()
-        await self.disconnect()
+        return self.websocket.ping()
 
+    def __repr__(self) -> str:
+        return f"Session(id={self.id}, path={self.path}, connected={self.connected})"
 
-class Client(Socket):
+
+class Subscriber(object):
     """
-    WebSocket 클라이언트를 관리하는 클래스
+    pub/sub 구독자 한 명의 송신 큐를 관리하는 클래스
+    구독자마다 크기가 제한된 큐와 송신 태스크를 두어 느린 구독자가 다른 구독자를 막지 않도록 합니다.
     """
 
-    def __init__(self, uri:str, max_retries:int=5, retry_delay:int=2):
-        """
-        Client 클래스의 생성자
-
-        :param uri: 서버 URI
-        :param max_retries: 최대 재시도 횟수
-        :param retry_delay: 재시도 간격 (초)
+    def __init__(self, broker:"Broker", session:Session):
         """
-        super().__init__(max_retries, retry_delay)
-        self.uri = uri
+        Subscriber 클래스의 생성자
 
-    async def connect(self, additional_headers:Optional[Dict[str, str]]=None, ping_interval=20, ping_timeout=10):
+        :param broker: 구독자를 관리하는 브로커
+        :param session: 구독자의 세션
         """
-        서버에 연결합니다.
+        self.broker = broker
+        self.session = session
+        self.topics:Set[str] = set()
+        self.queue = asyncio.Queue(maxsize=broker.queue_size)
+        self.dropped = 0
+        self.task = asyncio.create_task(self.run())
+
+    def offer(self, frame:Union[str, bytes]) -> bool:
         """
-        await super().connect(self.uri, additional_headers=additional_headers, ping_interval=ping_interval, ping_timeout=ping_timeout)
+        송신 큐에 프레임을 넣습니다. 대기하지 않습니다.
 
-    async def send(self, message:str, timeout:Optional[int]=None):
+        :param frame: 전송할 프레임
+        :return: 큐에 들어갔으면 True
         """
-        서버로 메시지를 전송합니다.
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            pass
 
-        :param message: 전송할 메시지
-        :param timeout: 타임아웃 시간 (초)
-        """
-        await super().send(message, timeout)
+        self.dropped += 1
+        self.broker.dropped += 1
 
-    async def receive(self, timeout:Optional[int]=None):
-        """
-        서버로부터 메시지를 수신합니다.
+        if self.broker.policy == "drop_oldest":
+            self.queue.get_nowait()
+            self.queue.put_nowait(frame)
+            return True
 
-        :param timeout: 타임아웃 시간 (초)
-        :return: 수신한 메시지
+        return False
+
+    async def run(self):
+        """
+        송신 큐의 프레임을 순서대로 전송합니다.
+        연결이 끊어지거나 전송에 실패하면 브로커에서 스스로 빠집니다.
         """
-        return await super().receive(timeout)           
+        try:
+            while self.session.connected:
+                frame = await self.queue.get()
+                await self.session.send(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Session {self.session.id} broadcast failed: {e}")
 
-    async def start(self, extra_headers:Optional[Dict[str, str]]=None):
+        self.broker.remove(self.session)
+
+    def close(self):
         """
-        클라이언트를 시작합니다.
+        송신 태스크를 종료합니다.
         """
-        await self.connect(additional_headers=extra_headers)
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
 
 
-#
-# for unittest
-#
-async def unittest():
+class Broker(object):
     """
-    유닛 테스트 함수
+    토픽 기반 publish/subscribe 를 처리하는 클래스
+
+    클라이언트는 다음 형식의 텍스트 메시지로 구독을 제어합니다.
+        {"__broker__": "subscribe", "topic": "<topic>"}
+        {"__broker__": "unsubscribe", "topic": "<topic>"}
+    제어 키를 "__broker__" 로 구분하므로 일반 JSON 메시지와 겹치지 않습니다.
     """
-    def custom_message_handler(message:str) -> bytes:
-        """
-        사용자 정의 메시지 핸들러
 
-        :param message: 수신한 메시지
-        :return: 처리된 메시지
+    POLICIES = ("drop_oldest", "drop_new", "disconnect")
+    CONTROL_KEY = "__broker__"
+    CONTROL_PREFIX = '{"__broker__"'
+
+    def __init__(self, queue_size:int=100, policy:str="drop_oldest"):
         """
-        import json
-        return json.dumps({"custom_processed": message.upper()}).encode(encoding="utf-8")
+        Broker 클래스의 생성자
 
-    server = Server()
-    client = Client(uri="ws://localhost:8765")
+        :param queue_size: 구독자 별 송신 대기 큐의 최대 크기
+        :param policy: 큐가 가득 찼을 때의 정책 ("drop_oldest", "drop_new", "disconnect")
+        """
+        if policy not in Broker.POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+
+        self.queue_size = queue_size
+        self.policy = policy
+        self.topics:Dict[str, Set[int]] = {}
+        self.subscribers:Dict[int, Subscriber] = {}
+        self.tasks:Set[asyncio.Task] = set()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.disconnected = 0
+
+    @staticmethod
+    def control_message(action:str, topic:str) -> str:
+        """
+        구독 제어 메시지를 만듭니다.
 
-    loop_server, server_task = await server.setup()
-    loop_client, client_task = await client.setup()
+        :param action: "subscribe" 또는 "unsubscribe"
+        :param topic: 토픽 이름
+        :return: 제어 메시지
+        """
+        return json.dumps({Broker.CONTROL_KEY: action, "topic": topic})
 
-    await asyncio.sleep(1)
-    server.set_message_handler(custom_message_handler)
+    def handle_control(self, session:Session, message:Union[str, bytes]) -> bool:
+        """
+        구독 제어 메시지이면 처리합니다.
+        접두어로 먼저 걸러내므로 일반 메시지는 JSON 파싱을 하지 않습니다.
+
+        :param session: 메시지를 보낸 세션
+        :param message: 수신한 메시지
+        :return: 제어 메시지로 처리했으면 True
+        """
+        if not isinstance(message, str) or not message.startswith(Broker.CONTROL_PREFIX):
+            return False
+
+        try:
+            control = json.loads(message)
+            action, topic = control[Broker.CONTROL_KEY], control["topic"]
+        except (ValueError, KeyError, TypeError):
+            return False
+
+        if not isinstance(topic, str):
+            return False
+
+        if action == "subscribe":
+            self.subscribe(session, topic)
+        elif action == "unsubscribe":
+            self.unsubscribe(session, topic)
+        else:
+            return False
+
+        return True
+
+    def subscribe(self, session:Session, topic:str):
+        """
+        세션을 토픽에 구독시킵니다.
+
+        :param session: 구독할 세션
+        :param topic: 토픽 이름
+        """
+        subscriber = self.subscribers.get(session.id)
+        if subscriber is None:
+            subscriber = Subscriber(self, session)
+            self.subscribers[session.id] = subscriber
+
+        subscriber.topics.add(topic)
+        self.topics.setdefault(topic, set()).add(session.id)
+
+    def unsubscribe(self, session:Session, topic:str):
+        """
+        세션의 토픽 구독을 해제합니다.
+
+        :param session: 구독을 해제할 세션
+        :param topic: 토픽 이름
+        """
+        members = self.topics.get(topic)
+        if members is not None:
+            members.discard(session.id)
+            if not members:
+                del self.topics[topic]
+
+        subscriber = self.subscribers.get(session.id)
+        if subscriber is not None:
+            subscriber.topics.discard(topic)
+            if not subscriber.topics:
+                self.remove(session)
+
+    def remove(self, session:Session):
+        """
+        세션의 모든 구독을 해제합니다.
+
+        :param session: 제거할 세션
+        """
+        subscriber = self.subscribers.pop(session.id, None)
+        if subscriber is None:
+            return
+
+        for topic in subscriber.topics:
+            members = self.topics.get(topic)
+            if members is not None:
+                members.discard(session.id)
+                if not members:
+                    del self.topics[topic]
+
+        subscriber.close()
+
+    def publish(self, topic:str, message:Any) -> int:
+        """
+        토픽의 모든 구독자에게 메시지를 전송합니다.
+        메시지는 한 번만 인코딩되고, 같은 프레임 객체가 각 구독자의 큐에 들어갑니다.
+        실제 전송은 구독자 별 송신 태스크가 동시에 처리합니다.
+        permessage-deflate 는 연결마다 따로 압축하므로, 큰 메시지를 많은 구독자에게 보낸다면
+        Server(compression=None) 으로 끄는 것이 훨씬 빠릅니다.
+
+        :param topic: 토픽 이름
+        :param message: 전송할 메시지 (str, bytes 이외의 값은 JSON 으로 인코딩)
+        :return: 큐에 넣은 구독자 수
+        """
+        members = self.topics.get(topic)
+        if not members:
+            return 0
+
+        if isinstance(message, (str, bytes)):
+            frame = message
+        else:
+            frame = json.dumps(message).encode(encoding="utf-8")
+
+        self.published += 1
+        delivered = 0
+        for session_id in list(members):
+            subscriber = self.subscribers[session_id]
+            if subscriber.offer(frame):
+                delivered += 1
+            elif self.policy == "disconnect":
+                self.disconnected += 1
+                self.remove(subscriber.session)
+                task = asyncio.create_task(subscriber.session.close())
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+
+        self.delivered += delivered
+        return delivered
+
+    def subscriber_count(self, topic:str) -> int:
+        """
+        토픽의 구독자 수
+
+        :param topic: 토픽 이름
+        :return: 구독자 수
+        """
+        return len(self.topics.get(topic, ()))
+
+
+class Server(Socket):
+    """
+    WebSocket 서버를 관리하는 클래스
+    """
+
+    def __init__(self, host:str="localhost", port:int=8765, max_retries:int=5, retry_delay:int=2, message_handler:Optional[callable]=None,
+                 executor:Optional[str]=None, max_workers:Optional[int]=None, max_pending:int=100,
+                 broker:Optional[Broker]=None, compression:Union[str, Compression, None]="deflate", max_inflight:int=100,
+                 codec:Union[str, Codec, None]=None, trace:Optional[Tracer]=None, unpack:bool=False):
+        """
+        Server 클래스의 생성자
+
+        :param host: 서버 호스트
+        :param port: 서버 포트
+        :param max_retries: 최대 재시도 횟수
+        :param retry_delay: 재시도 간격 (초)
+        :param message_handler: 사용자 정의 메시지 핸들러 (일반 함수 또는 코루틴 함수)
+        :param executor: 동기 핸들러를 실행할 풀 ("thread", "process", None 이면 이벤트 루프에서 직접 실행)
+        :param max_workers: 풀의 최대 작업자 수
+        :param max_pending: 동시에 처리 중인 핸들러 호출의 최대 개수 (초과 시 수신을 멈추고 대기)
+        :param broker: pub/sub 브로커 (None 이면 기본 설정의 Broker 사용)
+        :param compression: permessage-deflate 설정 ("deflate", None 또는 Compression 객체)
+        :param max_inflight: 연결 당 동시에 처리할 수 있는 요청(봉투) 메시지의 최대 개수
+        :param codec: 메시지 코덱 ("raw", "json", "msgpack" 또는 Codec 객체), 기본값은 raw
+                      raw 가 아니면 핸들러는 디코딩된 객체를 받고, 반환한 객체는 코덱으로 인코딩되어 전송됩니다.
+        :param trace: 수신 메시지 추적 기록기 (None 이면 기록하지 않음)
+        :param unpack: True 이면 Client(batch_pack=True) 가 묶어 보낸 프레임을 풀어서 처리
+                       False 이면 BATCH_MAGIC 으로 시작하는 바이너리 프레임도 그대로 핸들러에 전달합니다.
+        """
+        super().__init__(max_retries, retry_delay, codec=codec, compression=compression)
+        self.unpack = unpack
+        self.host = host
+        self.port = port
+        self.sessions:Dict[int, Session] = {}
+        self.total_connections = 0
+        self.broker = broker if broker else Broker()
+        self.tracer = trace
+        self.max_inflight = max_inflight
+        self.executor:Optional[Executor] = None
+        self.executor_type:Optional[str] = None
+        self.max_pending = max_pending
+        self.pending = asyncio.Semaphore(max_pending)
+        if message_handler is None:
+            message_handler = self.default_message_handler if self.codec.name == "raw" else self.default_object_handler
+        self.set_message_handler(message_handler, executor, max_workers)
+
+    @property
+    def connection_count(self) -> int:
+        """
+        현재 연결된 클라이언트 수
+        """
+        return len(self.sessions)
+
+    def get_session(self, session_id:int) -> Optional[Session]:
+        """
+        세션 ID로 세션을 찾습니다.
+
+        :param session_id: 세션 ID
+        :return: 세션 객체, 없으면 None
+        """
+        return self.sessions.get(session_id)
+
+    def register(self, session:Session):
+        """
+        세션을 연결 목록에 등록합니다.
+
+        :param session: 등록할 세션
+        """
+        self.sessions[session.id] = session
+        self.total_connections += 1
+        self.connected = True
+
+    def unregister(self, session:Session):
+        """
+        세션을 연결 목록에서 제거합니다.
+
+        :param session: 제거할 세션
+        """
+        session.connected = False
+        self.sessions.pop(session.id, None)
+        self.broker.remove(session)
+        self.connected = len(self.sessions) > 0
+
+    def set_message_handler(self, message_handler:callable, executor:Optional[str]=KEEP, max_workers:Optional[int]=None):
+        """
+        사용자 정의 메시지 핸들러를 설정합니다.
+        코루틴 함수는 이벤트 루프에서 await 되고, 일반 함수는 executor 가 지정되면 해당 풀에서 실행됩니다.
+        process 풀을 사용하는 경우 핸들러와 메시지는 pickle 가능해야 합니다.
+
+        :param message_handler: 사용자 정의 메시지 핸들러 함수
+        :param executor: 동기 핸들러를 실행할 풀 ("thread", "process", None). 생략하면 현재 풀을 유지합니다.
+        :param max_workers: 풀의 최대 작업자 수
+        """
+        if executor is KEEP:
+            executor = self.executor_type
+        elif executor not in (None, "thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}")
+
+        if executor == "process" and not inspect.iscoroutinefunction(message_handler):
+            try:
+                pickle.dumps(message_handler)
+            except Exception as e:
+                raise ValueError(f"Message handler must be picklable to run on a process pool: {e}") from e
+
+        if executor != self.executor_type or max_workers is not None:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
+                self.executor = None
+
+            if executor == "thread":
+                self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="handler")
+            elif executor == "process":
+                self.executor = ProcessPoolExecutor(max_workers=max_workers)
+            self.executor_type = executor
+
+        self.message_handler = message_handler
+
+    async def handle(self, message:Union[str, bytes]):
+        """
+        메시지 핸들러를 호출합니다.
+        동시에 처리 중인 호출이 max_pending 에 도달하면 빈 자리가 생길 때까지 대기합니다.
+
+        :param message: 수신한 메시지
+        :return: 핸들러의 처리 결과
+        """
+        handler = self.message_handler
+
+        async with self.pending:
+            if inspect.iscoroutinefunction(handler):
+                return await handler(message)
+
+            if self.executor is not None:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, handler, message)
+
+            response = handler(message)
+            if inspect.isawaitable(response):
+                response = await response
+            return response
+
+    async def process(self, websocket:wss.WebSocketServerProtocol, path:Optional[str]=None):
+        """
+        클라이언트로부터 메시지를 처리합니다.
+        연결마다 별도의 세션이 만들어지므로 여러 클라이언트를 동시에 처리할 수 있습니다.
+
+        :param websocket: 웹소켓 객체
+        :param path: 요청 경로 (websockets 13 이후 버전에서는 전달되지 않음)
+        """
+        if path is None:
+            request = getattr(websocket, "request", None)
+            path = getattr(request, "path", None)
+
+        session = Session(websocket, path, self.max_inflight)
+        self.register(session)
+
+        try:
+            async for message in websocket:
+                session.received += 1
+                tracer = self.tracer
+                begin = time.perf_counter() if tracer is not None else 0.0
+
+                if self.unpack and is_packed(message):
+                    try:
+                        items = unpack_messages(message)
+                    except (ValueError, struct.error) as e:
+                        # 잘못 묶인 프레임은 버리고 연결은 유지합니다.
+                        await self.handle_error(e)
+                        items = ()
+                    for item in items:
+                        await self.dispatch(session, item)
+                else:
+                    await self.dispatch(session, message)
+
+                if tracer is not None:
+                    tracer.trace(session, message, time.perf_counter() - begin)
+
+        except Exception as e:
+            await self.handle_error(e)
+
+        finally:
+            self.unregister(session)
+
+    async def dispatch(self, session:Session, message:Union[str, bytes]):
+        """
+        메시지 하나를 처리하고 응답을 전송합니다.
+        핸들러가 None 을 반환하면 응답하지 않습니다.
+
+        :param session: 메시지를 보낸 세션
+        :param message: 수신한 메시지
+        """
+        if is_request(message):
+            # 요청은 병렬로 처리하고 끝나는 순서대로 응답합니다.
+            await session.inflight.acquire()
+            task = asyncio.create_task(self.respond(session, message))
+            session.tasks.add(task)
+            task.add_done_callback(session.tasks.discard)
+            return
+
+        if self.broker.handle_control(session, message):
+            return
+
+        response = await self.handle(self.codec.decode(message))
+        if response is not None:
+            await session.send(self.codec.encode(response))
+
+    async def respond(self, session:Session, frame:bytes):
+        """
+        요청 봉투를 처리하고 같은 요청 ID 로 응답합니다.
+        디코딩이나 핸들러에서 오류가 나면 같은 요청 ID 로 오류 응답을 보내 클라이언트가 기다리지 않도록 합니다.
+
+        :param session: 요청을 보낸 세션
+        :param frame: 요청 봉투 프레임
+        """
+        request_id = None
+        try:
+            request_id, message = unpack_envelope(frame)
+            if message is not None:
+                message = self.codec.decode(message)
+            response = await self.handle(message)
+            if response is not None:
+                response = self.codec.encode(response)
+            await session.send(pack_envelope(RESPONSE_MAGIC, request_id, response))
+        except Exception as e:
+            await self.handle_error(e)
+            if request_id is not None:
+                error = RemoteError(f"{type(e).__name__}: {e}")
+                await session.send(pack_envelope(RESPONSE_MAGIC, request_id, error))
+        finally:
+            session.inflight.release()
+
+    def publish(self, topic:str, message:Any) -> int:
+        """
+        토픽의 모든 구독자에게 메시지를 전송합니다.
+
+        :param topic: 토픽 이름
+        :param message: 전송할 메시지 (raw 가 아닌 코덱이면 코덱으로 한 번 인코딩)
+        :return: 큐에 넣은 구독자 수
+        """
+        if self.codec.name != "raw":
+            message = self.codec.encode(message)
+        return self.broker.publish(topic, message)
+
+    async def send(self, message:Union[str, bytes], timeout:Optional[float]=None, session:Optional[Session]=None):
+        """
+        지정한 세션의 클라이언트로 메시지를 전송합니다.
+
+        :param message: 전송할 메시지
+        :param timeout: 타임아웃 시간 (초)
+        :param session: 메시지를 받을 세션
+        """
+        if session is None:
+            raise ValueError("Server.send requires a session; use Server.sessions or get_session() to pick one")
+
+        await session.send(self.codec.encode(message), timeout)
+
+    async def receive(self, timeout:Optional[float]=None, session:Optional[Session]=None):
+        """
+        지정한 세션의 클라이언트로부터 메시지를 수신합니다.
+
+        :param timeout: 타임아웃 시간 (초)
+        :param session: 메시지를 수신할 세션
+        :return: 수신한 메시지
+        """
+        if session is None:
+            raise ValueError("Server.receive requires a session; use Server.sessions or get_session() to pick one")
+
+        message = await session.receive(timeout)
+        return None if message is None else self.codec.decode(message)
+
+    async def disconnect(self):
+        """
+        연결된 모든 클라이언트와의 연결을 종료합니다.
+        """
+        sessions = list(self.sessions.values())
+        if sessions:
+            await asyncio.gather(*(session.close() for session in sessions), return_exceptions=True)
+            print(f"Disconnected {len(sessions)} sessions")
+
+        for session in sessions:
+            self.unregister(session)
+
+    @staticmethod
+    def default_object_handler(message:Any) -> Dict[str, Any]:
+        """
+        raw 가 아닌 코덱을 사용할 때의 기본 메시지 핸들러
+        디코딩된 메시지를 그대로 돌려주며, 인코딩은 서버의 코덱이 한 번만 수행합니다.
+
+        :param message: 수신한 메시지 (디코딩된 객체)
+        :return: 처리된 메시지
+        """
+        return {"processed": message}
+
+    @staticmethod
+    def default_message_handler(message:str) -> bytes:
+        """
+        기본 메시지 핸들러
+
+        :param message: 수신한 메시지
+        :return: 처리된 메시지
+        """
+        import json
+        return json.dumps({"processed": message.upper()}).encode(encoding="utf-8")
+
+    async def start(self):
+        """
+        서버를 시작합니다.
+        """
+        self.server = await wss.serve(self.process, self.host, self.port, **compression_options(self.compression, server=True))
+        print(f"Server started on ws://{self.host}:{self.port}")
+        await self.server.wait_closed()
+
+    async def stop(self):
+        """
+        서버를 종료합니다.
+        """
+        self.server.close()
+        await self.server.wait_closed()
+        await self.disconnect()
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+            self.executor_type = None
+
+
+class Batcher(object):
+    """
+    클라이언트의 송신 메시지를 모아서 한꺼번에 전송하는 클래스
+    메시지 수나 크기가 기준을 넘거나, 첫 메시지 이후 interval 이 지나면 전송(flush)합니다.
+    """
+
+    def __init__(self, client:"Client", max_messages:int=100, max_bytes:int=64*1024, interval:float=0.005, pack:bool=False):
+        """
+        Batcher 클래스의 생성자
+
+        :param client: 메시지를 전송할 클라이언트
+        :param max_messages: 한 번에 전송할 최대 메시지 수
+        :param max_bytes: 한 번에 전송할 최대 바이트 수
+        :param interval: 첫 메시지가 쌓인 뒤 전송까지 기다리는 최대 시간 (초)
+        :param pack: True 이면 모은 메시지를 하나의 프레임으로 묶어서 전송
+        """
+        self.client = client
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.pack = pack
+        self.buffer:List[Union[str, bytes]] = []
+        self.size = 0
+        self.timer:Optional[asyncio.TimerHandle] = None
+        self.lock = asyncio.Lock()
+        self.tasks:Set[asyncio.Task] = set()
+
+        # flush 통계
+        self.flushes = 0
+        self.size_flushes = 0
+        self.time_flushes = 0
+        self.messages = 0
+        self.frames = 0
+        self.bytes = 0
+
+    async def put(self, message:Union[str, bytes]):
+        """
+        메시지를 송신 버퍼에 넣습니다. 기준을 넘으면 바로 전송합니다.
+
+        :param message: 전송할 메시지
+        """
+        self.buffer.append(message)
+        self.size += len(message)
+
+        if len(self.buffer) >= self.max_messages or self.size >= self.max_bytes:
+            await self.flush("size")
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.interval, self.on_timer)
+
+    def on_timer(self):
+        """
+        interval 이 지나면 남은 메시지를 전송합니다.
+        """
+        self.timer = None
+        task = asyncio.create_task(self.flush("time"))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def flush(self, reason:str="manual"):
+        """
+        송신 버퍼의 메시지를 전송합니다.
+
+        :param reason: flush 원인 ("size", "time", "manual")
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        if not self.buffer:
+            return
+
+        messages, size = self.buffer, self.size
+        self.buffer, self.size = [], 0
+
+        async with self.lock:
+            websocket = self.client.websocket
+            sent = 0
+            try:
+                if self.pack and len(messages) > 1:
+                    await websocket.send(pack_messages(messages))
+                    sent = len(messages)
+                    self.frames += 1
+                else:
+                    # 메시지 사이에 타임아웃 처리 없이 연달아 써서 전송 버퍼에서 합쳐지도록 함
+                    for message in messages:
+                        await websocket.send(message)
+                        sent += 1
+                    self.frames += len(messages)
+            except wss.ConnectionClosed:
+                self.client.connected = False
+                unsent = [message for message in messages[sent:] if self.client.buffer(message)]
+                if len(unsent) < len(messages) - sent:
+                    print(f"Connection closed, {len(messages) - sent - len(unsent)} batched messages were not sent")
+                return
+
+        self.flushes += 1
+        self.messages += len(messages)
+        self.bytes += size
+        if reason == "size":
+            self.size_flushes += 1
+        elif reason == "time":
+            self.time_flushes += 1
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        flush 통계
+        """
+        return {
+            "flushes": self.flushes,
+            "size_flushes": self.size_flushes,
+            "time_flushes": self.time_flushes,
+            "messages": self.messages,
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "messages_per_flush": self.messages / self.flushes if self.flushes else 0.0,
+        }
+
+
+class Client(Socket):
+    """
+    WebSocket 클라이언트를 관리하는 클래스
+    """
+
+    # 백그라운드 수신 태스크가 끝났음을 receive() 에 알리는 inbox 표식
+    CLOSED = object()
+
+    def __init__(self, uri:str, max_retries:int=5, retry_delay:float=2, backoff_max:float=30.0, jitter:bool=True,
+                 reconnect:bool=False, outbox_size:int=1000, codec:Union[str, Codec, None]=None,
+                 compression:Union[str, Compression, None]="deflate",
+                 batch_size:int=0, batch_bytes:int=64*1024, batch_interval:float=0.005, batch_pack:bool=False):
+        """
+        Client 클래스의 생성자
+
+        :param uri: 서버 URI
+        :param max_retries: 최대 재시도 횟수
+        :param retry_delay: 첫 재시도 간격 (초), 재시도마다 두 배씩 늘어남
+        :param backoff_max: 재시도 간격의 최대값 (초)
+        :param jitter: True 이면 0 ~ 재시도 간격 사이의 임의 시간만큼 대기 (full jitter)
+        :param reconnect: True 이면 연결이 끊어졌을 때 연결될 때까지 계속 재연결
+        :param outbox_size: 재연결 모드에서 연결이 끊긴 동안 보관할 최대 송신 메시지 수
+        :param codec: 메시지 코덱 ("raw", "json", "msgpack" 또는 Codec 객체), 기본값은 raw
+        :param compression: permessage-deflate 설정 ("deflate", None 또는 Compression 객체)
+        :param batch_size: 0 보다 크면 송신 배치 모드를 켜고, 한 번에 전송할 최대 메시지 수로 사용
+        :param batch_bytes: 한 번에 전송할 최대 바이트 수
+        :param batch_interval: 메시지를 모으는 최대 시간 (초)
+        :param batch_pack: True 이면 모은 메시지를 하나의 프레임으로 묶어서 전송 (Server(unpack=True) 가 풀어서 처리)
+        """
+        super().__init__(max_retries, retry_delay, backoff_max, jitter, reconnect, outbox_size, codec, compression)
+        self.uri = uri
+        self.batcher = Batcher(self, batch_size, batch_bytes, batch_interval, batch_pack) if batch_size > 0 else None
+        self.request_ids = itertools.count(1)
+        self.requests:Dict[int, asyncio.Future] = {}
+        self.reader:Optional[asyncio.Task] = None
+        self.inbox:Optional[asyncio.Queue] = None
+
+    async def connect(self, additional_headers:Optional[Dict[str, str]]=None, ping_interval=20, ping_timeout=10) -> bool:
+        """
+        서버에 연결합니다.
+
+        :return: 연결되었으면 True
+        """
+        return await super().connect(self.uri, additional_headers=additional_headers, ping_interval=ping_interval, ping_timeout=ping_timeout)
+
+    async def send(self, message:Any, timeout:Optional[int]=None):
+        """
+        서버로 메시지를 전송합니다.
+
+        :param message: 전송할 메시지
+        :param timeout: 타임아웃 시간 (초), 배치 모드에서는 사용하지 않음
+        """
+        await self.send_frame(self.codec.encode(message), timeout)
+
+    async def send_frame(self, frame:Union[str, bytes], timeout:Optional[int]=None):
+        """
+        인코딩된 프레임을 전송합니다. 배치 모드에서는 송신 버퍼에 넣습니다.
+
+        :param frame: 전송할 프레임
+        :param timeout: 타임아웃 시간 (초), 배치 모드에서는 사용하지 않음
+        """
+        if self.batcher is not None and self.connected:
+            await self.batcher.put(frame)
+        else:
+            await super().send_frame(frame, timeout)
+
+    async def flush(self):
+        """
+        배치 모드에서 모아둔 메시지를 바로 전송합니다.
+        """
+        if self.batcher is not None and self.connected:
+            await self.batcher.flush()
+
+    async def disconnect(self):
+        """
+        모아둔 메시지를 전송한 뒤 서버와의 연결을 종료합니다.
+        """
+        await self.flush()
+        await super().disconnect()
+
+        if self.reader is not None:
+            self.reader.cancel()
+            self.reader = None
+
+    async def request(self, message:Any, timeout:Optional[float]=None) -> Any:
+        """
+        요청 ID 를 붙여 메시지를 전송하고 그 응답을 기다립니다.
+        여러 요청을 동시에 보낼 수 있으며, 응답은 백그라운드 수신 태스크가 요청 ID 로 찾아 전달합니다.
+
+        :param message: 전송할 메시지
+        :param timeout: 이 요청의 타임아웃 시간 (초)
+        :return: 응답 메시지, 타임아웃이나 연결 종료 시 None
+        :raises RemoteError: 서버가 요청을 처리하다 실패했을 때
+        """
+        if not self.connected:
+            print("Not connected")
+            return None
+
+        if self.reader is None:
+            if self.inbox is None:
+                self.inbox = asyncio.Queue()
+            self.reader = asyncio.create_task(self.read_loop())
+
+        request_id = next(self.request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self.requests[request_id] = future
+
+        try:
+            await self.send_frame(pack_envelope(REQUEST_MAGIC, request_id, self.codec.encode(message)))
+            response = await asyncio.wait_for(future, timeout)
+            return None if response is None else self.codec.decode(response)
+        except asyncio.TimeoutError:
+            print(f"Request {request_id} timed out")
+            return None
+        except ConnectionError as e:
+            print(f"Request {request_id} failed: {e}")
+            return None
+        finally:
+            self.requests.pop(request_id, None)
+
+    async def read_loop(self):
+        """
+        백그라운드에서 메시지를 수신합니다.
+        응답 봉투는 기다리는 요청에 전달하고, 그 외 메시지는 receive() 로 받을 수 있도록 inbox 에 넣습니다.
+        수신이 끝나면 기다리는 요청을 모두 실패시키고, 기다리는 receive() 가 깨어나도록 inbox 에 CLOSED 를 넣습니다.
+        """
+        error = ConnectionError("Connection closed")
+        try:
+            async for frame in self.websocket:
+                if is_response(frame):
+                    request_id, message = unpack_envelope(frame)
+                    future = self.requests.get(request_id)
+                    if future is not None and not future.done():
+                        if isinstance(message, RemoteError):
+                            future.set_exception(message)
+                        else:
+                            future.set_result(message)
+                else:
+                    await self.inbox.put(frame)
+        except wss.ConnectionClosed:
+            pass
+        except Exception as e:
+            await self.handle_error(e)
+            error = ConnectionError(f"Reader stopped: {type(e).__name__}: {e}")
+        finally:
+            for future in self.requests.values():
+                if not future.done():
+                    future.set_exception(error)
+            self.inbox.put_nowait(Client.CLOSED)
+
+            # 재연결 후 다음 request() 가 새 수신 태스크를 시작하도록 합니다.
+            if self.reader is asyncio.current_task():
+                self.reader = None
+
+    async def receive(self, timeout:Optional[int]=None):
+        """
+        서버로부터 메시지를 수신합니다.
+
+        :param timeout: 타임아웃 시간 (초)
+        :return: 수신한 메시지
+        """
+        if self.reader is None:
+            if self.inbox is not None and not self.inbox.empty():
+                frame = self.inbox.get_nowait()
+                if frame is not Client.CLOSED:
+                    return self.codec.decode(frame)
+            return await super().receive(timeout)
+
+        # request() 를 사용한 뒤에는 백그라운드 수신 태스크가 받은 메시지를 꺼냅니다.
+        try:
+            frame = await asyncio.wait_for(self.inbox.get(), timeout)
+        except asyncio.TimeoutError:
+            print("Receive message timed out")
+            return None
+
+        if frame is Client.CLOSED:
+            print("Connection closed")
+            return None
+        return self.codec.decode(frame)
+
+    async def subscribe(self, topic:str):
+        """
+        토픽을 구독합니다.
+
+        :param topic: 토픽 이름
+        """
+        await self.send_frame(Broker.control_message("subscribe", topic))
+
+    async def unsubscribe(self, topic:str):
+        """
+        토픽 구독을 해제합니다.
+
+        :param topic: 토픽 이름
+        """
+        await self.send_frame(Broker.control_message("unsubscribe", topic))
+
+    async def start(self, extra_headers:Optional[Dict[str, str]]=None):
+        """
+        클라이언트를 시작합니다.
+        """
+        await self.connect(additional_headers=extra_headers)
+
+
+class ClientPool(object):
+    """
+    하나 이상의 서버 URI 에 미리 연결해 둔 Client 들을 관리하는 클래스
+    처리 중인 요청이 가장 적은 연결을 골라 주고, 끊어진 연결은 백그라운드에서 교체합니다.
+    """
+
+    def __init__(self, uris:Union[str, List[str]], size:int=4, health_interval:float=10.0, ping_timeout:float=5.0, **client_options):
+        """
+        ClientPool 클래스의 생성자
+
+        :param uris: 서버 URI 또는 URI 목록 (연결은 URI 들에 번갈아 배정)
+        :param size: 유지할 연결 수
+        :param health_interval: 연결 상태 점검 주기 (초)
+        :param ping_timeout: 점검 시 ping 응답을 기다리는 시간 (초)
+        :param client_options: Client 생성자에 전달할 추가 인수
+        """
+        self.uris = [uris] if isinstance(uris, str) else list(uris)
+        self.size = size
+        self.health_interval = health_interval
+        self.ping_timeout = ping_timeout
+        self.client_options = client_options
+        self.clients:List[Client] = [Client(self.uris[i % len(self.uris)], **client_options) for i in range(size)]
+        # 처리 중인 요청 수는 Client 객체 별로 세므로, 교체된 연결의 acquire() 가 늦게 끝나도 새 연결에 영향이 없습니다.
+        self.inflight:Dict[Client, int] = {}
+        self.replaced = 0
+        self.health_task:Optional[asyncio.Task] = None
+        self.replacing:Dict[int, asyncio.Task] = {}
+
+    async def start(self):
+        """
+        모든 연결을 맺고 상태 점검을 시작합니다.
+        """
+        await asyncio.gather(*(client.connect() for client in self.clients))
+        self.health_task = asyncio.create_task(self.health_loop())
+
+    async def close(self):
+        """
+        상태 점검을 멈추고 모든 연결을 종료합니다.
+        """
+        if self.health_task is not None:
+            self.health_task.cancel()
+            self.health_task = None
+
+        for task in self.replacing.values():
+            task.cancel()
+        self.replacing.clear()
+
+        await asyncio.gather(*(client.disconnect() for client in self.clients), return_exceptions=True)
+
+    @property
+    def connected_count(self) -> int:
+        """
+        현재 연결된 Client 수
+        """
+        return sum(client.connected for client in self.clients)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        처리 중인 요청이 가장 적은 연결을 빌려줍니다.
+
+            async with pool.acquire() as client:
+                await client.send(...)
+
+        :return: Client 객체
+        """
+        candidates = [client for client in self.clients if client.connected]
+        if not candidates:
+            raise ConnectionError("No connection available in the pool")
+
+        client = min(candidates, key=lambda candidate: self.inflight.get(candidate, 0))
+        self.inflight[client] = self.inflight.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            count = self.inflight[client] - 1
+            if count:
+                self.inflight[client] = count
+            else:
+                del self.inflight[client]
+
+    async def request(self, message:Any, timeout:Optional[float]=None) -> Any:
+        """
+        가장 한가한 연결로 요청을 보내고 응답을 기다립니다.
+
+        :param message: 전송할 메시지
+        :param timeout: 타임아웃 시간 (초)
+        :return: 응답 메시지
+        """
+        async with self.acquire() as client:
+            return await client.request(message, timeout)
+
+    async def check(self, client:Client) -> bool:
+        """
+        ping 으로 연결 상태를 확인합니다.
+
+        :param client: 확인할 Client
+        :return: 정상이면 True
+        """
+        if not client.connected:
+            return False
+
+        try:
+            pong_waiter = await (await client.ping())
+            await asyncio.wait_for(pong_waiter, self.ping_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def replace(self, index:int):
+        """
+        끊어진 연결을 새 연결로 교체합니다.
+
+        :param index: 교체할 연결의 위치
+        """
+        old = self.clients[index]
+        try:
+            await old.disconnect()
+        except Exception:
+            pass
+
+        client = Client(old.uri, **self.client_options)
+        await client.connect()
+        if client.connected:
+            self.clients[index] = client
+            self.replaced += 1
+
+    async def health_loop(self):
+        """
+        주기적으로 모든 연결을 점검하고 끊어진 연결을 교체합니다.
+        교체는 연결마다 별도의 태스크로 실행하므로, 재연결 대기가 길어져도 다른 연결의 점검은 계속됩니다.
+        """
+        while True:
+            await asyncio.sleep(self.health_interval)
+            clients = list(self.clients)
+            healthy = await asyncio.gather(*(self.check(client) for client in clients))
+            for index, ok in enumerate(healthy):
+                if ok or index in self.replacing:
+                    continue
+                task = asyncio.create_task(self.replace(index))
+                self.replacing[index] = task
+                task.add_done_callback(lambda _, index=index: self.replacing.pop(index, None))
+
+
+#
+# for unittest
+#
+async def unittest():
+    """
+    유닛 테스트 함수
+    """
+    def custom_message_handler(message:str) -> bytes:
+        """
+        사용자 정의 메시지 핸들러
+
+        :param message: 수신한 메시지
+        :return: 처리된 메시지
+        """
+        import json
+        return json.dumps({"custom_processed": message.upper()}).encode(encoding="utf-8")
+
+    server = Server()
+    client = Client(uri="ws://localhost:8765")
+
+    loop_server, server_task = await server.setup()
+    loop_client, client_task = await client.setup()
+
+    await asyncio.sleep(1)
+    server.set_message_handler(custom_message_handler)
 
     await asyncio.sleep(1)
 
@@ -355,8 +1928,675 @@ async def unittest2():
     print("done.")
 
 
+def slow_message_handler(message:str) -> bytes:
+    """
+    CPU 를 오래 사용하는 메시지 핸들러 (unittest3 용)
+    "slow" 로 시작하는 메시지만 오래 걸립니다.
+
+    :param message: 수신한 메시지
+    :return: 처리된 메시지
+    """
+    if message.startswith("slow"):
+        end = time.perf_counter() + 0.2
+        while time.perf_counter() < end:
+            pass
+    return message.upper().encode(encoding="utf-8")
+
+
+async def unittest3(port:int=8767):
+    """
+    유닛 테스트 함수 3
+    느린 동기 핸들러를 이벤트 루프 / 스레드 풀 / 프로세스 풀에서 실행했을 때,
+    빠른 요청의 p99 지연 시간을 비교합니다. 코루틴 핸들러도 함께 확인합니다.
+    """
+    async def measure(executor:Optional[str]) -> float:
+        server = Server(port=port, message_handler=slow_message_handler, executor=executor, max_workers=4)
+        server_task = asyncio.create_task(server.start())
+        await asyncio.sleep(0.5)
+
+        async def slow_client():
+            client = Client(uri=f"ws://localhost:{port}")
+            await client.connect()
+            for _ in range(5):
+                await client.send("slow")
+                await client.receive(timeout=30)
+            await client.disconnect()
+
+        async def fast_client() -> List[float]:
+            client = Client(uri=f"ws://localhost:{port}")
+            await client.connect()
+            latencies = []
+            for i in range(50):
+                begin = time.perf_counter()
+                await client.send(f"fast-{i}")
+                await client.receive(timeout=30)
+                latencies.append(time.perf_counter() - begin)
+                await asyncio.sleep(0.01)
+            await client.disconnect()
+            return latencies
+
+        results = await asyncio.gather(slow_client(), slow_client(), *(fast_client() for _ in range(4)))
+        latencies = sorted(sum(results[2:], []))
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+
+        server_task.cancel()
+        await server.stop()
+        return p99
+
+    for executor in (None, "thread", "process"):
+        p99 = await measure(executor)
+        print(f"executor={str(executor):8s} fast request p99={p99 * 1000:8.2f} ms")
+
+    async def async_handler(message:str) -> str:
+        await asyncio.sleep(0.01)
+        return f"async:{message}"
+
+    server = Server(port=port, message_handler=async_handler)
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+
+    client = Client(uri=f"ws://localhost:{port}")
+    await client.connect()
+    await client.send("hello")
+    res = await client.receive(timeout=5)
+    assert res == "async:hello", res
+    await client.disconnect()
+
+    server_task.cancel()
+    await server.stop()
+    print("done.")
+
+
+async def unittest4(n_subscribers:int=20, n_messages:int=300, port:int=8768):
+    """
+    유닛 테스트 함수 4
+    한 구독자가 메시지를 읽지 않아도 나머지 구독자들은 모든 메시지를 받는지 확인합니다.
+    """
+    import base64
+    import os
+
+    # 같은 메시지를 구독자마다 다시 압축하지 않도록 압축을 끕니다.
+    server = Server(port=port, broker=Broker(queue_size=64, policy="drop_oldest"), compression=None)
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+
+    clients = [Client(uri=f"ws://localhost:{port}") for _ in range(n_subscribers + 1)]
+    await asyncio.gather(*(client.connect() for client in clients))
+    await asyncio.gather(*(client.subscribe("news") for client in clients))
+
+    while server.broker.subscriber_count("news") < len(clients):
+        await asyncio.sleep(0.05)
+
+    async def consume(client:Client) -> int:
+        count = 0
+        while count < n_messages:
+            if await client.receive(timeout=10) is None:
+                break
+            count += 1
+        return count
+
+    # 마지막 클라이언트는 메시지를 읽지 않는 느린 구독자
+    consumers = [asyncio.create_task(consume(client)) for client in clients[:-1]]
+
+    # 느린 구독자의 소켓 버퍼가 가득 찰 만큼 큰 메시지 (약 170KB)
+    payload = {"data": base64.b64encode(os.urandom(128 * 1024)).decode()}
+    publishing = 0.0
+    begin = time.perf_counter()
+    for i in range(n_messages):
+        payload["seq"] = i
+        tick = time.perf_counter()
+        server.publish("news", payload)
+        publishing += time.perf_counter() - tick
+        await asyncio.sleep(0.01)
+    counts = await asyncio.gather(*consumers)
+    elapsed = time.perf_counter() - begin
+
+    print(f"subscribers={n_subscribers} messages={n_messages} elapsed={elapsed:.3f}s "
+          f"publish={publishing / n_messages * 1000:.2f}ms/call "
+          f"delivered={server.broker.delivered} dropped={server.broker.dropped}")
+    assert all(count == n_messages for count in counts), counts
+    assert server.broker.dropped > 0, "slow subscriber did not drop any message"
+
+    # 토픽이 문자열이 아닌 제어 메시지와 "action" 키를 쓰는 일반 메시지는 핸들러로 전달되고 연결도 유지됩니다.
+    client = clients[0]
+    for message in ('{"__broker__": "subscribe", "topic": [1]}', '{"action": "subscribe", "topic": "news"}'):
+        await client.send(message)
+        response = await client.receive(timeout=5)
+        assert response is not None and b"SUBSCRIBE" in response, response
+    assert client.connected and server.broker.subscriber_count("news") == len(clients)
+
+    await asyncio.gather(*(client.disconnect() for client in clients))
+    server_task.cancel()
+    await server.stop()
+    print("done.")
+
+
+async def unittest5(n_messages:int=20000, port:int=8769):
+    """
+    유닛 테스트 함수 5
+    작은 메시지를 연달아 보낼 때 배치 모드 별 전송 시간을 비교합니다.
+    """
+    received = 0
+
+    async def count_handler(message:Union[str, bytes]) -> None:
+        nonlocal received
+        received += 1
+
+    server = Server(port=port, message_handler=count_handler, unpack=True)
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+
+    modes = [
+        ("unbatched", {}),
+        ("batched", {"batch_size": 100}),
+        ("packed", {"batch_size": 100, "batch_pack": True}),
+    ]
+    for name, options in modes:
+        received = 0
+        client = Client(uri=f"ws://localhost:{port}", **options)
+        await client.connect()
+
+        begin = time.perf_counter()
+        for i in range(n_messages):
+            await client.send(f'{{"metric": "cpu", "seq": {i}, "value": 0.5}}')
+        await client.flush()
+        while received < n_messages:
+            await asyncio.sleep(0.001)
+        elapsed = time.perf_counter() - begin
+
+        stats = client.batcher.stats if client.batcher else {}
+        print(f"{name:10s} messages={n_messages} elapsed={elapsed:.3f}s "
+              f"rate={n_messages / elapsed:10.1f} msg/s frames={stats.get('frames', n_messages)} "
+              f"flushes={stats.get('flushes', '-')}")
+        await client.disconnect()
+
+    # 잘린 묶음 프레임은 버려지고 연결은 유지됩니다.
+    received = 0
+    client = Client(uri=f"ws://localhost:{port}")
+    await client.connect()
+    await client.send(pack_messages(["a", "b"])[:-1])
+    await client.send("after")
+    while received < 1:
+        await asyncio.sleep(0.001)
+    assert client.connected and server.connection_count == 1
+    await client.disconnect()
+
+    # unpack 을 켜지 않은 서버는 BATCH_MAGIC 으로 시작하는 프레임도 그대로 핸들러에 전달합니다.
+    server_task.cancel()
+    await server.stop()
+    frames = []
+
+    async def raw_handler(message:Union[str, bytes]) -> None:
+        frames.append(message)
+
+    server = Server(port=port, message_handler=raw_handler)
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+    client = Client(uri=f"ws://localhost:{port}")
+    await client.connect()
+    packed = pack_messages(["a", "b"])
+    await client.send(packed)
+    await client.send(packed[:-1])
+    while len(frames) < 2:
+        await asyncio.sleep(0.001)
+    assert frames == [packed, packed[:-1]], frames
+    await client.disconnect()
+
+    server_task.cancel()
+    await server.stop()
+    print("done.")
+
+
+async def unittest6(n_requests:int=1000, port:int=8770):
+    """
+    유닛 테스트 함수 6
+    처리 시간이 제각각인 요청을 한 연결에서 동시에 보내고, 응답이 순서와 관계없이 제 요청에 돌아오는지 확인합니다.
+    """
+    import random
+
+    async def jitter_handler(message:str) -> str:
+        if message == "fail":
+            raise ValueError("boom")
+        if message == "malformed":
+            return RESPONSE_MAGIC
+        if message == "slow":
+            await asyncio.sleep(5)
+        await asyncio.sleep(random.uniform(0, 0.05))
+        return message.upper()
+
+    server = Server(port=port, message_handler=jitter_handler, max_inflight=n_requests)
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+
+    client = Client(uri=f"ws://localhost:{port}")
+    await client.connect()
+
+    begin = time.perf_counter()
+    for i in range(20):
+        assert await client.request(f"lockstep-{i}", timeout=5) == f"LOCKSTEP-{i}"
+    lockstep = (time.perf_counter() - begin) / 20
+
+    begin = time.perf_counter()
+    responses = await asyncio.gather(*(client.request(f"pipelined-{i}", timeout=10) for i in range(n_requests)))
+    pipelined = (time.perf_counter() - begin) / n_requests
+
+    mismatched = sum(response != f"PIPELINED-{i}" for i, response in enumerate(responses))
+    print(f"lockstep={lockstep * 1000:.2f} ms/request pipelined={pipelined * 1000:.3f} ms/request "
+          f"requests={n_requests} mismatched={mismatched}")
+    assert mismatched == 0
+
+    # 핸들러 오류는 타임아웃 없이도 오류 응답으로 돌아옵니다.
+    try:
+        await client.request("fail")
+        assert False, "RemoteError was not raised"
+    except RemoteError as e:
+        assert "boom" in str(e), e
+
+    # 수신 태스크가 잘못된 응답 봉투로 멈추면 기다리던 요청과 receive() 가 모두 깨어납니다.
+    pending = asyncio.create_task(client.request("slow"))
+    waiting = asyncio.create_task(client.receive())
+    await asyncio.sleep(0.1)
+    await client.send("malformed")
+    assert await asyncio.wait_for(pending, 2) is None
+    assert await asyncio.wait_for(waiting, 2) is None
+
+    await client.disconnect()
+    server_task.cancel()
+    await server.stop()
+    print("done.")
+
+
+async def unittest7(n_requests:int=1000, port:int=8771):
+    """
+    유닛 테스트 함수 7
+    ClientPool 로 요청을 분산하고, 서버가 연결 하나를 끊으면 점검 후 교체되는지 확인합니다.
+    """
+    async def echo_handler(message:str) -> str:
+        await asyncio.sleep(0.005)
+        return message
+
+    server = Server(port=port, message_handler=echo_handler)
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+
+    pool = ClientPool(f"ws://localhost:{port}", size=4, health_interval=0.5, ping_timeout=1.0)
+    await pool.start()
+
+    begin = time.perf_counter()
+    responses = await asyncio.gather(*(pool.request(f"job-{i}", timeout=10) for i in range(n_requests)))
+    elapsed = time.perf_counter() - begin
+    assert all(response == f"job-{i}" for i, response in enumerate(responses))
+    print(f"pool requests={n_requests} elapsed={elapsed:.3f}s sessions={[s.received for s in server.sessions.values()]}")
+
+    # 서버 쪽에서 연결 하나를 끊으면 점검 후 새 연결로 교체됩니다.
+    await next(iter(server.sessions.values())).close()
+    await asyncio.sleep(1.5)
+    print(f"connected={pool.connected_count} replaced={pool.replaced}")
+    assert pool.connected_count == 4 and pool.replaced == 1
+    assert await pool.request("after", timeout=5) == "after"
+
+    # 빌려간 연결이 교체된 뒤에 반납되어도 새 연결의 처리 중 요청 수는 어긋나지 않습니다.
+    async with pool.acquire() as held:
+        await server.disconnect()
+        await asyncio.sleep(1.5)
+        assert held not in pool.clients and pool.connected_count == 4
+    assert pool.inflight == {}, pool.inflight
+    assert await pool.request("after", timeout=5) == "after"
+
+    await pool.close()
+    server_task.cancel()
+    await server.stop()
+    print("done.")
+
+
+async def unittest8(n_clients:int=200, outage:float=1.0, port:int=8772):
+    """
+    유닛 테스트 함수 8
+    서버가 재시작될 때 재연결 모드 클라이언트들이 흩어져서 다시 붙는지(jitter 유무 비교),
+    끊긴 동안 보낸 메시지가 재연결 후 전달되는지 확인합니다.
+    """
+    received = []
+
+    async def record_handler(message:str) -> None:
+        received.append(message)
+
+    async def restart(jitter:bool) -> List[float]:
+        server = Server(port=port, message_handler=record_handler)
+        server_task = asyncio.create_task(server.start())
+        await asyncio.sleep(0.3)
+
+        clients = [Client(uri=f"ws://localhost:{port}", retry_delay=0.2, backoff_max=2.0, jitter=jitter, reconnect=True)
+                   for _ in range(n_clients)]
+        await asyncio.gather(*(client.connect() for client in clients))
+
+        # 서버를 내렸다가 outage 초 뒤에 다시 올립니다.
+        server_task.cancel()
+        await server.stop()
+        await asyncio.sleep(0.1)
+        await clients[0].send("sent during outage")
+        await asyncio.sleep(outage)
+
+        server = Server(port=port, message_handler=record_handler)
+        server_task = asyncio.create_task(server.start())
+        restarted = time.monotonic()
+
+        while any(not client.connected for client in clients):
+            await asyncio.sleep(0.05)
+
+        # 재연결 시도가 시간 축에서 얼마나 흩어졌는지 봅니다.
+        downtimes = sorted(client.last_downtime for client in clients)
+        attempts = sum(client.connect_attempts for client in clients)
+        print(f"jitter={jitter!s:5s} reconnect spread={downtimes[-1] - downtimes[0]:.3f}s "
+              f"all reconnected {time.monotonic() - restarted:.3f}s after restart, attempts={attempts}")
+        print(f"    stats={clients[0].reconnect_stats}")
+
+        await asyncio.sleep(0.2)
+        await asyncio.gather(*(client.disconnect() for client in clients))
+        server_task.cancel()
+        await server.stop()
+        return downtimes
+
+    await restart(jitter=False)
+    await restart(jitter=True)
+    assert received.count("sent during outage") == 2, received
+    print("done.")
+
+
+def benchmark_codecs(n_iterations:int=20000):
+    """
+    코덱 별 인코딩/디코딩 시간과 전송 크기를 비교합니다.
+
+    :param n_iterations: 반복 횟수
+    """
+    message = {
+        "id": 123456,
+        "symbol": "KRW-BTC",
+        "price": 51234567.5,
+        "volume": 0.00123,
+        "tags": ["spot", "realtime", "upbit"],
+        "bids": [[51234000.0 + i, 0.01 * i] for i in range(20)],
+    }
+    payload = bytes(range(256)) * 64
+
+    rows = []
+    for name in ("json", "msgpack"):
+        codec = get_codec(name)
+        frame = codec.encode(message)
+        size = len(frame.encode(encoding="utf-8")) if isinstance(frame, str) else len(frame)
+
+        begin = time.perf_counter()
+        for _ in range(n_iterations):
+            codec.encode(message)
+        encode = (time.perf_counter() - begin) / n_iterations
+
+        begin = time.perf_counter()
+        for _ in range(n_iterations):
+            codec.decode(frame)
+        decode = (time.perf_counter() - begin) / n_iterations
+
+        assert codec.decode(frame) == message
+        rows.append((name, "dict", size, encode, decode))
+
+    # raw 코덱은 bytes/memoryview 를 복사 없이 그대로 넘깁니다.
+    codec = get_codec("raw")
+    view = memoryview(payload)
+    assert codec.encode(view) is view
+    begin = time.perf_counter()
+    for _ in range(n_iterations):
+        codec.encode(view)
+    encode = (time.perf_counter() - begin) / n_iterations
+    begin = time.perf_counter()
+    for _ in range(n_iterations):
+        codec.decode(view)
+    decode = (time.perf_counter() - begin) / n_iterations
+    rows.append(("raw", "16KB", len(payload), encode, decode))
+
+    # 비교를 위해 기존 기본 핸들러 방식 (json.dumps().encode() 후 decode().loads())
+    frame = json.dumps(message).encode(encoding="utf-8")
+    begin = time.perf_counter()
+    for _ in range(n_iterations):
+        json.dumps(message).encode(encoding="utf-8")
+    encode = (time.perf_counter() - begin) / n_iterations
+    begin = time.perf_counter()
+    for _ in range(n_iterations):
+        json.loads(frame.decode(encoding="utf-8"))
+    decode = (time.perf_counter() - begin) / n_iterations
+    rows.append(("legacy", "dict", len(frame), encode, decode))
+
+    for name, kind, size, encode, decode in rows:
+        print(f"{name:8s} {kind:5s} wire={size:6d} bytes encode={encode * 1e6:8.2f} us decode={decode * 1e6:8.2f} us")
+
+
+async def unittest9(port:int=8773):
+    """
+    유닛 테스트 함수 9
+    json, msgpack 코덱으로 요청/응답과 pub/sub 이 동작하는지 확인합니다.
+    """
+    async def object_handler(message:Dict[str, Any]) -> Dict[str, Any]:
+        return {"sum": sum(message["values"]), "blob": message["blob"]}
+
+    for name in ("json", "msgpack"):
+        server = Server(port=port, message_handler=object_handler, codec=name)
+        server_task = asyncio.create_task(server.start())
+        await asyncio.sleep(0.3)
+
+        client = Client(uri=f"ws://localhost:{port}", codec=name)
+        await client.connect()
+
+        blob = "abc" if name == "json" else b"\x00\x01\x02"
+        response = await client.request({"values": [1, 2, 3], "blob": blob}, timeout=5)
+        assert response == {"sum": 6, "blob": blob}, response
+
+        await client.subscribe("ticks")
+        while server.broker.subscriber_count("ticks") < 1:
+            await asyncio.sleep(0.01)
+        server.publish("ticks", {"price": 1.5})
+        assert await client.receive(timeout=5) == {"price": 1.5}
+        print(f"{name} codec ok")
+
+        await client.disconnect()
+        server_task.cancel()
+        await server.stop()
+
+    benchmark_codecs()
+    print("done.")
+
+
+async def unittest10(port:int=8774):
+    """
+    유닛 테스트 함수 10
+    압축 설정 별로 큰 반복 JSON 과 작은 메시지를 보낼 때의 시간과 전송 크기를 비교합니다.
+    """
+    received = 0
+
+    async def count_handler(message:str) -> None:
+        nonlocal received
+        received += 1
+
+    rows = [{"id": i, "name": f"item-{i % 10}", "status": "active", "tags": ["a", "b", "c"]} for i in range(500)]
+    large = json.dumps(rows)
+    small = json.dumps({"ping": 1})
+    messages = [large] * 100 + [small] * 2000
+
+    settings = [
+        ("none", lambda: None),
+        ("min_size=0", lambda: Compression(min_size=0)),
+        ("min_size=1024", lambda: Compression(min_size=1024)),
+        ("wbits=15,level=1", lambda: Compression(window_bits=15, level=1, mem_level=8)),
+    ]
+    for name, factory in settings:
+        received = 0
+        server = Server(port=port, message_handler=count_handler, compression=factory())
+        server_task = asyncio.create_task(server.start())
+        await asyncio.sleep(0.3)
+
+        compression = factory()
+        client = Client(uri=f"ws://localhost:{port}", compression=compression)
+        await client.connect()
+
+        begin = time.perf_counter()
+        for message in messages:
+            await client.send(message)
+        while received < len(messages):
+            await asyncio.sleep(0.001)
+        elapsed = time.perf_counter() - begin
+
+        if compression is None:
+            wire = sum(len(message) for message in messages)
+            detail = ""
+        else:
+            stats = compression.stats
+            wire = stats["raw_bytes"] + stats["compressed_output_bytes"]
+            detail = f"raw_frames={stats['raw_frames']} compressed_frames={stats['compressed_frames']} ratio={stats['ratio']:.3f}"
+        print(f"{name:18s} elapsed={elapsed:.3f}s wire={wire:9d} bytes {detail}")
+
+        await client.disconnect()
+        server_task.cancel()
+        await server.stop()
+
+    print("done.")
+
+
+async def unittest11(n_messages:int=20000, port:int=8775):
+    """
+    유닛 테스트 함수 11
+    추적 기록기 설정 별 서버 처리량을 비교합니다.
+    """
+    logging.basicConfig(level=logging.INFO)
+    received = 0
+
+    async def count_handler(message:str) -> None:
+        nonlocal received
+        received += 1
+
+    tracers = [
+        ("off", None),
+        ("level-gated", Tracer(sample=1, level=logging.DEBUG)),
+        ("1-in-1000", Tracer(sample=1000, level=logging.INFO)),
+        ("1-in-1000+payload", Tracer(sample=1000, level=logging.INFO, payload=True, max_payload=40)),
+    ]
+    for name, tracer in tracers:
+        received = 0
+        server = Server(port=port, message_handler=count_handler, compression=None, trace=tracer)
+        server_task = asyncio.create_task(server.start())
+        await asyncio.sleep(0.3)
+
+        client = Client(uri=f"ws://localhost:{port}", compression=None, batch_size=100)
+        await client.connect()
+
+        begin = time.perf_counter()
+        for i in range(n_messages):
+            await client.send(f"telemetry-{i}")
+        await client.flush()
+        while received < n_messages:
+            await asyncio.sleep(0.001)
+        elapsed = time.perf_counter() - begin
+
+        traced = tracer.traced if tracer else 0
+        print(f"{name:18s} rate={n_messages / elapsed:10.1f} msg/s traced={traced}")
+
+        await client.disconnect()
+        server_task.cancel()
+        await server.stop()
+
+    print("done.")
+
+
+async def loadtest(n_clients:int=1000, n_messages:int=10, latency:float=0.02, port:int=8766):
+    """
+    부하 테스트 함수
+    n_clients 개의 클라이언트를 동시에 접속시켜 각 클라이언트가 자신의 응답만 받는지 확인하고,
+    클라이언트 수에 따른 처리량을 측정합니다.
+    핸들러는 latency 만큼 I/O 를 기다리는 코루틴이므로, 연결들이 동시에 처리되면
+    CPU 가 포화될 때까지 처리량이 클라이언트 수에 비례해 늘어납니다.
+
+    :param n_clients: 최대 동시 접속 클라이언트 수
+    :param n_messages: 클라이언트 당 전송할 메시지 수
+    :param latency: 핸들러 한 번의 I/O 대기 시간 (초)
+    :param port: 테스트 서버 포트
+    """
+    async def io_bound_handler(message:str) -> bytes:
+        await asyncio.sleep(latency)
+        return Server.default_message_handler(message)
+
+    server = Server(port=port, message_handler=io_bound_handler)
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)
+
+    async def run_client(index:int, clients:List[Client]) -> int:
+        client = clients[index]
+        await client.connect()
+        await ready.wait()
+
+        mismatched = 0
+        for i in range(n_messages):
+            message = f"client-{index}-{i}"
+            await client.send(message)
+            response = json.loads(await client.receive(timeout=30))
+            if response["processed"] != message.upper():
+                mismatched += 1
+
+        await client.disconnect()
+        return mismatched
+
+    levels = [n for n in (1, 10, 100, n_clients) if n <= n_clients]
+    results = []
+    for level in levels:
+        ready = asyncio.Event()
+        clients = [Client(uri=f"ws://localhost:{port}", max_retries=1) for _ in range(level)]
+        tasks = [asyncio.create_task(run_client(i, clients)) for i in range(level)]
+
+        # 모든 클라이언트가 접속할 때까지 대기
+        while server.connection_count < level:
+            await asyncio.sleep(0.05)
+        peak = server.connection_count
+
+        begin = time.perf_counter()
+        ready.set()
+        mismatched = sum(await asyncio.gather(*tasks))
+        elapsed = time.perf_counter() - begin
+
+        total = level * n_messages
+        results.append((level, peak, total, elapsed, mismatched))
+
+    server_task.cancel()
+    await server.stop()
+
+    for level, peak, total, elapsed, mismatched in results:
+        print(f"clients={level:5d} peak={peak:5d} messages={total:6d} elapsed={elapsed:7.3f}s "
+              f"throughput={total / elapsed:9.1f} msg/s mismatched={mismatched}")
+
+    assert all(r[4] == 0 for r in results), "responses were routed to the wrong client"
+    assert results[-1][1] == n_clients, "not every client was connected at the same time"
+
+    # 순차 처리였다면 클라이언트 수와 관계없이 처리량은 1 / latency 근처에 머뭅니다.
+    throughputs = [total / elapsed for _, _, total, elapsed, _ in results]
+    assert throughputs[-1] > throughputs[0] * 10, "throughput did not grow with the number of clients"
+    print("done.")
+
+
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == 'unittest2':
         asyncio.run(unittest2())
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest3':
+        asyncio.run(unittest3())
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest4':
+        asyncio.run(unittest4())
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest5':
+        asyncio.run(unittest5())
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest6':
+        asyncio.run(unittest6())
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest7':
+        asyncio.run(unittest7())
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest8':
+        asyncio.run(unittest8())
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest9':
+        asyncio.run(unittest9())
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest10':
+        asyncio.run(unittest10())
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest11':
+        asyncio.run(unittest11())
+    elif len(sys.argv) > 1 and sys.argv[1] == 'loadtest':
+        asyncio.run(loadtest())
     else:
         asyncio.run(unittest())
\ No newline at end of file
@@ -14,6 +14,9 @@ tools
 """
 
 import os
+import re
+import mmap
+import codecs
 import uuid
 import hashlib
 import random
@@ -21,21 +24,155 @@ import shutil
 import zipfile
 import pickle
 import subprocess
+import threading
+import dataclasses
+import types
 import json
 import time
+import struct
+import tempfile
+import zlib
 
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from dotenv import dotenv_values
 from datetime import datetime, timedelta
-from pytz import timezone, BaseTzInfo
-from typing import List, Any, Tuple, Dict, Generator, Union
+from typing import List, Any, Tuple, Dict, Generator, Iterator, Optional, Type, Union, TYPE_CHECKING
 
-from pydantic import create_model, BaseModel
+# pydantic, dotenv, pytz 는 사용하는 함수에서 import; s2num 등만 쓰는 스크립트의 시작 시간을 줄이기 위함
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+    from pytz import BaseTzInfo
 
 
-def create_model_from_data(name: str, data: Dict[str, Any]) -> BaseModel:
+class ModelCache:
+    """
+    데이터 구조 (필드 이름과 타입) 를 키로 하는 Pydantic 모델 클래스 LRU 캐시입니다.
+    같은 구조의 데이터는 모델 클래스를 다시 만들지 않고 재사용합니다.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        """
+        Parameters:
+            maxsize (int, optional): 보관할 모델 클래스의 최대 수. 기본값은 256입니다.
+        """
+        self.maxsize = maxsize
+        self.classes: "OrderedDict[Any, Type[BaseModel]]" = OrderedDict()
+        # 구조 키 -> TypeAdapter(List[모델]); 모델 클래스와 함께 제거됨
+        self.adapters: Dict[Any, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def schema(value: Any) -> Any:
+        """
+        값의 구조를 해시 가능한 키로 변환합니다.
+        dict 는 (키, 구조) 튜플, list 는 원소 구조가 모두 같으면 그 구조, 다르면 Any 로 표현합니다.
+
+        Parameters:
+            value (Any): 구조를 구할 값
+
+        Returns:
+            Any: 구조 키
+        """
+        kind = type(value)
+        if kind is dict:
+            schema = ModelCache.schema
+            return (dict, tuple([(key, schema(item)) for key, item in value.items()]))
+        if kind is list:
+            if not value:
+                return (list, None)
+            # 스칼라 원소의 list 는 타입 비교만 수행
+            first = type(value[0])
+            if first is not dict and first is not list:
+                return (list, first if all(type(item) is first for item in value) else Any)
+            schemas = {ModelCache.schema(item) for item in value}
+            return (list, schemas.pop() if len(schemas) == 1 else Any)
+        return kind
+
+    def get(self, name: str, schema: Any) -> Type["BaseModel"]:
+        """
+        구조에 맞는 모델 클래스를 반환합니다. 캐시에 없으면 생성합니다.
+        클래스 이름은 그 구조를 처음 만들 때의 name 을 사용합니다.
+
+        Parameters:
+            name (str): 모델의 이름
+            schema (Any): ModelCache.schema() 로 구한 dict 의 구조 키
+
+        Returns:
+            Type[BaseModel]: 모델 클래스
+        """
+        model = self.classes.get(schema)
+        if model is not None:
+            self.hits += 1
+            self.classes.move_to_end(schema)
+            return model
+
+        self.misses += 1
+        from pydantic import create_model
+
+        fields = {key: (self.annotation(f"{name}_{key}", item), ...) for key, item in schema[1]}
+        model = create_model(name, **fields)
+        self.classes[schema] = model
+        if len(self.classes) > self.maxsize:
+            evicted, _ = self.classes.popitem(last=False)
+            self.adapters.pop(evicted, None)
+        return model
+
+    def list_adapter(self, name: str, schema: Any) -> Any:
+        """
+        구조에 맞는 모델의 list 를 한 번에 검증하는 TypeAdapter(List[모델]) 를 반환합니다.
+        어댑터는 모델 클래스와 같은 항목으로 보관되어, 모델이 캐시에서 제거되면 함께 제거됩니다.
+
+        Parameters:
+            name (str): 모델의 이름
+            schema (Any): ModelCache.schema() 로 구한 dict 의 구조 키
+
+        Returns:
+            TypeAdapter: List[모델] 어댑터
+        """
+        model = self.get(name, schema)
+        adapter = self.adapters.get(schema)
+        if adapter is None:
+            from pydantic import TypeAdapter
+
+            adapter = self.adapters[schema] = TypeAdapter(List[model])
+        return adapter
+
+    def annotation(self, name: str, schema: Any) -> Any:
+        # dict 는 중첩 모델, list 는 원소 타입의 List, 빈 list 는 List[Any]
+        if isinstance(schema, tuple) and schema[0] is dict:
+            return self.get(name, schema)
+        if isinstance(schema, tuple) and schema[0] is list:
+            if schema[1] is None or schema[1] is Any:
+                return List[Any]
+            return List[self.annotation(name, schema[1])]
+        return schema
+
+    def info(self) -> Dict[str, int]:
+        """
+        캐시 통계를 반환합니다.
+
+        Returns:
+            Dict[str, int]: hits, misses, size, maxsize
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.classes), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        self.classes.clear()
+        self.adapters.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+model_cache = ModelCache()
+
+
+def create_model_from_data(name: str, data: Dict[str, Any]) -> "BaseModel":
     """
     주어진 데이터로부터 Pydantic 모델을 생성합니다.
+    중첩된 dict 는 중첩 모델로, dict 의 list 는 중첩 모델의 List 로 만듭니다.
+    모델 클래스는 데이터 구조를 키로 model_cache 에 저장되어, 같은 구조의 데이터는 검증만 수행합니다.
 
     Parameters:
         name (str): 모델의 이름
@@ -44,11 +181,11 @@ def create_model_from_data(name: str, data: Dict[str, Any]) -> BaseModel:
     Returns:
         BaseModel: 생성된 Pydantic 모델 인스턴스
     """
-    NewModel = create_model(name, **{key: (type(value), ...) for key, value in data.items()})
+    NewModel = model_cache.get(name, ModelCache.schema(data))
     return NewModel(**data)
 
 
-def create_model_from_json(name:str, jsontext:str) -> BaseModel:
+def create_model_from_json(name:str, jsontext:str) -> "BaseModel":
     """
     주어진 json으로부터 Pydantic 모델을 생성합니다.
 
@@ -62,7 +199,7 @@ def create_model_from_json(name:str, jsontext:str) -> BaseModel:
     return create_model_from_data(name=name, data=json.loads(jsontext))
 
 
-def load_json(filepath: Path) -> BaseModel:
+def load_json(filepath: Path) -> "BaseModel":
     """
     JSON 파일을 로드하여 Pydantic 모델로 변환합니다.
 
@@ -76,20 +213,287 @@ def load_json(filepath: Path) -> BaseModel:
         return create_model_from_data(filepath.stem, json.load(fp))
 
 
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def _read_chunks(filepath: Path, chunk_size: int, use_mmap: bool) -> Iterator[str]:
+    # 파일을 chunk_size 단위의 문자열로 읽음; mmap 은 UTF-8 경계가 잘리지 않도록 증분 디코더 사용
+    if not use_mmap:
+        with open(filepath, "r", encoding="utf-8") as fp:
+            while True:
+                chunk = fp.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    with open(filepath, "rb") as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            for offset in range(0, len(mm), chunk_size):
+                yield decoder.decode(mm[offset:offset + chunk_size])
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+
+
+def _iter_json_array(chunks: Iterator[str]) -> Iterator[Any]:
+    # "[ 값, 값, ... ]" 을 값 하나씩 파싱; 버퍼는 다 쓴 부분만 버리고 다음 청크를 이어 붙임
+    buffer = next(chunks, "")
+    eof = False
+    pos = _WHITESPACE.match(buffer, 0).end()
+    if buffer[pos:pos + 1] != "[":
+        raise ValueError("JSON array is expected")
+    pos += 1
+    expect_value = True
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos >= len(buffer):
+            if eof:
+                raise ValueError("Unterminated JSON array")
+            chunk = next(chunks, None)
+            eof = chunk is None
+            buffer = buffer[pos:] + (chunk or "")
+            pos = 0
+            continue
+
+        char = buffer[pos]
+        if char == "]":
+            # 배열 뒤에는 공백만 올 수 있음; JSON lines 를 배열로 잘못 읽고 조용히 끝나지 않도록 확인
+            rest = buffer[pos + 1:]
+            while True:
+                if rest.strip(" \t\n\r"):
+                    raise ValueError("Extra data after JSON array; use one JSON value per line for JSON lines")
+                rest = next(chunks, None)
+                if rest is None:
+                    return
+        if not expect_value:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+            pos += 1
+            expect_value = True
+            continue
+
+        try:
+            value, end = _decoder.raw_decode(buffer, pos)
+            # 숫자 등은 버퍼 끝에서 잘렸을 수 있으므로 끝까지 읽은 경우 다음 청크를 확인
+            complete = end < len(buffer) or eof
+        except ValueError:
+            if eof:
+                raise
+            complete = False
+
+        if not complete:
+            chunk = next(chunks, None)
+            eof = chunk is None
+            buffer = buffer[pos:] + (chunk or "")
+            pos = 0
+            continue
+
+        yield value
+        pos = end
+        expect_value = False
+
+
+def _iter_json_lines(filepath: Path, use_mmap: bool) -> Iterator[Any]:
+    if not use_mmap:
+        with open(filepath, "r", encoding="utf-8") as fp:
+            for line in fp:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    with open(filepath, "rb") as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _is_json_lines(filepath: Path, limit: int) -> bool:
+    # 첫 번째 값이 '[' 로 시작해도, 첫 줄이 완전한 JSON 이고 뒤에 다른 값이 있으면 JSON lines
+    with open(filepath, "r", encoding="utf-8") as fp:
+        line = fp.readline(limit)
+        while line and not line.strip():
+            line = fp.readline(limit)
+        if not line.lstrip().startswith("["):
+            return True
+        if not line.endswith("\n"):
+            return False
+        try:
+            json.loads(line)
+        except ValueError:
+            return False
+        return bool(fp.read(limit).strip())
+
+
+def iter_json(filepath: Union[str, Path], name: Optional[str] = None, as_model: bool = True,
+              use_mmap: bool = False, chunk_size: int = 1024 * 1024) -> Iterator[Any]:
+    """
+    JSON 배열 파일 또는 JSON lines 파일에서 레코드를 하나씩 읽습니다.
+    파일 전체를 메모리에 올리지 않으므로, 메모리 사용량은 파일 크기와 무관하게 chunk_size 와 레코드 하나 정도입니다.
+    첫 번째 공백이 아닌 문자가 '[' 이면 JSON 배열, 아니면 JSON lines 로 처리합니다.
+    단, 첫 줄이 그 자체로 완전한 배열이고 뒤에 다른 값이 이어지면 배열 레코드의 JSON lines 로 처리합니다.
+    배열 뒤에 공백이 아닌 내용이 있으면 ValueError 가 발생합니다.
+
+    Parameters:
+        filepath (Union[str, Path]): JSON / JSONL 파일의 경로
+        name (Optional[str], optional): 모델의 이름. 기본값은 파일 이름입니다.
+        as_model (bool, optional): True 이면 dict 레코드를 Pydantic 모델로 변환. 기본값은 True입니다.
+        use_mmap (bool, optional): True 이면 memory map 으로 읽음. 기본값은 False입니다.
+        chunk_size (int, optional): JSON 배열을 읽을 때의 청크 크기. 기본값은 1MB입니다.
+
+    Yields:
+        Iterator[Any]: 레코드 (모델 또는 파싱된 값)
+    """
+    filepath = Path(filepath)
+    name = name or filepath.stem
+
+    if _is_json_lines(filepath, chunk_size):
+        records = _iter_json_lines(filepath, use_mmap)
+    else:
+        records = _iter_json_array(_read_chunks(filepath, chunk_size, use_mmap))
+
+    for record in records:
+        if as_model and isinstance(record, dict):
+            yield create_model_from_data(name, record)
+        else:
+            yield record
+
+
+def iter_json_batches(filepath: Union[str, Path], batch_size: int = 1000, name: Optional[str] = None,
+                      as_model: bool = True, use_mmap: bool = False,
+                      chunk_size: int = 1024 * 1024) -> Iterator[List[Any]]:
+    """
+    iter_json 과 같이 읽되, batch_size 개씩 묶어서 반환합니다.
+    as_model=True 이면 같은 구조의 레코드끼리 묶어 한 번에 검증합니다 (TypeAdapter(List[Model])).
+
+    Parameters:
+        filepath (Union[str, Path]): JSON / JSONL 파일의 경로
+        batch_size (int, optional): 한 번에 반환할 레코드 수. 기본값은 1000입니다.
+        name (Optional[str], optional): 모델의 이름. 기본값은 파일 이름입니다.
+        as_model (bool, optional): True 이면 dict 레코드를 Pydantic 모델로 변환. 기본값은 True입니다.
+        use_mmap (bool, optional): True 이면 memory map 으로 읽음. 기본값은 False입니다.
+        chunk_size (int, optional): JSON 배열을 읽을 때의 청크 크기. 기본값은 1MB입니다.
+
+    Yields:
+        Iterator[List[Any]]: 레코드 목록 (마지막 묶음은 batch_size 보다 작을 수 있음)
+    """
+    name = name or Path(filepath).stem
+    batch = []
+    for record in iter_json(filepath, name=name, as_model=False, use_mmap=use_mmap, chunk_size=chunk_size):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield _validate_batch(name, batch) if as_model else batch
+            batch = []
+    if batch:
+        yield _validate_batch(name, batch) if as_model else batch
+
+
+def _validate_batch(name: str, batch: List[Any]) -> List[Any]:
+    # 연속된 같은 구조의 dict 레코드를 묶어 한 번에 검증하고, 나머지는 그대로 둠
+    results = []
+    start = 0
+    while start < len(batch):
+        record = batch[start]
+        if not isinstance(record, dict):
+            results.append(record)
+            start += 1
+            continue
+
+        schema = ModelCache.schema(record)
+        end = start + 1
+        while end < len(batch) and isinstance(batch[end], dict) and ModelCache.schema(batch[end]) == schema:
+            end += 1
+
+        results.extend(model_cache.list_adapter(name, schema).validate_python(batch[start:end]))
+        start = end
+    return results
+
+
+# .env 파일 경로 -> (mtime_ns, 크기, 값)
+_envfile_cache: Dict[str, Tuple[int, int, Dict[str, str]]] = {}
+
+# 이름에 이 단어가 들어간 값은 출력하지 않음
+SECRET_WORDS = ("secret", "password", "passwd", "token", "key", "credential", "private")
+
+
+def is_secret(name: str) -> bool:
+    """
+    이름으로 보아 비밀 값인지 확인합니다.
+
+    Parameters:
+        name (str): 환경 변수 또는 설정 키 이름
+
+    Returns:
+        bool: 비밀 값으로 보이면 True
+    """
+    lowered = name.lower()
+    return any(word in lowered for word in SECRET_WORDS)
+
+
+def mask_value(name: str, value: Any) -> Any:
+    """
+    비밀 값이면 "***" 로 가려서 반환합니다.
+
+    Parameters:
+        name (str): 환경 변수 또는 설정 키 이름
+        value (Any): 값
+
+    Returns:
+        Any: 비밀 값이면 "***", 아니면 value
+    """
+    return "***" if is_secret(name) and value not in (None, "") else value
+
+
+def read_envfile(envfile: Union[str, Path]) -> Dict[str, str]:
+    """
+    .env 파일을 읽어 dict 로 반환합니다. 파일의 mtime 과 크기가 그대로이면 다시 파싱하지 않습니다.
+    파일이 없으면 빈 dict 를 반환합니다.
+
+    Parameters:
+        envfile (Union[str, Path]): .env 파일의 경로
+
+    Returns:
+        Dict[str, str]: 변수 이름 -> 값
+    """
+    envfile = os.fspath(envfile)
+    try:
+        st = os.stat(envfile)
+    except FileNotFoundError:
+        return {}
+
+    cached = _envfile_cache.get(envfile)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+
+    from dotenv import dotenv_values
+
+    envvars = {k: v for k, v in dotenv_values(envfile).items() if v is not None}
+    _envfile_cache[envfile] = (st.st_mtime_ns, st.st_size, envvars)
+    return envvars
+
+
 def add_environments(envfile: str):
     """
     .env 파일의 환경 변수를 시스템 환경 변수로 추가합니다.
+    이미 있는 환경 변수는 덮어쓰지 않으며, 비밀 값으로 보이는 변수는 값을 출력하지 않습니다.
 
     Parameters:
         envfile (str): .env 파일의 경로
     """
-    envvars = dotenv_values(envfile)
+    envvars = read_envfile(envfile)
     for k, v in envvars.items():
         if k in os.environ.keys():
             continue
         else:
             os.environ[k] = v
-            print(f"env init> {k}={v}")
+            print(f"env init> {k}={mask_value(k, v)}")
 
 
 def get_git_branch() -> str:
@@ -174,28 +578,255 @@ def remove_oldest_files(dirpath: str, prefix: str, type: str, remaining_count: i
         os.remove(oldest_file)
 
 
-def extract_zip(zippath: str, targetpath: str, purge_when_exists: bool=True):
+def _zip_member_path(root: Path, filename: str) -> Optional[Path]:
+    # zipfile.extract 와 같이 절대 경로, 드라이브, "..", "." 를 제거하여 root 밖으로 나가지 않도록 함
+    parts = [part for part in filename.replace("\\", "/").split("/") if part not in ("", ".", "..")]
+    if parts:
+        parts[0] = os.path.splitdrive(parts[0])[1] or parts[0]
+    parts = [part for part in parts if part not in ("", ".", "..")]
+    return root.joinpath(*parts) if parts else None
+
+
+def _file_crc(path: Path) -> int:
+    crc = 0
+    with open(path, "rb") as fp:
+        while True:
+            chunk = fp.read(1024 * 1024)
+            if not chunk:
+                return crc
+            crc = zlib.crc32(chunk, crc)
+
+
+def _extract_members(zippath: str, infos: List[zipfile.ZipInfo], output: Path, existing: Optional[Path],
+                     in_place: bool) -> Tuple[int, int]:
+    # 작업 스레드 하나가 맡은 항목들을 해제; 스레드마다 zip 파일을 따로 열어 읽기가 서로 막히지 않도록 함
+    extracted = skipped = 0
+    with zipfile.ZipFile(zippath, "r") as zf:
+        for info in infos:
+            path = _zip_member_path(output, info.filename)
+            if path is None:
+                continue
+            if info.is_dir():
+                path.mkdir(parents=True, exist_ok=True)
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # 크기와 CRC 가 같은 파일은 해제하지 않음 (staging 이면 기존 파일을 링크 또는 복사)
+            if existing is not None:
+                current = _zip_member_path(existing, info.filename)
+                try:
+                    same = current.is_file() and current.stat().st_size == info.file_size and _file_crc(current) == info.CRC
+                except OSError:
+                    same = False
+                if same:
+                    if not in_place:
+                        try:
+                            os.link(current, path)
+                        except OSError:
+                            shutil.copy2(current, path)
+                    skipped += 1
+                    continue
+
+            destination = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp") if in_place else path
+            try:
+                with zf.open(info) as src, open(destination, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                if in_place:
+                    os.replace(destination, path)
+            except BaseException:
+                if in_place and destination.exists():
+                    os.remove(destination)
+                raise
+            extracted += 1
+    return extracted, skipped
+
+
+def _balance(items: List[Any], sizes: List[int], n_groups: int) -> List[List[Any]]:
+    # 큰 항목부터 가장 가벼운 묶음에 넣어 작업량을 고르게 나눔
+    groups = [[] for _ in range(n_groups)]
+    loads = [0] * n_groups
+    for size, item in sorted(zip(sizes, items), key=lambda pair: -pair[0]):
+        index = loads.index(min(loads))
+        groups[index].append(item)
+        loads[index] += size + 4096
+    return [group for group in groups if group]
+
+
+def extract_zip(zippath: str, targetpath: str, purge_when_exists: bool=True, workers: Optional[int]=None,
+                incremental: bool=True) -> Dict[str, int]:
     """
     주어진 zip 파일을 특정 경로에 해제하는 함수입니다.
+    여러 스레드에서 항목들을 나누어 해제하며 (zlib 해제와 파일 I/O 는 GIL 을 놓음),
+    incremental=True 이면 이미 있는 파일 중 크기와 CRC 가 같은 항목은 다시 해제하지 않습니다.
+
+    purge_when_exists=True 이면 targetpath 옆의 staging 폴더에 모두 해제한 후 targetpath 와 교체하므로,
+    중간에 실패해도 기존 폴더는 그대로 남습니다. (폴더 교체는 이름 변경 두 번으로, 그 사이의 짧은 순간에는 폴더가 없습니다.)
+    purge_when_exists=False 이면 기존 폴더에 덮어쓰며, 파일마다 임시 파일에 기록한 후 이름을 바꿉니다.
 
     Parameters:
         zippath (str): 해제할 zip 파일의 경로
         targetpath (str): 해제된 파일들을 저장할 경로
-        purge_when_exists (bool, optional): targetpath가 이미 존재할 경우 삭제 여부. 기본값은 True입니다.
+        purge_when_exists (bool, optional): targetpath가 이미 존재할 경우 zip 에 없는 파일을 지울지 여부. 기본값은 True입니다.
+        workers (Optional[int], optional): 해제 스레드 수. 기본값은 min(8, CPU 수 + 4) 입니다.
+        incremental (bool, optional): 크기와 CRC 가 같은 기존 파일은 해제하지 않음. 기본값은 True입니다.
 
     Returns:
-        None
+        Dict[str, int]: extracted (해제한 파일 수), skipped (그대로 둔 파일 수)
     """
-    if purge_when_exists and Path(targetpath).exists():
-        # 이미 폴더가 있으면 제거
-        print(f"removing : {targetpath}")
-        shutil.rmtree(targetpath)
+    from concurrent.futures import ThreadPoolExecutor
+
+    target = Path(targetpath)
+    with zipfile.ZipFile(zippath, "r") as zf:
+        # 같은 이름이 여러 번 있으면 extractall 과 같이 마지막 항목을 사용
+        infos = list({info.filename: info for info in zf.infolist()}.values())
+
+    workers = workers or min(8, (os.cpu_count() or 1) + 4)
+    groups = _balance(infos, [info.file_size for info in infos], workers)
+
+    def run(output: Path, existing: Optional[Path], in_place: bool) -> Tuple[int, int]:
+        with ThreadPoolExecutor(max_workers=max(1, len(groups))) as executor:
+            futures = [executor.submit(_extract_members, zippath, group, output, existing, in_place) for group in groups]
+            counts = [future.result() for future in futures]
+        return sum(count[0] for count in counts), sum(count[1] for count in counts)
+
+    if purge_when_exists:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = target.with_name(f".{target.name}.staging-{uuid.uuid4().hex}")
+        staging.mkdir()
+        try:
+            extracted, skipped = run(staging, target if incremental and target.is_dir() else None, False)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if target.exists():
+            # 이미 폴더가 있으면 교체 후 제거
+            print(f"removing : {targetpath}")
+            old = target.with_name(f".{target.name}.old-{uuid.uuid4().hex}")
+            os.replace(target, old)
+            try:
+                os.replace(staging, target)
+            except BaseException:
+                # 두 번째 이름 변경이 실패하면 기존 폴더를 되돌림
+                os.replace(old, target)
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            os.replace(staging, target)
+    else:
+        target.mkdir(parents=True, exist_ok=True)
+        extracted, skipped = run(target, target if incremental else None, True)
 
-    # zippath 파일을 targetpath 디렉토리에 해제
-    with zipfile.ZipFile(zippath, 'r') as zip_ref:
-        zip_ref.extractall(targetpath)
+    print(f"extracted : {zippath} to {targetpath} ({extracted} extracted, {skipped} unchanged)")
+    return {"extracted": extracted, "skipped": skipped}
 
-        print(f"extracted : {zippath} to {targetpath}")
+
+# zip 형식 (PKWARE APPNOTE) 의 헤더; create_zip 에서 zip64 가 필요 없는 경우 직접 기록
+_ZIP_LOCAL = struct.Struct("<IHHHHHIIIHH")
+_ZIP_CENTRAL = struct.Struct("<IHHHHHHIIIHHHHHII")
+_ZIP_END = struct.Struct("<IHHHHIIH")
+_ZIP_LIMIT = 0xFFFFFFFF
+_ZIP_BLOCK = 1024 * 1024
+
+
+def _compress_member(path: str, level: int) -> Tuple[int, int, Any]:
+    # 작업 스레드에서 파일 하나를 1MB 씩 읽어 raw deflate 로 압축하여 (CRC, 원본 크기, 압축 데이터 파일) 반환
+    # 압축 데이터는 작으면 메모리에, 블록 4개를 넘으면 임시 파일에 보관되므로 파일 크기와 관계없이 메모리 사용량이 일정함
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    spool = tempfile.SpooledTemporaryFile(max_size=4 * _ZIP_BLOCK)
+    crc = size = 0
+    try:
+        with open(path, "rb") as fp:
+            while True:
+                block = fp.read(_ZIP_BLOCK)
+                if not block:
+                    break
+                crc = zlib.crc32(block, crc)
+                size += len(block)
+                spool.write(compressor.compress(block))
+        spool.write(compressor.flush())
+    except BaseException:
+        spool.close()
+        raise
+    return crc, size, spool
+
+
+def _dos_datetime(timestamp: float) -> Tuple[int, int]:
+    t = time.localtime(timestamp)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    return ((t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+            ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday)
+
+
+def create_zip(sourcepath: str, zippath: str, level: int = 6, workers: Optional[int] = None) -> int:
+    """
+    폴더를 zip 파일로 압축합니다. 파일들은 여러 스레드에서 동시에 압축하고, 기록은 경로 순서대로 수행합니다.
+    파일은 1MB 씩 읽어 압축하고, 압축 결과가 크면 임시 파일에 보관하므로 큰 파일도 메모리에 한 번에 올리지 않습니다.
+    임시 파일에 기록한 후 이름을 바꾸므로 중간에 실패해도 기존 zip 파일은 그대로입니다.
+    zip64 가 필요한 경우 (4GB 이상인 파일 / 압축 파일, 65535 개 이상의 항목) 는 zipfile 로 순차 압축합니다.
+
+    Parameters:
+        sourcepath (str): 압축할 폴더의 경로
+        zippath (str): 만들 zip 파일의 경로
+        level (int, optional): deflate 압축 레벨 (0~9). 기본값은 6입니다.
+        workers (Optional[int], optional): 압축 스레드 수. 기본값은 min(8, CPU 수 + 4) 입니다.
+
+    Returns:
+        int: 압축한 파일 수
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    source = Path(sourcepath)
+    paths = sorted(path for path in source.rglob("*") if path.is_file())
+    stats = [path.stat() for path in paths]
+    names = [path.relative_to(source).as_posix() for path in paths]
+
+    with atomic_open(zippath) as fp:
+        if len(paths) >= 0xFFFF or sum(st.st_size for st in stats) >= _ZIP_LIMIT // 2:
+            with zipfile.ZipFile(fp, "w", zipfile.ZIP_DEFLATED, compresslevel=level) as zf:
+                for path, name in zip(paths, names):
+                    zf.write(path, name)
+            return len(paths)
+
+        workers = workers or min(8, (os.cpu_count() or 1) + 4)
+        central = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # 기다리는 압축 결과 (메모리 또는 임시 파일) 를 제한하기 위해 workers * 2 개까지만 미리 제출
+            pending = []
+            index = 0
+            while index < len(paths) or pending:
+                while index < len(paths) and len(pending) < workers * 2:
+                    pending.append(executor.submit(_compress_member, str(paths[index]), level))
+                    index += 1
+                position = len(central)
+                crc, size, spool = pending.pop(0).result()
+                with spool:
+                    compressed = spool.tell()
+                    name = names[position].encode("utf-8")
+                    flags = 0x800 if not names[position].isascii() else 0
+                    dostime, dosdate = _dos_datetime(stats[position].st_mtime)
+
+                    offset = fp.tell()
+                    fp.write(_ZIP_LOCAL.pack(0x04034B50, 20, flags, zipfile.ZIP_DEFLATED, dostime, dosdate,
+                                             crc, compressed, size, len(name), 0))
+                    fp.write(name)
+                    spool.seek(0)
+                    shutil.copyfileobj(spool, fp, _ZIP_BLOCK)
+                if fp.tell() >= _ZIP_LIMIT:
+                    raise ValueError("zip archive exceeds 4GB without zip64")
+
+                mode = (stats[position].st_mode & 0xFFFF) << 16
+                central.append(_ZIP_CENTRAL.pack(0x02014B50, (3 << 8) | 20, 20, flags, zipfile.ZIP_DEFLATED,
+                                                 dostime, dosdate, crc, compressed, size, len(name), 0, 0, 0, 0,
+                                                 mode, offset) + name)
+
+        directory_offset = fp.tell()
+        directory = b"".join(central)
+        fp.write(directory)
+        fp.write(_ZIP_END.pack(0x06054B50, 0, 0, len(central), len(central), len(directory), directory_offset, 0))
+    return len(paths)
 
 
 def join_path(directory: str, filename: str) -> str:
@@ -227,6 +858,112 @@ def list_files(directory: str, extension: str) -> List[str]:
     return [file.as_posix() for file in files]
 
 
+class BulkLoadResult:
+    """
+    load_json_files 의 결과입니다.
+    paths 와 records 는 같은 순서 (파일 경로 정렬 순) 이며, 실패한 파일의 record 는 None 이고 errors 에 사유가 기록됩니다.
+    """
+
+    def __init__(self) -> None:
+        self.paths: List[str] = []
+        self.records: List[Any] = []
+        self.errors: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        """
+        성공한 파일의 (경로, 레코드) 를 순서대로 반환합니다.
+        """
+        for path, record in zip(self.paths, self.records):
+            if path not in self.errors:
+                yield path, record
+
+
+def _load_json_chunk(paths: List[str]) -> List[Tuple[str, Any, Optional[str]]]:
+    # 프로세스 풀 작업 단위; 파일 하나의 실패가 묶음 전체를 실패시키지 않도록 파일 별로 예외 처리
+    results = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as fp:
+                results.append((path, json.load(fp), None))
+        except Exception as e:
+            results.append((path, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _validate_chunk(results: List[Tuple[str, Any, Optional[str]]]) -> List[Tuple[str, Any, Optional[str]]]:
+    # 같은 구조의 dict 끼리 묶어 TypeAdapter(List[모델]) 로 한 번에 검증; 묶음 검증이 실패하면 파일 별로 다시 검증하여 오류를 찾음
+    groups: Dict[Any, List[int]] = {}
+    for index, (path, data, error) in enumerate(results):
+        if error is None and type(data) is dict:
+            groups.setdefault(ModelCache.schema(data), []).append(index)
+
+    validated = list(results)
+    for schema, indices in groups.items():
+        adapter = model_cache.list_adapter(Path(results[indices[0]][0]).stem, schema)
+        try:
+            models = adapter.validate_python([results[index][1] for index in indices])
+        except Exception:
+            continue
+        for index, model in zip(indices, models):
+            validated[index] = (results[index][0], model, None)
+
+    for index, (path, data, error) in enumerate(validated):
+        if error is None and validated[index] is results[index]:
+            try:
+                validated[index] = (path, create_model_from_data(Path(path).stem, data), None)
+            except Exception as e:
+                validated[index] = (path, None, f"{type(e).__name__}: {e}")
+    return validated
+
+
+def load_json_files(directory: str, extension: str = "json", as_model: bool = True,
+                    workers: int = 1, chunk_size: int = 256) -> BulkLoadResult:
+    """
+    디렉토리 아래의 JSON 파일들을 chunk_size 개씩 읽습니다.
+    모델 변환은 묶음 안에서 같은 구조의 레코드끼리 TypeAdapter(List[모델]) 로 한 번에 검증하므로,
+    파일마다 모델을 만드는 list_files + load_json 보다 빠릅니다.
+    workers 가 2 이상이면 파일 열기 / 파싱을 프로세스 풀에서 수행합니다. 검증은 현재 프로세스에서 수행하므로
+    (동적 모델 클래스는 pickle 할 수 없기 때문) 파싱 비중이 크고 CPU 가 여러 개일 때만 이득이 있습니다.
+
+    Parameters:
+        directory (str): 디렉토리 경로 (하위 디렉토리 포함)
+        extension (str, optional): 파일 확장자. 기본값은 json입니다.
+        as_model (bool, optional): True 이면 Pydantic 모델, False 이면 파싱된 dict 를 반환. 기본값은 True입니다.
+        workers (int, optional): 작업 프로세스 수. 기본값은 1 (현재 프로세스에서 읽음) 입니다.
+        chunk_size (int, optional): 한 번에 읽고 검증할 파일 수. 기본값은 256입니다.
+
+    Returns:
+        BulkLoadResult: 경로 정렬 순의 결과와 파일 별 오류
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    paths = sorted(list_files(directory, extension))
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+    loaded = BulkLoadResult()
+
+    def collect(parsed: Iterator[List[Tuple[str, Any, Optional[str]]]]) -> None:
+        for results in parsed:
+            if as_model:
+                results = _validate_chunk(results)
+            for path, data, error in results:
+                loaded.paths.append(path)
+                loaded.records.append(data)
+                if error is not None:
+                    loaded.errors[path] = error
+
+    if workers <= 1 or len(chunks) <= 1:
+        collect(map(_load_json_chunk, chunks))
+    else:
+        # 작업 프로세스가 다음 묶음을 파싱하는 동안 현재 프로세스는 받은 묶음을 검증
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            collect(executor.map(_load_json_chunk, chunks))
+    return loaded
+
+
 def export_to_pickle(filepath: str, data: Any) -> None:
     """
     데이터를 pickle 파일로 내보냅니다.
@@ -253,6 +990,622 @@ def import_from_pickle(filepath: str) -> Any:
         return pickle.load(fp)
 
 
+# dump_cache / load_cache 파일 형식
+#   헤더 | pickle 본문 | 버퍼 0 | 버퍼 1 | ... | 버퍼 표
+#   헤더: 매직, 형식 버전, 압축 레벨, 데이터 버전, 버퍼 수, pickle 크기 (저장 / 원본), 버퍼 표 위치, CRC32
+#   버퍼 표: 버퍼 별 (위치, 저장 크기, 원본 크기)
+#   버퍼는 64 바이트 경계에 정렬하여, memory map 으로 읽을 때 정렬된 메모리를 그대로 사용
+#   CRC32 는 pickle 본문, 버퍼들, 버퍼 표의 저장된 바이트를 순서대로 계산
+CACHE_MAGIC = b"FWCACHE\x00"
+CACHE_FORMAT = 1
+_CACHE_HEADER = struct.Struct("<8sHHqIQQQI")
+_CACHE_BUFFER = struct.Struct("<QQQ")
+_CACHE_ALIGN = 64
+_CACHE_CHUNK = 16 * 1024 * 1024
+_CACHE_OUT_OF_BAND = 64 * 1024
+
+
+@contextmanager
+def atomic_open(filepath: Union[str, Path]) -> Iterator[Any]:
+    """
+    같은 폴더의 임시 파일을 쓰기용으로 열고, with 블록이 정상 종료되면 filepath 로 이름을 바꿉니다.
+    예외가 발생하면 임시 파일을 지우므로, filepath 에는 항상 완전한 파일만 존재합니다.
+
+    Parameters:
+        filepath (Union[str, Path]): 저장할 파일의 경로
+
+    Usage:
+        with atomic_open("data.bin") as fp:
+            fp.write(...)
+    """
+    filepath = Path(filepath)
+    fd, tmppath = tempfile.mkstemp(dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w+b") as fp:
+            yield fp
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmppath, filepath)
+    except BaseException:
+        if os.path.exists(tmppath):
+            os.remove(tmppath)
+        raise
+
+
+def _restore_buffer(buffer: Any, kind: str, fmt: str = "B", shape: Optional[Tuple[int, ...]] = None) -> Any:
+    # _OutOfBand 로 기록한 버퍼를 원래 타입으로 복원; bytearray / memoryview 는 가능하면 받은 버퍼를 그대로 사용
+    if kind == "bytearray":
+        return buffer if type(buffer) is bytearray else bytearray(buffer)
+    if kind == "bytes":
+        return buffer if type(buffer) is bytes else bytes(buffer)
+    view = memoryview(buffer)
+    return view if view.format == fmt and view.shape == shape else view.cast("B").cast(fmt, shape)
+
+
+class _OutOfBand:
+    """
+    bytes / bytearray / memoryview 를 PickleBuffer 로 감싸 out-of-band 로 기록하게 하는 래퍼입니다.
+    pickle 은 PickleBuffer 만 buffer_callback 으로 넘기므로, 일반 bytes / bytearray 는 이렇게 감싸야 본문에 복사되지 않습니다.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Union[bytes, bytearray, memoryview]) -> None:
+        self.value = value
+
+    def __reduce_ex__(self, protocol: int) -> Tuple[Any, tuple]:
+        value = self.value
+        if isinstance(value, memoryview):
+            return _restore_buffer, (pickle.PickleBuffer(value), "memoryview", value.format, value.shape)
+        return _restore_buffer, (pickle.PickleBuffer(value), type(value).__name__)
+
+
+def _wrap_buffers(data: Any) -> Any:
+    # 최상위 값과 최상위 dict / list / tuple 의 원소 중 큰 bytes / bytearray / memoryview 를 _OutOfBand 로 감쌈 (얕은 복사)
+    def wrap(value: Any) -> Any:
+        kind = type(value)
+        if kind is memoryview:
+            # memoryview 는 pickle 할 수 없으므로 크기와 관계없이 감쌈
+            return _OutOfBand(value)
+        if (kind is bytes or kind is bytearray) and len(value) >= _CACHE_OUT_OF_BAND:
+            return _OutOfBand(value)
+        return value
+
+    if type(data) is dict:
+        return {key: wrap(value) for key, value in data.items()}
+    if type(data) is list:
+        return [wrap(value) for value in data]
+    if type(data) is tuple:
+        return tuple(wrap(value) for value in data)
+    return wrap(data)
+
+
+def dump_cache(filepath: Union[str, Path], data: Any, version: int = 0, compress_level: int = 0) -> int:
+    """
+    데이터를 버전 / 체크섬이 있는 캐시 파일로 저장합니다. 임시 파일에 기록한 후 이름을 바꾸므로 중간에 실패해도 기존 파일은 그대로입니다.
+    pickle 프로토콜 5 의 out-of-band 버퍼를 사용하므로, 큰 버퍼는 pickle 본문에 복사되지 않고 그대로 기록됩니다.
+    out-of-band 로 기록되는 것은 PickleBuffer 를 내놓는 객체 (numpy 배열 등) 와, data 자체 또는 최상위 dict / list / tuple 의
+    원소인 64KB 이상의 bytes / bytearray / memoryview 입니다. 더 깊이 중첩된 bytes / bytearray 는 본문에 포함됩니다.
+
+    Parameters:
+        filepath (Union[str, Path]): 저장할 파일의 경로
+        data (Any): 저장할 데이터
+        version (int, optional): 데이터 버전. load_cache 에서 확인할 수 있습니다. 기본값은 0입니다.
+        compress_level (int, optional): zlib 압축 레벨 (0 이면 압축하지 않음, 1~9). 기본값은 0입니다.
+
+    Returns:
+        int: 저장된 파일의 크기 (바이트)
+    """
+    views = []
+    data = _wrap_buffers(data)
+
+    def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+        # 연속된 메모리만 out-of-band 로 기록하고, 나머지는 pickle 본문에 포함 (True 반환)
+        try:
+            views.append(buffer.raw())
+            return False
+        except BufferError:
+            return True
+
+    payload = pickle.dumps(data, protocol=5, buffer_callback=buffer_callback)
+
+    with atomic_open(filepath) as fp:
+        checksum = 0
+
+        def write(view: memoryview) -> int:
+            # 압축 (선택) 후 기록하고 저장된 크기를 반환
+            nonlocal checksum
+            stored = 0
+            compressor = zlib.compressobj(compress_level) if compress_level else None
+            for offset in range(0, len(view), _CACHE_CHUNK):
+                chunk = view[offset:offset + _CACHE_CHUNK]
+                if compressor:
+                    chunk = compressor.compress(chunk)
+                checksum = zlib.crc32(chunk, checksum)
+                stored += fp.write(chunk)
+            if compressor:
+                chunk = compressor.flush()
+                checksum = zlib.crc32(chunk, checksum)
+                stored += fp.write(chunk)
+            return stored
+
+        fp.write(b"\x00" * _CACHE_HEADER.size)
+        payload_stored = write(memoryview(payload))
+
+        table = []
+        for view in views:
+            padding = -fp.tell() % _CACHE_ALIGN
+            fp.write(b"\x00" * padding)
+            offset = fp.tell()
+            table.append(_CACHE_BUFFER.pack(offset, write(view), view.nbytes))
+
+        table = b"".join(table)
+        table_offset = fp.tell()
+        checksum = zlib.crc32(table, checksum)
+        fp.write(table)
+        size = fp.tell()
+
+        fp.seek(0)
+        fp.write(_CACHE_HEADER.pack(CACHE_MAGIC, CACHE_FORMAT, compress_level, version, len(views),
+                                    payload_stored, len(payload), table_offset, checksum))
+    return size
+
+
+def _decompress(view: memoryview, size: int) -> bytearray:
+    # 원본 크기의 bytearray 에 조각 단위로 풀어 넣음 (압축 해제 결과를 한 번 더 복사하지 않기 위함)
+    output = bytearray(size)
+    decompressor = zlib.decompressobj()
+    position = 0
+    for offset in range(0, len(view), _CACHE_CHUNK):
+        chunk = decompressor.decompress(view[offset:offset + _CACHE_CHUNK])
+        output[position:position + len(chunk)] = chunk
+        position += len(chunk)
+    chunk = decompressor.flush()
+    output[position:position + len(chunk)] = chunk
+    position += len(chunk)
+    if position != size:
+        raise ValueError("Decompressed size mismatch")
+    return output
+
+
+def load_cache(filepath: Union[str, Path], version: Optional[int] = None, use_mmap: bool = False,
+               verify: bool = True) -> Any:
+    """
+    dump_cache 로 저장한 캐시 파일을 읽습니다.
+    use_mmap=True 이고 압축하지 않은 파일이면 버퍼는 memory map 을 그대로 가리키므로 (읽기 전용),
+    버퍼를 지원하는 객체 (numpy 배열, memoryview 등) 는 복사 없이 복원되고 실제로 접근한 부분만 디스크에서 읽힙니다.
+    bytes / bytearray 는 자기 메모리가 필요하므로 memory map 에서 한 번 복사됩니다.
+    use_mmap=False 이면 버퍼마다 따로 읽으므로, bytearray 는 읽은 버퍼가 그대로 복원됩니다 (추가 복사 없음).
+
+    Parameters:
+        filepath (Union[str, Path]): 캐시 파일의 경로
+        version (Optional[int], optional): 값이 있으면 파일의 데이터 버전과 다를 때 ValueError. 기본값은 None입니다.
+        use_mmap (bool, optional): True 이면 memory map 으로 읽음. 기본값은 False입니다.
+        verify (bool, optional): True 이면 CRC32 를 확인 (파일 전체를 읽음). 기본값은 True입니다.
+
+    Returns:
+        Any: 불러온 데이터
+    """
+    with open(filepath, "rb") as fp:
+        header = fp.read(_CACHE_HEADER.size)
+        if len(header) < _CACHE_HEADER.size or header[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+            raise ValueError(f"Not a cache file: {filepath}")
+
+        (_, fmt, level, file_version, n_buffers, payload_stored, payload_size,
+         table_offset, checksum) = _CACHE_HEADER.unpack(header)
+        if fmt != CACHE_FORMAT:
+            raise ValueError(f"Unsupported cache format {fmt}: {filepath}")
+        if version is not None and version != file_version:
+            raise ValueError(f"Cache version mismatch: expected {version}, found {file_version}: {filepath}")
+
+        table_size = n_buffers * _CACHE_BUFFER.size
+        if os.fstat(fp.fileno()).st_size < table_offset + table_size:
+            raise ValueError(f"Truncated cache file: {filepath}")
+
+        if use_mmap:
+            source = memoryview(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
+            table_view = source[table_offset:table_offset + table_size]
+            table = [_CACHE_BUFFER.unpack_from(table_view, i * _CACHE_BUFFER.size) for i in range(n_buffers)]
+            payload_view = source[_CACHE_HEADER.size:_CACHE_HEADER.size + payload_stored]
+            buffer_views = [source[offset:offset + stored] for offset, stored, _ in table]
+        else:
+            def read_at(offset: int, size: int) -> bytearray:
+                data = bytearray(size)
+                fp.seek(offset)
+                if fp.readinto(data) != size:
+                    raise ValueError(f"Truncated cache file: {filepath}")
+                return data
+
+            table_view = read_at(table_offset, table_size)
+            table = [_CACHE_BUFFER.unpack_from(table_view, i * _CACHE_BUFFER.size) for i in range(n_buffers)]
+            payload_view = read_at(_CACHE_HEADER.size, payload_stored)
+            buffer_views = [read_at(offset, stored) for offset, stored, _ in table]
+
+    if use_mmap and any(offset + stored > len(source) for offset, stored, _ in table):
+        raise ValueError(f"Truncated cache file: {filepath}")
+
+    if verify:
+        crc = zlib.crc32(payload_view)
+        for view in buffer_views:
+            view = memoryview(view)
+            for offset in range(0, len(view), _CACHE_CHUNK):
+                crc = zlib.crc32(view[offset:offset + _CACHE_CHUNK], crc)
+        crc = zlib.crc32(table_view, crc)
+        if crc != checksum:
+            raise ValueError(f"Cache checksum mismatch: {filepath}")
+
+    if level:
+        payload_view = _decompress(memoryview(payload_view), payload_size)
+        buffers = [_decompress(memoryview(view), size) for view, (_, _, size) in zip(buffer_views, table)]
+    else:
+        buffers = buffer_views
+
+    return pickle.loads(payload_view, buffers=buffers)
+
+
+@contextmanager
+def file_lock(lockpath: Union[str, Path]) -> Iterator[None]:
+    """
+    프로세스 간 배타적 파일 잠금을 겁니다. 다른 프로세스가 잠금을 가지고 있으면 풀릴 때까지 대기합니다.
+    잠금 파일은 삭제하지 않습니다 (삭제와 잠금 사이의 경쟁을 피하기 위함).
+
+    Parameters:
+        lockpath (Union[str, Path]): 잠금 파일의 경로
+
+    Usage:
+        with file_lock("configs.json.lock"):
+            ...
+    """
+    with open(lockpath, "a+b") as fp:
+        if os.name == "nt":
+            import msvcrt
+            fp.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK 은 약 10초 동안 재시도 후 실패하므로 다시 시도
+                    continue
+            try:
+                yield
+            finally:
+                fp.seek(0)
+                msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write(filepath: Union[str, Path], data: Union[str, bytes], encoding: str = "utf-8") -> None:
+    """
+    같은 폴더의 임시 파일에 기록한 후 이름을 바꿔, 다른 프로세스가 일부만 기록된 파일을 보지 않도록 합니다.
+
+    Parameters:
+        filepath (Union[str, Path]): 저장할 파일의 경로
+        data (Union[str, bytes]): 저장할 내용
+        encoding (str, optional): data 가 str 일 때의 인코딩. 기본값은 utf-8입니다.
+    """
+    if isinstance(data, str):
+        data = data.encode(encoding)
+
+    with atomic_open(filepath) as fp:
+        fp.write(data)
+
+
+def stable_hash(value: Any) -> str:
+    """
+    프로세스와 실행에 관계없이 같은 값이면 같은 SHA-256 해시를 반환합니다.
+    dict 와 set 은 순서에 관계없이 같은 해시가 되도록 정렬하며 (문자열 해시 무작위화의 영향을 받지 않음),
+    list / tuple / dict / set 의 하위 클래스 (namedtuple 등) 와 dataclass 도 구조로 해시합니다.
+    그 밖의 객체는 pickle 본문 대신 __reduce_ex__ 의 결과 (생성 함수, 인자, 상태) 를 같은 방식으로 해시하므로,
+    객체 안의 set / dict 도 순서와 관계없이 같은 해시가 됩니다.
+
+    Parameters:
+        value (Any): 해시할 값
+
+    Returns:
+        str: 16진수 해시 문자열
+
+    Raises:
+        TypeError: pickle 할 수 없거나 순환 참조가 있는 객체
+    """
+    digest = hashlib.sha256()
+    active = set()
+
+    def name_of(kind: Any) -> str:
+        return f"{kind.__module__}.{kind.__qualname__}"
+
+    def feed(item: Any) -> None:
+        kind = type(item)
+        if item is None or kind in (bool, int, float, complex, str, bytes):
+            digest.update(f"{kind.__name__}:{len(repr(item))}:".encode())
+            digest.update(repr(item).encode())
+            return
+        if isinstance(item, (type, types.FunctionType, types.BuiltinFunctionType)):
+            digest.update(f"ref:{name_of(item)};".encode())
+            return
+
+        # 순환 참조는 끝나지 않으므로 거부
+        if id(item) in active:
+            raise TypeError(f"stable_hash cannot hash a cyclic {kind.__qualname__}")
+        active.add(id(item))
+        try:
+            feed_object(item, kind)
+        finally:
+            active.discard(id(item))
+
+    def feed_object(item: Any, kind: type) -> None:
+        if kind in (list, tuple):
+            tag = kind.__name__
+        elif kind is dict:
+            tag = "dict"
+        elif kind in (set, frozenset):
+            tag = "set"
+        else:
+            tag = name_of(kind)
+
+        if isinstance(item, (list, tuple)):
+            digest.update(f"{tag}[{len(item)}".encode())
+            for element in item:
+                feed(element)
+            digest.update(b"]")
+        elif isinstance(item, dict):
+            digest.update(f"{tag}{{{len(item)}".encode())
+            pairs = [(stable_hash(key), element) for key, element in item.items()]
+            for key_hash, element in sorted(pairs, key=lambda pair: pair[0]):
+                digest.update(key_hash.encode())
+                feed(element)
+            digest.update(b"}")
+        elif isinstance(item, (set, frozenset)):
+            digest.update(f"{tag}{{{len(item)}".encode())
+            for element_hash in sorted(stable_hash(element) for element in item):
+                digest.update(element_hash.encode())
+            digest.update(b"}")
+        elif dataclasses.is_dataclass(item):
+            digest.update(f"{tag}(".encode())
+            for field in dataclasses.fields(item):
+                feed(field.name)
+                feed(getattr(item, field.name))
+            digest.update(b")")
+            return
+        else:
+            try:
+                reduced = item.__reduce_ex__(4)
+            except Exception as e:
+                raise TypeError(f"stable_hash cannot hash {kind.__qualname__}: {e}") from e
+            if isinstance(reduced, str):
+                digest.update(f"ref:{kind.__module__}.{reduced};".encode())
+                return
+            # (생성 함수, 인자, 상태, list 항목, dict 항목) 을 구조로 해시
+            digest.update(b"reduce(")
+            for index, part in enumerate(reduced[:5]):
+                if index >= 3 and part is not None:
+                    part = list(part) if index == 3 else dict(part)
+                feed(part)
+            digest.update(b")")
+            return
+
+        # 하위 클래스에 추가된 속성
+        attributes = getattr(item, "__dict__", None)
+        if kind not in (list, tuple, dict, set, frozenset) and attributes:
+            feed(attributes)
+
+    feed(value)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    메모리 LRU 와 디스크 두 단계로 함수 결과를 저장하는 캐시입니다.
+    디스크 항목은 dump_cache 형식으로 기록되어 (임시 파일 + 이름 변경) 여러 프로세스가 같은 폴더를 함께 사용해도 안전합니다.
+    읽기는 잠금 없이 수행하고, 삭제 (크기 / 기간 초과) 만 폴더의 잠금 파일로 한 프로세스씩 수행합니다.
+    메모리 단계는 같은 객체를 반환하므로, 반환 값을 수정하면 캐시된 값도 바뀝니다.
+
+    Usage:
+        @memoize(max_age=3600)
+        def expensive(x, y): ...
+
+        expensive.cache.stats
+    """
+
+    def __init__(self, name: str, folder: Union[str, Path, None] = None, memory_size: int = 128,
+                 max_bytes: int = 1024 * 1024 * 1024, max_age: Optional[float] = None, version: int = 0) -> None:
+        """
+        Parameters:
+            name (str): 캐시 이름 (폴더 이름)
+            folder (Union[str, Path, None], optional): 저장 폴더. 기본값은 ROOT_APPDATA("memoize") / name 입니다.
+            memory_size (int, optional): 메모리 LRU 에 보관할 항목 수 (0 이면 사용하지 않음). 기본값은 128입니다.
+            max_bytes (int, optional): 디스크 항목의 최대 총 크기. 넘으면 오래 사용하지 않은 항목부터 삭제. 기본값은 1GB입니다.
+            max_age (Optional[float], optional): 항목의 최대 보관 시간 (초). None 이면 제한 없음. 기본값은 None입니다.
+            version (int, optional): 함수 구현이 바뀌었을 때 올리면 이전 결과를 사용하지 않음. 기본값은 0입니다.
+        """
+        if folder is None:
+            from roots import ROOT_APPDATA
+            folder = ROOT_APPDATA("memoize").joinpath(name)
+
+        self.name = name
+        self.folder = Path(folder)
+        self.memory_size = memory_size
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.version = version
+        self.memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.written = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0, "errors": 0}
+
+    def key(self, args: tuple, kwargs: Dict[str, Any]) -> str:
+        return stable_hash((self.name, self.version, args, kwargs))
+
+    def path(self, key: str) -> Path:
+        return self.folder.joinpath(key[:2], f"{key}.cache")
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        캐시된 값을 찾습니다.
+
+        Parameters:
+            key (str): 항목 키
+
+        Returns:
+            Tuple[bool, Any]: (찾았는지 여부, 값)
+        """
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                if self.max_age is None or now - entry[0] <= self.max_age:
+                    self.memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return True, entry[1]
+                del self.memory[key]
+
+        path = self.path(key)
+        try:
+            created = os.stat(path).st_mtime
+            if self.max_age is not None and now - created > self.max_age:
+                self.stats["expired"] += 1
+                self._remove(path)
+                return False, None
+            value = load_cache(path, version=self.version)
+        except FileNotFoundError:
+            return False, None
+        except Exception:
+            # 손상되었거나 다른 버전의 파일은 없는 것으로 간주하고 다시 계산
+            self.stats["errors"] += 1
+            return False, None
+
+        # 접근 시각을 기록하여 크기 초과 시 오래 사용하지 않은 항목부터 삭제
+        try:
+            os.utime(path, (now, created))
+        except OSError:
+            pass
+        self.stats["disk_hits"] += 1
+        self._remember(key, created, value)
+        return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        값을 메모리와 디스크에 저장합니다.
+        pickle 할 수 없는 값이거나 디스크 기록에 실패하면 errors 에 세고 메모리에만 보관합니다.
+
+        Parameters:
+            key (str): 항목 키
+            value (Any): 저장할 값
+        """
+        self._remember(key, time.time(), value)
+        path = self.path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.written += dump_cache(path, value, version=self.version)
+        except Exception:
+            self.stats["errors"] += 1
+            return
+
+        # 매번 폴더를 훑지 않도록, 최대 크기의 1/10 이상 기록했을 때만 정리
+        if self.written >= self.max_bytes // 10:
+            self.evict()
+
+    def _remember(self, key: str, created: float, value: Any) -> None:
+        if self.memory_size <= 0:
+            return
+        with self.lock:
+            self.memory[key] = (created, value)
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_size:
+                self.memory.popitem(last=False)
+
+    def _remove(self, path: Path) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def evict(self) -> None:
+        """
+        기간이 지난 항목을 삭제하고, 총 크기가 max_bytes 를 넘으면 오래 사용하지 않은 항목부터 삭제합니다.
+        """
+        self.written = 0
+        if not self.folder.exists():
+            return
+
+        with file_lock(self.folder.joinpath(".lock")):
+            now = time.time()
+            entries = []
+            for path in self.folder.glob("*/*.cache"):
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if self.max_age is not None and now - st.st_mtime > self.max_age:
+                    if self._remove(path):
+                        self.stats["expired"] += 1
+                    continue
+                entries.append((st.st_atime, st.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if self._remove(path):
+                    self.stats["evictions"] += 1
+                    with self.lock:
+                        self.memory.pop(path.stem, None)
+                total -= size
+
+    def clear(self) -> None:
+        """
+        메모리와 디스크의 모든 항목을 삭제합니다.
+        """
+        with self.lock:
+            self.memory.clear()
+        if not self.folder.exists():
+            return
+        with file_lock(self.folder.joinpath(".lock")):
+            for path in self.folder.glob("*/*.cache"):
+                self._remove(path)
+
+    def __call__(self, func: Any) -> Any:
+        from functools import wraps
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = self.key(args, kwargs)
+            found, value = self.get(key)
+            if found:
+                return value
+            self.stats["misses"] += 1
+            value = func(*args, **kwargs)
+            self.set(key, value)
+            return value
+
+        wrapper.cache = self
+        return wrapper
+
+
+def memoize(name: Optional[str] = None, **kwargs: Any) -> Any:
+    """
+    함수 결과를 DiskCache 에 저장하는 데코레이터입니다. 키는 인자의 stable_hash 입니다.
+    kwargs 는 DiskCache 의 인자 (folder, memory_size, max_bytes, max_age, version) 입니다.
+
+    Parameters:
+        name (Optional[str], optional): 캐시 이름. 기본값은 "모듈.함수" 입니다.
+
+    Returns:
+        Any: 데코레이터
+    """
+    def decorator(func: Any) -> Any:
+        return DiskCache(name or f"{func.__module__}.{func.__qualname__}", **kwargs)(func)
+    return decorator
+
+
 class AlphabetCoder:
     """
     알파벳과 숫자를 인코딩/디코딩하는 클래스입니다.
@@ -408,7 +1761,7 @@ class Timer:
 #
 # 함수
 #
-def get_timezone(zone: str = "Asia/Seoul") -> BaseTzInfo:
+def get_timezone(zone: str = "Asia/Seoul") -> "BaseTzInfo":
     """
     지정된 시간대 정보를 반환
 
@@ -418,6 +1771,8 @@ def get_timezone(zone: str = "Asia/Seoul") -> BaseTzInfo:
     Returns:
         BaseTzInfo: 시간대 정보
     """
+    from pytz import timezone
+
     return timezone(zone)
 
 
@@ -574,10 +1929,429 @@ def unittest3():
     print(s2num("123"))
     print(s2num("123ask123"))
 
+def unittest4(n_records: int = 2000):
+    # 중첩 구조
+    record = {"symbol": "KRW-BTC", "price": 1.5, "tags": ["a", "b"],
+              "meta": {"source": "upbit", "seq": 1}, "fills": [{"qty": 0.1, "px": 2.0}], "extra": []}
+    model = create_model_from_data("ticker", record)
+    assert model.meta.seq == 1 and model.fills[0].px == 2.0
+    assert model.model_dump() == record
+
+    # 같은 구조의 데이터를 반복해서 만들 때의 비용 (이전 방식: 매번 create_model)
+    from pydantic import create_model
+
+    records = [{"id": i, "symbol": f"S{i}", "price": i * 0.5, "volume": i} for i in range(n_records)]
+    begin = time.perf_counter()
+    for i, data in enumerate(records):
+        create_model(f"file{i}", **{key: (type(value), ...) for key, value in data.items()})(**data)
+    before = time.perf_counter() - begin
+
+    model_cache.clear()
+    begin = time.perf_counter()
+    for i, data in enumerate(records):
+        create_model_from_data(f"file{i}", data)
+    after = time.perf_counter() - begin
+
+    info = model_cache.info()
+    print(f"create_model per record: {before / n_records * 1e6:.1f} us -> cached: {after / n_records * 1e6:.1f} us, {info}")
+    assert info["misses"] == 1 and info["hits"] == n_records - 1
+
+def unittest5(n_records: int = 100000):
+    import tracemalloc
+
+    with tempfile.TemporaryDirectory() as folder:
+        records = [{"id": i, "symbol": f"S{i % 100}", "price": i * 0.5, "tags": ["a", "b"], "meta": {"seq": i}}
+                   for i in range(n_records)]
+        arraypath = Path(folder).joinpath("records.json")
+        linespath = Path(folder).joinpath("records.jsonl")
+        arraypath.write_text(json.dumps(records), encoding="utf-8")
+        linespath.write_text("\n".join(json.dumps(record) for record in records), encoding="utf-8")
+        print(f"{n_records} records, {arraypath.stat().st_size / 1e6:.1f} MB")
+
+        def load_all(filepath: Path) -> int:
+            with open(filepath, "r", encoding="utf-8") as fp:
+                return len([create_model_from_data(filepath.stem, record) for record in json.load(fp)])
+
+        cases = [
+            ("json.load + models", lambda: load_all(arraypath)),
+            ("iter_json array", lambda: sum(1 for _ in iter_json(arraypath))),
+            ("iter_json array mmap", lambda: sum(1 for _ in iter_json(arraypath, use_mmap=True))),
+            ("iter_json jsonl", lambda: sum(1 for _ in iter_json(linespath))),
+            ("iter_json jsonl mmap", lambda: sum(1 for _ in iter_json(linespath, use_mmap=True))),
+            ("iter_json_batches 1000", lambda: sum(len(batch) for batch in iter_json_batches(arraypath))),
+        ]
+        for label, func in cases:
+            begin = time.perf_counter()
+            assert func() == n_records
+            elapsed = time.perf_counter() - begin
+
+            tracemalloc.start()
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{label:24s} {n_records / elapsed:9.0f} records/s  peak {peak / 1e6:7.1f} MB")
+
+        first = next(iter_json(linespath))
+        assert first.meta.seq == 0 and first.tags == ["a", "b"]
+
+        # 배열 레코드의 JSON lines, 한 줄 배열, 여러 줄 배열, 배열 뒤의 다른 값
+        for text, expected in [("[1,2]\n[3,4]\n[5,6]\n", [[1, 2], [3, 4], [5, 6]]),
+                               ("[1,2]\n", [1, 2]),
+                               ("[\n1,\n2\n]\n", [1, 2])]:
+            arraypath.write_text(text, encoding="utf-8")
+            assert list(iter_json(arraypath)) == expected, text
+            assert list(iter_json(arraypath, use_mmap=True)) == expected, text
+        arraypath.write_text("[\n1,\n2\n]\n[3]\n", encoding="utf-8")
+        try:
+            list(iter_json(arraypath))
+            assert False, "extra data after the array was ignored"
+        except ValueError:
+            pass
+
+    # 모델이 캐시에서 제거되면 List 어댑터도 함께 제거됨
+    cache = ModelCache(maxsize=1)
+    cache.list_adapter("first", ModelCache.schema({"a": 1}))
+    cache.list_adapter("second", ModelCache.schema({"b": 1}))
+    assert list(cache.adapters) == list(cache.classes) == [ModelCache.schema({"b": 1})]
+
+def unittest6(n_files: int = 5000):
+    with tempfile.TemporaryDirectory() as folder:
+        for i in range(n_files):
+            subfolder = Path(folder).joinpath(f"part{i % 10}")
+            subfolder.mkdir(exist_ok=True)
+            record = {"id": i, "symbol": f"S{i % 100}", "price": i * 0.5, "history": [i * 0.1] * 50, "meta": {"seq": i}}
+            subfolder.joinpath(f"{i:05d}.json").write_text(json.dumps(record), encoding="utf-8")
+        Path(folder).joinpath("part0", "broken.json").write_text("{ broken", encoding="utf-8")
+
+        begin = time.perf_counter()
+        serial = []
+        for path in list_files(folder, "json"):
+            try:
+                serial.append(load_json(Path(path)))
+            except ValueError:
+                pass
+        baseline = time.perf_counter() - begin
+        print(f"list_files + load_json  {n_files / baseline:9.0f} files/s  (cpu_count={os.cpu_count()})")
+
+        for workers in [1, 2, 4]:
+            begin = time.perf_counter()
+            loaded = load_json_files(folder, "json", workers=workers)
+            elapsed = time.perf_counter() - begin
+            print(f"load_json_files w={workers}  {n_files / elapsed:9.0f} files/s  errors={list(loaded.errors.values())}")
+
+            assert len(loaded) == n_files + 1 and len(loaded.errors) == 1
+            assert loaded.paths == sorted(loaded.paths)
+            assert all(record.id == int(Path(path).stem) for path, record in loaded)
+
+        plain = load_json_files(folder, "json", as_model=False, workers=2)
+        assert plain.records[0] == {"id": 0, "symbol": "S0", "price": 0.0, "history": [0.0] * 50, "meta": {"seq": 0}}
+
+def unittest7(size: int = 1024 * 1024 * 1024):
+    # 1MB 난수 블록을 반복하여 압축되지 않는 큰 버퍼를 만듦 (zlib 창 크기보다 긴 반복)
+    block = os.urandom(1024 * 1024)
+    blob = bytearray(block * (size // len(block)))
+    data = {"name": "blob", "blob": blob}
+
+    with tempfile.TemporaryDirectory() as folder:
+        oldpath = Path(folder).joinpath("old.pickle")
+        newpath = Path(folder).joinpath("new.cache")
+
+        begin = time.perf_counter()
+        export_to_pickle(oldpath, {"name": "blob", "blob": blob})
+        print(f"export_to_pickle             {time.perf_counter() - begin:7.3f} s")
+        begin = time.perf_counter()
+        loaded = import_from_pickle(oldpath)
+        print(f"import_from_pickle           {time.perf_counter() - begin:7.3f} s")
+        assert loaded["blob"] == blob
+        del loaded
+
+        for level in [0, 1]:
+            begin = time.perf_counter()
+            stored = dump_cache(newpath, data, version=1, compress_level=level)
+            print(f"dump_cache level={level}           {time.perf_counter() - begin:7.3f} s  {stored / size:.3f}x")
+
+            cases = [("verify", False, True), ("mmap+verify", True, True), ("mmap", True, False)]
+            for label, use_mmap, verify in (cases if level == 0 else cases[:1]):
+                begin = time.perf_counter()
+                loaded = load_cache(newpath, version=1, use_mmap=use_mmap, verify=verify)
+                elapsed = time.perf_counter() - begin
+                print(f"load_cache level={level} {label:11s} {elapsed:7.3f} s  {type(loaded['blob']).__name__}")
+                assert type(loaded["blob"]) is bytearray
+                assert loaded["blob"][-len(block):] == block and len(loaded["blob"]) == len(blob)
+                del loaded
+
+        # 기록 중 실패하면 기존 파일이 그대로 남아야 함
+        class Unpicklable:
+            def __reduce__(self):
+                raise RuntimeError("cannot pickle")
+        try:
+            dump_cache(newpath, [Unpicklable()])
+        except RuntimeError:
+            pass
+        assert load_cache(newpath, version=1, use_mmap=True)["name"] == "blob"
+        assert sorted(os.listdir(folder)) == ["new.cache", "old.pickle"]
+        del blob, data
+
+        # 일반 bytes / bytearray / memoryview 도 out-of-band 로 기록되고 원래 타입으로 복원됨
+        import tracemalloc
+
+        n = 10 ** 7
+        values = {"b": bytearray(os.urandom(n)), "c": bytes(n), "v": memoryview(bytearray(range(256)) * 16).cast("I"),
+                  "small": b"x" * 10}
+        dump_cache(newpath, values)
+        with open(newpath, "rb") as fp:
+            header = _CACHE_HEADER.unpack(fp.read(_CACHE_HEADER.size))
+        assert header[4] == 3 and header[6] < 1024, header
+
+        for use_mmap in [True, False]:
+            tracemalloc.start()
+            loaded = load_cache(newpath, use_mmap=use_mmap)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"load_cache bytes+bytearray mmap={use_mmap!s:5s} peak {peak / n:.2f}x of each buffer")
+            assert {key: type(value) for key, value in loaded.items()} == {key: type(value) for key, value in values.items()}
+            assert loaded == values
+            assert loaded["v"].format == "I" and loaded["v"].shape == values["v"].shape
+            if use_mmap:
+                # memoryview 는 memory map 을 그대로 가리킴 (복사 없음)
+                assert isinstance(loaded["v"].obj, mmap.mmap)
+            # memory map 에서는 bytearray 와 bytes 를 한 번씩 복사, 파일에서 읽으면 bytearray 는 읽은 버퍼를 그대로 쓰고
+            # bytes 만 한 번 복사 (파일 전체를 읽은 후 pickle 본문에서 다시 복사하지 않음)
+            assert peak < (2.2 if use_mmap else 3.2) * n, peak
+            del loaded
+
+def _unittest8_slow_square(x: int) -> Dict[str, Any]:
+    time.sleep(0.01)
+    return {"x": x, "square": x * x, "payload": bytes(1000)}
+
+
+def _unittest8_values() -> List[Any]:
+    from collections import namedtuple
+
+    Tagged = namedtuple("Tagged", "tags")
+    Holder = _unittest8_holder()
+    return [Tagged(tags=frozenset("abcdefgh")), Holder(names={"x", "y", "z"}, meta={"k": {"a", "b"}}),
+            _UnittestRecord(tags={"p", "q", "r"}), Path("a/b")]
+
+
+def _unittest8_holder() -> type:
+    @dataclasses.dataclass
+    class Holder:
+        names: set
+        meta: dict
+    return Holder
+
+
+class _UnittestRecord:
+    def __init__(self, tags: set) -> None:
+        self.tags = tags
+
+
+def _unittest8_worker(folder: str) -> Tuple[int, Dict[str, int]]:
+    cached = DiskCache("square", folder=folder, memory_size=0)(_unittest8_slow_square)
+    values = [cached(i)["square"] for i in random.sample(range(50), 50)]
+    assert sorted(values) == [i * i for i in range(50)]
+    return os.getpid(), cached.cache.stats
+
+
+def unittest8():
+    import multiprocessing
+    import sys
+
+    assert stable_hash({"a": 1, "b": {2, 3}}) == stable_hash({"b": {3, 2}, "a": 1})
+    assert stable_hash((1, "1")) != stable_hash(("1", 1)) and stable_hash(1) != stable_hash(True)
+
+    # namedtuple / dataclass / 일반 객체 안의 set 도 문자열 해시 무작위화와 관계없이 같은 해시
+    script = ("import sys; sys.path.insert(0, sys.argv[1]); from tools import _unittest8_values, stable_hash; "
+              "print(stable_hash(_unittest8_values()))")
+    digests = {subprocess.run([sys.executable, "-c", script, os.path.dirname(os.path.abspath(__file__))],
+                              env={**os.environ, "PYTHONHASHSEED": seed}, capture_output=True, text=True,
+                              check=True).stdout.strip()
+               for seed in ["1", "2", "3"]}
+    assert len(digests) == 1, digests
+    try:
+        stable_hash({"lock": threading.Lock()})
+        assert False, "unpicklable object was hashed"
+    except TypeError:
+        pass
+
+    with tempfile.TemporaryDirectory() as folder:
+        calls = []
+
+        @memoize(folder=folder, memory_size=2)
+        def add(x, y=0):
+            calls.append((x, y))
+            return x + y
+
+        assert add(1, y=2) == 3 and add(1, y=2) == 3 and add(y=2, x=1) == 3
+        assert add.cache.stats["memory_hits"] == 1 and len(calls) == 2
+
+        # 메모리에서 밀려난 항목은 디스크에서 읽음
+        for i in range(5):
+            add(i)
+        assert add(1, y=2) == 3 and add.cache.stats["disk_hits"] == 1
+
+        # 기간 초과
+        expiring = DiskCache("expiring", folder=Path(folder).joinpath("expiring"), max_age=0.2)(_unittest8_slow_square)
+        expiring(3)
+        time.sleep(0.3)
+        expiring(3)
+        assert expiring.cache.stats["expired"] == 1 and expiring.cache.stats["misses"] == 2
+
+        # 크기 초과 시 오래 사용하지 않은 항목부터 삭제
+        bounded = DiskCache("bounded", folder=Path(folder).joinpath("bounded"), max_bytes=20000)(_unittest8_slow_square)
+        for i in range(40):
+            bounded(i)
+        bounded.cache.evict()
+        files = list(Path(folder).joinpath("bounded").glob("*/*.cache"))
+        print(f"bounded: {len(files)} files, {sum(f.stat().st_size for f in files)} bytes, {bounded.cache.stats}")
+        assert sum(f.stat().st_size for f in files) <= 20000 and bounded.cache.stats["evictions"] > 0
+
+        # 여러 프로세스가 같은 폴더를 동시에 사용
+        shared = Path(folder).joinpath("shared")
+        with multiprocessing.Pool(4) as pool:
+            results = pool.map(_unittest8_worker, [shared] * 4)
+        misses = sum(stats["misses"] for _, stats in results)
+        print(f"4 processes x 50 keys: misses={misses} disk_hits={sum(stats['disk_hits'] for _, stats in results)}")
+        assert all(stats["errors"] == 0 for _, stats in results)
+        assert not list(shared.glob("*/.*.tmp"))
+
+        # pickle 할 수 없는 결과는 메모리에만 보관하고 값은 그대로 반환
+        unpicklable = DiskCache("unpicklable", folder=Path(folder).joinpath("unpicklable"))(lambda x: threading.Lock())
+        assert unpicklable(1) is unpicklable(1)
+        assert unpicklable.cache.stats["errors"] == 1 and unpicklable.cache.stats["memory_hits"] == 1
+
+        # 여러 스레드가 메모리 LRU 를 동시에 사용
+        from concurrent.futures import ThreadPoolExecutor
+
+        threaded = DiskCache("threaded", folder=Path(folder).joinpath("threaded"), memory_size=8)(_unittest8_slow_square)
+        for i in range(16):
+            threaded(i)
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(threaded, [i % 16 for i in range(2000)]))
+        assert [result["square"] for result in results] == [(i % 16) ** 2 for i in range(2000)]
+
+        # 호출 비용
+        cached = DiskCache("timing", folder=Path(folder).joinpath("timing"))(_unittest8_slow_square)
+        cached(7)
+        for label, cache_memory in [("memory hit", True), ("disk hit", False)]:
+            begin = time.perf_counter()
+            for _ in range(1000):
+                if not cache_memory:
+                    cached.cache.memory.clear()
+                cached(7)
+            print(f"{label:10s} {(time.perf_counter() - begin) / 1000 * 1e6:8.1f} us/call (compute 10000 us)")
+
+def unittest9(n_files: int = 2000):
+    import filecmp
+
+    with tempfile.TemporaryDirectory() as folder:
+        source = Path(folder).joinpath("source")
+        for i in range(n_files):
+            path = source.joinpath(f"d{i % 20}", f"file{i:05d}.json")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            records = [{"id": j, "value": random.random(), "name": f"item-{j}"} for j in range(200)]
+            path.write_text(json.dumps(records), encoding="utf-8")
+        total = sum(path.stat().st_size for path in source.rglob("*.json"))
+        print(f"{n_files} files, {total / 1e6:.1f} MB, cpu_count={os.cpu_count()}")
+
+        zippath = Path(folder).joinpath("archive.zip")
+        begin = time.perf_counter()
+        with zipfile.ZipFile(zippath, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+            for path in sorted(source.rglob("*.json")):
+                zf.write(path, path.relative_to(source).as_posix())
+        print(f"zipfile.write sequential   {time.perf_counter() - begin:7.3f} s")
+
+        for workers in [1, 4]:
+            begin = time.perf_counter()
+            create_zip(source, zippath, workers=workers)
+            print(f"create_zip workers={workers}       {time.perf_counter() - begin:7.3f} s")
+        with zipfile.ZipFile(zippath, "r") as zf:
+            assert zf.testzip() is None and len(zf.namelist()) == n_files
+
+        target = Path(folder).joinpath("target")
+        begin = time.perf_counter()
+        with zipfile.ZipFile(zippath, "r") as zf:
+            zf.extractall(target)
+        print(f"extractall                 {time.perf_counter() - begin:7.3f} s")
+        shutil.rmtree(target)
+
+        cases = [
+            ("extract_zip fresh", lambda: None),
+            ("extract_zip unchanged", lambda: None),
+            ("extract_zip 20 changed", lambda: [target.joinpath("d0", f"file{i * 20:05d}.json").write_text("{}")
+                                                 for i in range(20)]),
+            ("extract_zip in place", lambda: [target.joinpath("d0", f"file{i * 20:05d}.json").write_text("{}")
+                                               for i in range(20)]),
+        ]
+        for label, prepare in cases:
+            prepare()
+            begin = time.perf_counter()
+            counts = extract_zip(zippath, target, purge_when_exists=label != "extract_zip in place")
+            print(f"{label:26s} {time.perf_counter() - begin:7.3f} s  {counts}")
+            comparison = filecmp.dircmp(source, target)
+            assert not comparison.diff_files and not comparison.left_only and not comparison.right_only
+
+        # 해제 중 실패하면 기존 폴더는 그대로 남아야 함
+        broken = Path(folder).joinpath("broken.zip")
+        data = bytearray(zippath.read_bytes())
+        data[len(data) // 2:len(data) // 2 + 1000] = bytes(1000)
+        broken.write_bytes(data)
+        try:
+            extract_zip(broken, target, incremental=False)
+            raise AssertionError("corrupted archive was extracted")
+        except (zipfile.BadZipFile, zlib.error):
+            pass
+        assert not filecmp.dircmp(source, target).diff_files
+        assert sorted(os.listdir(folder)) == ["archive.zip", "broken.zip", "source", "target"]
+
+        # staging 폴더로 교체하는 이름 변경이 실패하면 기존 폴더를 되돌림
+        replace = os.replace
+
+        def failing_replace(src, dst):
+            if ".staging-" in str(src):
+                raise OSError("simulated rename failure")
+            replace(src, dst)
+
+        os.replace = failing_replace
+        try:
+            extract_zip(zippath, target, incremental=False)
+            raise AssertionError("rename failure was ignored")
+        except OSError:
+            pass
+        finally:
+            os.replace = replace
+        assert not filecmp.dircmp(source, target).diff_files
+        assert sorted(os.listdir(folder)) == ["archive.zip", "broken.zip", "source", "target"]
+
+        # 블록보다 큰 파일도 나누어 압축
+        large = Path(folder).joinpath("large")
+        large.mkdir()
+        large.joinpath("big.bin").write_bytes(os.urandom(_ZIP_BLOCK) * 3 + bytes(5 * _ZIP_BLOCK + 123))
+        create_zip(large, zippath)
+        with zipfile.ZipFile(zippath, "r") as zf:
+            assert zf.testzip() is None and zf.read("big.bin") == large.joinpath("big.bin").read_bytes()
+
+
 if __name__ == "__main__":
     from __init__ import print
 
-    unittest()
-    unittest2()
-    unittest3()
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'unittest4':
+        unittest4()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest5':
+        unittest5()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest6':
+        unittest6()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest7':
+        unittest7()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest8':
+        unittest8()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'unittest9':
+        unittest9()
+    else:
+        unittest()
+        unittest2()
+        unittest3()
     print("done.")